@@ -1,5 +1,10 @@
 """Unit tests configuration file."""
 
+import pytest
+
+from ethically.we import GenderBiasWE
+from ethically.we.data import load_w2v_small
+
 
 def pytest_configure(config):
     """Disable verbose output when running tests."""
@@ -17,3 +22,10 @@ def pytest_configure(config):
             self.showfspath = False
 
     terminal.TerminalReporter = QuietReporter
+
+
+@pytest.fixture
+def gender_biased_w2v_small():
+    """Gender bias of the small Google News word2vec."""
+    model = load_w2v_small()
+    return GenderBiasWE(model, only_lower=True, verbose=True)
@@ -2,14 +2,28 @@
 # pylint: disable=redefined-outer-name,unused-variable,expression-not-assigned,singleton-comparison,protected-access
 
 import copy
+import os
+import subprocess
+import sys
 from math import isclose
 
 import numpy as np
 import pytest
 
-from ethically.we import GenderBiasWE
-from ethically.we.data import load_w2v_small
-from ethically.we.utils import project_reject_vector, project_vector
+import ethically
+from ethically.we import (
+    BiasWordsEmbedding, GenderBiasWE, MultiBiasWordsEmbedding,
+)
+from ethically.we.data import load_w2v
+from ethically.we.overlay import OverlayKeyedVectors
+from ethically.we.streaming import (
+    audit_word2vec_gender_bias, iter_word2vec_chunks, load_word2vec_words,
+)
+from ethically.we.utils import (
+    cosine_similarity, cosine_similarity_rows, group_equality_sets,
+    normalize, normalize_rows, project_reject_rows, project_reject_vector,
+    project_rows, project_vector, reject_rows, reject_vector,
+)
 
 from ..consts import RANDOM_STATE
 
@@ -18,17 +32,83 @@ ATOL = 1e-6
 
 N_RANDOM_NEUTRAL_WORDS_DEBIAS_TO_TEST = 1000
 
-
-@pytest.fixture
-def gender_biased_w2v_small():
-    model = load_w2v_small()
-    return GenderBiasWE(model, only_lower=True, verbose=True)
+# Absolute tolerances of the dtype policies against float64.
+# The computation is done in float32 at least, so with float32
+# the direction, the bias measures and the debiased vectors agree
+# up to float32 precision. float16 stores the vectors of the model
+# and the calculated matrices (e.g., the normalized vectors
+# in generate_analogies) with about three decimal digits.
+# The benchmarks are reported with three decimal digits.
+DTYPES_ATOL = {'float32': 1e-5, 'float16': 1e-3}
+DTYPES_ANALOGIES_ATOL = {'float32': 1e-5, 'float16': 1e-2}
+BENCHMARKS_ATOL = 2e-3
+
+LAZY_IMPORTED_MODULES = {'matplotlib', 'seaborn', 'sklearn', 'scipy',
+                         'gensim', 'tqdm', 'tabulate', 'pkg_resources'}
+MAX_IMPORT_TIME_US = 2 * 10**6
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7),
+                    reason='-X importtime requires Python 3.7')
+def test_import_time():
+    """Test that importing ethically does not import heavy modules."""
+    root_dir = os.path.dirname(os.path.dirname(ethically.__file__))
+    result = subprocess.run([sys.executable, '-X', 'importtime',
+                             '-c', 'import ethically'],
+                            cwd=root_dir,
+                            stderr=subprocess.PIPE, universal_newlines=True,
+                            check=True)
+
+    # import time: self [us] | cumulative | imported package
+    import_times = [line.split('|')
+                    for line in result.stderr.splitlines()
+                    if line.startswith('import time:')
+                    and not line.rstrip().endswith('imported package')]
+
+    imported_modules = {module.strip().split('.')[0]
+                        for _, _, module in import_times}
+    assert not imported_modules & LAZY_IMPORTED_MODULES
+
+    cumulative_time = next(int(cumulative)
+                           for _, cumulative, module in import_times
+                           if module.strip() == 'ethically')
+    assert cumulative_time < MAX_IMPORT_TIME_US
 
 
 def test_words_embbeding_loading(gender_biased_w2v_small):
     assert len(gender_biased_w2v_small.model.vocab) == 26423
 
 
+def test_load_w2v_cache(gender_biased_w2v_small, tmpdir):
+    """Test the loading of a model through the native cache."""
+    model = gender_biased_w2v_small.model
+    model_path = str(tmpdir.join('model.bin'))
+    cache_dir = str(tmpdir.join('cache'))
+
+    model.save_word2vec_format(model_path, binary=True)
+
+    for _ in range(2):
+        cached_model = load_w2v(model_path, cache_dir=cache_dir)
+
+        assert isinstance(cached_model.vectors, np.memmap)
+        assert cached_model.index2word == model.index2word
+        assert all(cached_model.vocab[word].index == model.vocab[word].index
+                   for word in model.vocab)
+        np.testing.assert_array_equal(cached_model.vectors, model.vectors)
+
+    with pytest.raises(ValueError):
+        cached_model.vectors[0] = 0
+
+    # the cache is invalidated when the model file is modified
+    model_copy = copy.deepcopy(model)
+    model_copy.vectors *= 2
+    model_copy.save_word2vec_format(model_path, binary=True)
+    os.utime(model_path, ns=(0, 0))
+
+    cached_model = load_w2v(model_path, cache_dir=cache_dir)
+    np.testing.assert_array_equal(cached_model.vectors, model_copy.vectors)
+
+
 def test_contains(gender_biased_w2v_small):
     assert 'home' in gender_biased_w2v_small
     assert 'HOME' not in gender_biased_w2v_small
@@ -45,6 +125,91 @@ def test_data_is_sorted_list(gender_biased_w2v_small):
                    for i in range(len(word_list) - 1))
 
 
+def test_neutral_words(gender_biased_w2v_small):
+    """Test the neutral words of GenderBiasWE."""
+    data = gender_biased_w2v_small._data
+    model = gender_biased_w2v_small.model
+
+    specific_words = {word_form
+                      for word in data['specific_full_with_definitional']
+                      for word_form in (word, word.lower(),
+                                        word.upper(), word.title())}
+    neutral_words = sorted(word for word in model.vocab
+                           if word not in specific_words)
+
+    assert 'neutral_words' not in data
+    assert data['neutral_words'] == neutral_words
+    assert ([model.index2word[index] for index in data['neutral_indices']]
+            == [word for word in model.index2word
+                if word not in specific_words])
+
+
+@pytest.mark.parametrize('dtype', ['float32', 'float16'])
+def test_dtype(gender_biased_w2v_small, dtype):
+    """Test that the dtype policies match float64 up to their tolerances."""
+    model = gender_biased_w2v_small.model
+    model_vectors = model.vectors.copy()
+    atol = DTYPES_ATOL[dtype]
+
+    gender_biased_we_float64 = GenderBiasWE(model, only_lower=True,
+                                            dtype='float64')
+    gender_biased_we = GenderBiasWE(model, only_lower=True, dtype=dtype)
+
+    assert gender_biased_we.model.vectors.dtype == dtype
+    assert (gender_biased_we.model.vectors.nbytes
+            == model.vectors.size * np.dtype(dtype).itemsize)
+    assert gender_biased_we.direction.dtype == np.float32
+    np.testing.assert_allclose(gender_biased_we.direction,
+                               gender_biased_we_float64.direction,
+                               atol=atol)
+
+    assert isclose(gender_biased_we.calc_direct_bias(),
+                   gender_biased_we_float64.calc_direct_bias(),
+                   abs_tol=atol)
+
+    analogies_df = gender_biased_we.generate_analogies(100)
+    analogies_float64_df = gender_biased_we_float64.generate_analogies(100)
+    np.testing.assert_allclose(analogies_df['score'],
+                               analogies_float64_df['score'],
+                               atol=DTYPES_ANALOGIES_ATOL[dtype])
+
+    gender_debiased_we = gender_biased_we.debias(inplace=False)
+    gender_debiased_we_float64 = gender_biased_we_float64.debias(inplace=False)
+
+    assert gender_debiased_we.model.vectors.dtype == dtype
+    assert gender_debiased_we.model.base is gender_biased_we.model
+    np.testing.assert_allclose(gender_debiased_we.model.vectors,
+                               gender_debiased_we_float64.model.vectors,
+                               atol=atol)
+    assert isclose(gender_debiased_we.calc_direct_bias(),
+                   gender_debiased_we_float64.calc_direct_bias(),
+                   abs_tol=atol)
+
+    evaluations = gender_debiased_we.evaluate_words_embedding()
+    evaluations_float64 = gender_debiased_we_float64.evaluate_words_embedding()
+    for evaluation_df, evaluation_float64_df in zip(evaluations,
+                                                    evaluations_float64):
+        np.testing.assert_allclose(evaluation_df.values,
+                                   evaluation_float64_df.values,
+                                   atol=BENCHMARKS_ATOL)
+
+    # the cast copy is debiased inplace, not the given model
+    gender_biased_we_float64 = GenderBiasWE(model, only_lower=True,
+                                            dtype='float64')
+    gender_biased_we_float64.debias()
+    assert gender_biased_we_float64.model.vectors.dtype == np.float64
+    np.testing.assert_array_equal(model.vectors, model_vectors)
+
+    with pytest.raises(ValueError):
+        GenderBiasWE(model, only_lower=True, dtype='int64')
+
+
+def test_direction_dtype(gender_biased_w2v_small):
+    """Test the direction is float64 when dtype is not given."""
+    assert gender_biased_w2v_small.model.vectors.dtype == np.float32
+    assert gender_biased_w2v_small.direction.dtype == np.float64
+
+
 def test_calc_direct_bias(gender_biased_w2v_small):
     """
     Test calc_direct_bias method in GenderBiasWE.
@@ -63,6 +228,59 @@ def test_calc_direct_bias(gender_biased_w2v_small):
                    0.08, abs_tol=1e-2)
 
 
+def test_calc_direct_bias_all_neutral_words(gender_biased_w2v_small):
+    """Test calc_direct_bias and estimate_direct_bias on all neutral words."""
+    bias_we = gender_biased_w2v_small
+    neutral_words = bias_we._data['neutral_words']
+    projections = bias_we.project_words_on_direction(neutral_words)
+
+    for c in [None, 2]:
+        direct_bias = np.mean(np.abs(projections) ** (1 if c is None else c))
+        assert isclose(bias_we.calc_direct_bias('neutral', c),
+                       direct_bias, abs_tol=ATOL)
+        assert isclose(bias_we.calc_direct_bias(neutral_words, c),
+                       direct_bias, abs_tol=ATOL)
+
+        estimate, (lower, upper) = bias_we.estimate_direct_bias(n_samples=1000,
+                                                                c=c)
+        assert lower < estimate < upper
+        assert lower <= direct_bias <= upper
+
+    estimate, interval = bias_we.estimate_direct_bias(
+        n_samples=len(neutral_words))
+    assert isclose(estimate, bias_we.calc_direct_bias('neutral'),
+                   abs_tol=ATOL)
+    assert interval == (estimate, estimate)
+
+    with pytest.raises(ValueError):
+        bias_we.estimate_direct_bias(confidence=1)
+
+
+def test_calc_direct_bias_no_words(gender_biased_w2v_small):
+    """Test the direct bias of no neutral words is nan."""
+    assert np.isnan(gender_biased_w2v_small.calc_direct_bias([]))
+
+    estimate, (lower, upper) = gender_biased_w2v_small.estimate_direct_bias([])
+    assert np.isnan(estimate) and np.isnan(lower) and np.isnan(upper)
+
+
+def test_project_words_on_direction(gender_biased_w2v_small):
+    """Test the batch projection against projecting word by word."""
+    words = gender_biased_w2v_small._data['profession_names']
+
+    projections = gender_biased_w2v_small.project_words_on_direction(words)
+    expected_projections = [gender_biased_w2v_small.project_on_direction(word)
+                            for word in words]
+
+    np.testing.assert_allclose(projections, expected_projections, atol=ATOL)
+
+    indices = np.array([gender_biased_w2v_small.model.vocab[word].index
+                        for word in words])
+    np.testing.assert_allclose(gender_biased_w2v_small
+                               .project_words_on_direction(indices),
+                               projections)
+
+
 # TODO: iterate over a dictionary
 def test_calc_indirect_bias(gender_biased_w2v_small, all_zero=False):
     """
@@ -143,6 +361,137 @@ def test_generate_closest_words_indirect_bias(gender_biased_w2v_small):
             .to_dict()) == result
 
 
+def test_calc_indirect_bias_matrix(gender_biased_w2v_small):
+    """Test calc_indirect_bias_matrix against calc_indirect_bias."""
+    bias_we = gender_biased_w2v_small
+    words1 = bias_we.model.index2word[:7]
+    words2 = bias_we.model.index2word[100:105]
+
+    indirect_biases = bias_we.calc_indirect_bias_matrix(words1, words2)
+    assert indirect_biases.shape == (len(words1), len(words2))
+
+    np.testing.assert_allclose(indirect_biases,
+                               [[bias_we.calc_indirect_bias(word1, word2)
+                                 for word2 in words2]
+                                for word1 in words1],
+                               rtol=1e-4, atol=1e-5)
+
+    # the tiles do not fit the shape of the matrix
+    np.testing.assert_allclose(bias_we.calc_indirect_bias_matrix(words1,
+                                                                 words2,
+                                                                 tile_size=3),
+                               indirect_biases,
+                               rtol=1e-4, atol=1e-5)
+
+    indices = bias_we._get_words_indices(words1)
+    np.testing.assert_allclose(bias_we.calc_indirect_bias_matrix(indices,
+                                                                 words2),
+                               indirect_biases)
+
+
+def test_multi_bias_words_embedding(gender_biased_w2v_small):
+    """Test MultiBiasWordsEmbedding against the single directions."""
+    model = gender_biased_w2v_small.model
+
+    other_bias_we = BiasWordsEmbedding(model)
+    other_bias_we.direction = normalize(model[model.index2word[10]]
+                                        - model[model.index2word[20]])
+
+    bias_words_embeddings = {'gender': gender_biased_w2v_small,
+                             'other': other_bias_we}
+    multi_bias_we = MultiBiasWordsEmbedding.from_bias_words_embeddings(
+        bias_words_embeddings, chunk_size=1000)
+
+    words = model.index2word[:2500:3]
+    neutral_words = model.index2word[2000:3000]
+
+    projections, direct_biases = multi_bias_we.audit(neutral_words, words)
+    assert list(projections.index) == words
+    assert list(projections.columns) == ['gender', 'other']
+
+    for name, bias_words_embedding in bias_words_embeddings.items():
+        expected_projections = (bias_words_embedding
+                                .project_words_on_direction(words))
+        np.testing.assert_allclose(projections[name], expected_projections,
+                                   atol=ATOL)
+        assert isclose(direct_biases[name],
+                       bias_words_embedding.calc_direct_bias(neutral_words),
+                       abs_tol=ATOL)
+
+    np.testing.assert_allclose(multi_bias_we.calc_direct_biases(neutral_words,
+                                                                c=2),
+                               [bias_we.calc_direct_bias(neutral_words, c=2)
+                                for bias_we in bias_words_embeddings.values()],
+                               atol=ATOL)
+
+    all_projections, all_direct_biases = multi_bias_we.audit(neutral_words)
+    assert len(all_projections) == len(model.index2word)
+    np.testing.assert_allclose(all_projections.loc[words], projections)
+    np.testing.assert_allclose(all_direct_biases, direct_biases)
+    np.testing.assert_allclose(multi_bias_we.project_words_on_directions(),
+                               all_projections)
+
+    tidy_projections = multi_bias_we.project_words_on_directions(words,
+                                                                 tidy=True)
+    assert list(tidy_projections.columns) == ['word', 'direction',
+                                              'projection']
+    assert len(tidy_projections) == 2 * len(words)
+    np.testing.assert_allclose(tidy_projections
+                               .pivot(index='word', columns='direction',
+                                      values='projection')
+                               .loc[words, ['gender', 'other']],
+                               projections)
+
+    with pytest.raises(ValueError):
+        MultiBiasWordsEmbedding.from_bias_words_embeddings(
+            {'gender': gender_biased_w2v_small,
+             'copy': copy.deepcopy(other_bias_we)})
+
+
+def test_calc_bias_across_words_embeddings(gender_biased_w2v_small):
+    """Test calc_bias_across_words_embeddings of several models."""
+    from gensim.models.keyedvectors import KeyedVectors
+    from scipy.stats import spearmanr
+
+    model = gender_biased_w2v_small.model
+    words = model.index2word[:3000:7] + ['not-in-vocab']
+
+    # a model with a part of the vocabulary, and the same direction
+    partial_words = model.index2word[::2]
+    partial_model = KeyedVectors(model.vector_size)
+    partial_model.add(partial_words, model[partial_words])
+    partial_bias_we = BiasWordsEmbedding(partial_model)
+    partial_bias_we.direction = gender_biased_w2v_small.direction
+
+    debiased_bias_we = gender_biased_w2v_small.debias(method='soft',
+                                                      inplace=False)
+    words_embedding_bias_dict = {'biased': gender_biased_w2v_small,
+                                 'partial': partial_bias_we,
+                                 'debiased': debiased_bias_we}
+
+    df, rhos = GenderBiasWE.calc_bias_across_words_embeddings(
+        words_embedding_bias_dict, words)
+
+    names = list(words_embedding_bias_dict)
+    assert list(df.index) == model.index2word[:3000:14]
+    assert list(df.columns) == list(rhos.index) == list(rhos.columns) == names
+
+    for name, web in words_embedding_bias_dict.items():
+        np.testing.assert_allclose(df[name],
+                                   [web.project_on_direction(word)
+                                    for word in df.index],
+                                   atol=ATOL)
+
+    np.testing.assert_allclose(rhos, spearmanr(df.values)[0], atol=ATOL)
+    np.testing.assert_allclose(np.diag(rhos), 1)
+
+    two_df, rho = GenderBiasWE._calc_bias_across_words_embeddings(
+        {'biased': gender_biased_w2v_small, 'partial': partial_bias_we},
+        words)
+    np.testing.assert_allclose(two_df, df[['biased', 'partial']])
+    assert isclose(rho, rhos.loc['biased', 'partial'], abs_tol=ATOL)
+
+
 def check_all_vectors_unit_length(bias_we):
     for word in bias_we.model.vocab:
         vector = bias_we[word]
@@ -210,6 +559,65 @@ def test_equalize(gender_biased_w2v_small, is_preforming=True):
     check_all_vectors_unit_length(gender_biased_w2v_small)
 
 
+def test_group_equality_sets():
+    """Test the grouping of equality sets into batches for equalize."""
+    equality_sets = [('she', 'he'), ('her', 'his'),
+                     ('woman', 'man', 'person'), ('her', 'him'),
+                     ('mother', 'father'), ('him', 'man')]
+
+    batches = group_equality_sets(equality_sets)
+
+    assert batches == [([0, 1, 4], [('she', 'he'), ('her', 'his'),
+                                    ('mother', 'father')]),
+                       ([2], [('woman', 'man', 'person')]),
+                       ([3], [('her', 'him')]),
+                       ([5], [('him', 'man')])]
+
+
+def test_rows_utils():
+    """Test the row-wise utils against the single vector ones."""
+    random_state = np.random.RandomState(RANDOM_STATE)
+    vectors = random_state.randn(10, 5)
+    vectors[3] = 0
+    other_vectors = random_state.randn(10, 5)
+    direction = random_state.randn(5)
+
+    np.testing.assert_allclose(normalize_rows(vectors),
+                               [normalize(vector) for vector in vectors],
+                               atol=ATOL)
+    np.testing.assert_allclose(project_rows(vectors, direction),
+                               [project_vector(vector, direction)
+                                for vector in vectors],
+                               atol=ATOL)
+    np.testing.assert_allclose(reject_rows(vectors, direction),
+                               [reject_vector(vector, direction)
+                                for vector in vectors],
+                               atol=ATOL)
+    np.testing.assert_allclose(np.sum(project_reject_rows(vectors, direction),
+                                      axis=0),
+                               vectors,
+                               atol=ATOL)
+
+    similarities = cosine_similarity_rows(vectors, other_vectors)
+    assert similarities[3] == 0
+    np.testing.assert_allclose(np.delete(similarities, 3),
+                               [cosine_similarity(vector, other_vector)
+                                for vector, other_vector
+                                in zip(np.delete(vectors, 3, axis=0),
+                                       np.delete(other_vectors, 3, axis=0))],
+                               atol=ATOL)
+
+    # orthonormal subspace of two directions
+    subspace = np.linalg.qr(random_state.randn(5, 2))[0].T
+    rejected_vectors = vectors.copy()
+    reject_rows(rejected_vectors, subspace, out=rejected_vectors)
+    np.testing.assert_allclose(rejected_vectors @ subspace.T, 0, atol=ATOL)
+    np.testing.assert_allclose(reject_rows(reject_rows(vectors, subspace[0]),
+                                           subspace[1]),
+                               rejected_vectors,
+                               atol=ATOL)
+
+
 def test_hard_debias_inplace(gender_biased_w2v_small, is_preforming=True):
     """Test hard_debias method in GenderBiasWE."""
     # pylint: disable=C0301
@@ -253,6 +661,122 @@ def test_hard_debias_not_inplace(gender_biased_w2v_small):
     test_hard_debias_inplace(gender_debiased_we, is_preforming=False)
 
 
+def test_hard_debias_not_inplace_overlay(gender_biased_w2v_small):
+    """Test that debias not inplace shares the vectors of the model."""
+    model = gender_biased_w2v_small.model
+    vectors = model.vectors.copy()
+
+    gender_debiased_we = gender_biased_w2v_small.debias(method='hard',
+                                                        inplace=False)
+
+    assert isinstance(gender_debiased_we.model, OverlayKeyedVectors)
+    assert gender_debiased_we.model.base is model
+    assert gender_debiased_we.model.nbytes < vectors.nbytes
+    np.testing.assert_array_equal(model.vectors, vectors)
+
+    gender_debiased_we_copy = copy.deepcopy(gender_debiased_we)
+    assert gender_debiased_we_copy.model.base is model
+
+    # the materialized matrix is kept until the overlay is modified
+    debiased_vectors = gender_debiased_we.model.vectors
+    assert gender_debiased_we.model.vectors is debiased_vectors
+    assert not debiased_vectors.flags.writeable
+    gender_debiased_we_copy.model.normalize_vectors()
+    assert gender_debiased_we.model.vectors is debiased_vectors
+    copy_vectors = gender_debiased_we_copy.model.vectors
+    gender_debiased_we_copy.model.set_vectors([0],
+                                              np.zeros((1, model.vector_size)))
+    assert gender_debiased_we_copy.model.vectors is not copy_vectors
+    assert not gender_debiased_we_copy.model.vectors[0].any()
+
+    # the flags of the vectors of the model are not changed
+    assert model.vectors.flags.writeable
+
+    gender_biased_w2v_small_copy = copy.deepcopy(gender_biased_w2v_small)
+    gender_biased_w2v_small_copy.debias(method='hard')
+    np.testing.assert_allclose(gender_debiased_we.model.vectors,
+                               gender_biased_w2v_small_copy.model.vectors,
+                               atol=ATOL)
+    np.testing.assert_allclose(gender_debiased_we['she'],
+                               gender_biased_w2v_small_copy['she'],
+                               atol=ATOL)
+
+
+def test_debias_inplace_overlay_base(gender_biased_w2v_small):
+    """Test that debias inplace of a shared model keeps its overlays."""
+    bias_we = copy.deepcopy(gender_biased_w2v_small)
+    model = bias_we.model
+    vectors = model.vectors.copy()
+
+    overlay = OverlayKeyedVectors(model)
+    gender_debiased_we = bias_we.debias(method='hard', inplace=False)
+    debiased_vectors = gender_debiased_we.model.vectors.copy()
+    gender_debiased_we.model.release_sims()
+
+    bias_we.debias(method='hard')
+
+    # the overlays calculate their vectors from the rows as they were
+    np.testing.assert_array_equal(overlay.vectors, vectors)
+    np.testing.assert_array_equal(overlay['she'],
+                                  vectors[model.vocab['she'].index])
+    np.testing.assert_array_equal(gender_debiased_we.model.vectors,
+                                  debiased_vectors)
+    np.testing.assert_allclose(model.vectors, debiased_vectors, atol=ATOL)
+
+    # an overlay of the debiased model is on top of the new rows
+    np.testing.assert_array_equal(OverlayKeyedVectors(model).vectors,
+                                  model.vectors)
+
+
+@pytest.mark.parametrize('binary', [True, False])
+def test_audit_word2vec_gender_bias(gender_biased_w2v_small, tmpdir, binary):
+    """Test the streaming audit against GenderBiasWE on the loaded model."""
+    model = gender_biased_w2v_small.model
+    path = str(tmpdir.join('model.w2v'))
+    model.save_word2vec_format(path, binary=binary)
+
+    chunks = list(iter_word2vec_chunks(path, binary, chunk_size=3000))
+    chunks_sizes = [len(words) for words, _ in chunks]
+    assert chunks_sizes[:-1] == [3000] * (len(chunks) - 1)
+    assert sum((words for words, _ in chunks), []) == model.index2word
+    np.testing.assert_allclose(np.concatenate([vectors
+                                               for _, vectors in chunks]),
+                               model.vectors, atol=ATOL)
+
+    words = ['she', 'he', model.index2word[-1]]
+    words_model = load_word2vec_words(path, words + ['not-in-vocab'], binary)
+    assert set(words_model.index2word) == set(words)
+    np.testing.assert_allclose(words_model[words], model[words], atol=ATOL)
+
+    audit = audit_word2vec_gender_bias(path, binary, only_lower=True,
+                                       n_extreme=5, chunk_size=3000)
+
+    np.testing.assert_allclose(audit['direction'],
+                               gender_biased_w2v_small.direction,
+                               atol=ATOL)
+    assert audit['n_words'] == len(model.index2word)
+    assert (audit['n_neutral_words']
+            == len(gender_biased_w2v_small._data['neutral_indices']))
+    assert isclose(audit['direct_bias'],
+                   gender_biased_w2v_small.calc_direct_bias('neutral'),
+                   abs_tol=ATOL)
+
+    bias_we = gender_biased_w2v_small
+    profession_names = bias_we._data['neutral_profession_names']
+    assert list(audit['projections'].index) == profession_names
+    np.testing.assert_allclose(audit['projections'],
+                               bias_we.project_words_on_direction(
+                                   profession_names),
+                               atol=ATOL)
+
+    neutral_words = bias_we._data['neutral_words']
+    projections = bias_we.project_words_on_direction(neutral_words)
+    order = np.argsort(-projections)
+    extreme_words = {neutral_words[index]
+                     for index in np.r_[order[:5], order[-5:]]}
+    assert set(audit['extreme']['word']) == extreme_words
+
+
 def test_copy(gender_biased_w2v_small):
     gender_biased_w2v_small_copy = copy.copy(gender_biased_w2v_small)
     assert (gender_biased_w2v_small.direction
@@ -294,3 +818,58 @@ def test_learn_full_specific_words(gender_biased_w2v_small):
     full_specific_words.sort()
     assert (set(gender_biased_w2v_small._data['specific_seed'])
             .issubset(full_specific_words))
+
+
+def test_learn_full_specific_words_margins(gender_biased_w2v_small):
+    model = gender_biased_w2v_small.model
+
+    (full_specific_words,
+     clf, margins) = gender_biased_w2v_small.learn_full_specific_words(
+         chunk_size=1000, return_margins=True)
+
+    assert margins.shape == (len(model.index2word),)
+    assert full_specific_words == [word
+                                   for word, margin in zip(model.index2word,
+                                                           margins)
+                                   if margin > 0]
+
+    np.random.seed(RANDOM_STATE)
+    words = np.random.choice(model.index2word, 100, replace=False)
+    for word in words:
+        vector = model[word] / np.linalg.norm(model[word])
+        np.testing.assert_allclose(clf.decision_function([vector])[0],
+                                   margins[model.vocab[word].index],
+                                   atol=ATOL)
+
+
+def test_learn_full_specific_words_sgd(gender_biased_w2v_small):
+    model = gender_biased_w2v_small.model
+    specific_seed = gender_biased_w2v_small._data['specific_seed']
+    n_specific_seed = sum(word in model.vocab for word in specific_seed)
+
+    kwargs = {'method': 'sgd', 'max_non_specific_examples': 5000,
+              'debug': True}
+    results = [gender_biased_w2v_small.learn_full_specific_words(**kwargs)
+               for _ in range(2)]
+
+    (full_specific_words, clf, train_indices, y), other_results = results
+
+    assert full_specific_words == other_results[0]
+    n_train = n_specific_seed + 5000
+    assert len(train_indices) == len(set(train_indices)) == n_train
+    assert y.sum() == n_specific_seed
+    assert all((model.index2word[index] in specific_seed) == is_specific
+               for index, is_specific in zip(train_indices, y))
+
+    with pytest.raises(ValueError):
+        gender_biased_w2v_small.learn_full_specific_words(method='svn')
+
+    with pytest.raises(ValueError):
+        BiasWordsEmbedding.learn_full_specific_words(gender_biased_w2v_small,
+                                                     ['not-a-word'],
+                                                     method='sgd')
+
+    with pytest.raises(ValueError):
+        BiasWordsEmbedding.learn_full_specific_words(gender_biased_w2v_small,
+                                                     model.index2word,
+                                                     method='sgd')
@@ -0,0 +1,157 @@
+"""Unit test module for ethically.we.analogies and ethically.we.lsh"""
+# pylint: disable=redefined-outer-name
+
+import numpy as np
+import pytest
+
+from ethically.we.analogies import (
+    generate_analogies_candidates, generate_analogies_candidates_pruned,
+)
+from ethically.we.lsh import LSHIndex
+
+
+ATOL = 1e-6
+
+
+def test_generate_analogies_blocks(gender_biased_w2v_small):
+    """Test that generate_analogies does not depend on the block size."""
+    analogies_df = (gender_biased_w2v_small
+                    .generate_analogies(restrict_vocab=3000))
+
+    assert len(analogies_df) == 100
+    assert (analogies_df['distance'] < 1).all()
+    assert analogies_df['score'].is_monotonic_decreasing
+    assert not (set(analogies_df['x']) & set(analogies_df['y']))
+
+    for block_size in [1, 7, 3000]:
+        block_analogies_df = (gender_biased_w2v_small
+                              .generate_analogies(restrict_vocab=3000,
+                                                  block_size=block_size))
+
+        assert (block_analogies_df[['x', 'y']].values.tolist()
+                == analogies_df[['x', 'y']].values.tolist())
+        np.testing.assert_allclose(block_analogies_df[['distance', 'score']],
+                                   analogies_df[['distance', 'score']],
+                                   atol=ATOL)
+
+
+def test_generate_analogies_pruned(gender_biased_w2v_small, capsys):
+    """Test that pruning the pairs does not change the analogies."""
+    for multiple in [False, True]:
+        analogies_df = (gender_biased_w2v_small
+                        .generate_analogies(restrict_vocab=3000,
+                                            multiple=multiple))
+
+        capsys.readouterr()
+        pruned_analogies_df = (gender_biased_w2v_small
+                               .generate_analogies(restrict_vocab=3000,
+                                                   multiple=multiple,
+                                                   block_size=100,
+                                                   method='pruned'))
+
+        assert 'Pruned Pairs' in capsys.readouterr().out
+
+        assert (pruned_analogies_df[['x', 'y']].values.tolist()
+                == analogies_df[['x', 'y']].values.tolist())
+        np.testing.assert_allclose(pruned_analogies_df[['distance', 'score']],
+                                   analogies_df[['distance', 'score']],
+                                   atol=ATOL)
+
+    with pytest.raises(ValueError):
+        gender_biased_w2v_small.generate_analogies(method='magic')
+
+
+def test_generate_analogies_candidates_pruned_counts(gender_biased_w2v_small):
+    """Test that pairs are pruned by both the window and the bound."""
+    vectors = gender_biased_w2v_small.model.vectors[:3000]
+    normalized_vectors = vectors / np.linalg.norm(vectors, axis=1)[:, None]
+    direction = gender_biased_w2v_small.direction
+
+    candidates = generate_analogies_candidates(normalized_vectors, direction,
+                                               delta=1., n_candidates=500,
+                                               block_size=100)
+    pruned_candidates, counts = generate_analogies_candidates_pruned(
+        normalized_vectors, direction, delta=1., n_candidates=500,
+        block_size=100, return_counts=True)
+
+    for array, pruned_array in zip(candidates, pruned_candidates):
+        np.testing.assert_allclose(np.sort(pruned_array), np.sort(array),
+                                   atol=ATOL)
+
+    n_pairs = len(normalized_vectors) * (len(normalized_vectors) - 1)
+    assert counts['n_pruned_window_pairs'] > 0
+    assert counts['n_pruned_bound_pairs'] > 0
+    assert (counts['n_pruned_window_pairs']
+            + counts['n_pruned_bound_pairs']) < n_pairs
+
+
+def test_lsh_index(gender_biased_w2v_small, tmpdir):
+    """Test the LSH index against the exact pairs search."""
+    vectors = gender_biased_w2v_small.model.vectors[:3000]
+    normalized_vectors = vectors / np.linalg.norm(vectors, axis=1)[:, None]
+
+    index = LSHIndex().fit(gender_biased_w2v_small.model.vectors)
+    assert index.calc_recall(normalized_vectors, delta=1.) > 0.9
+
+    index_path = str(tmpdir.join('w2v_small.bin.lsh.npz'))
+    index.save(index_path)
+    loaded_index = LSHIndex.load_or_fit(index_path,
+                                        gender_biased_w2v_small.model.vectors)
+    np.testing.assert_array_equal(loaded_index.codes, index.codes)
+    assert loaded_index.fingerprint is not None
+
+    # an index of other vectors with the same number of rows is fitted again
+    other_vectors = gender_biased_w2v_small.model.vectors[::-1]
+    other_index = LSHIndex.load_or_fit(index_path, other_vectors)
+    assert other_index.fingerprint != loaded_index.fingerprint
+    np.testing.assert_array_equal(other_index.codes,
+                                  LSHIndex().fit(other_vectors).codes)
+    assert LSHIndex.load(index_path).fingerprint == other_index.fingerprint
+
+    index.save(index_path)
+
+    analogies_df = (gender_biased_w2v_small
+                    .generate_analogies(restrict_vocab=3000))
+
+    # the saved index was fitted on all the vectors,
+    # so it is fitted again on the searched vectors
+    lsh_analogies_df = (gender_biased_w2v_small
+                        .generate_analogies(restrict_vocab=3000,
+                                            method='lsh',
+                                            index=index_path))
+    analogies_index = LSHIndex.load(index_path)
+    assert analogies_index.codes.shape[1] == 3000
+
+    common_analogies = (set(map(tuple, analogies_df[['x', 'y']].values))
+                        & set(map(tuple, lsh_analogies_df[['x', 'y']].values)))
+    assert len(common_analogies) >= 90
+
+    assert (gender_biased_w2v_small
+            .generate_analogies(restrict_vocab=3000, method='lsh',
+                                index=analogies_index)
+            .equals(lsh_analogies_df))
+
+    with pytest.raises(ValueError):
+        gender_biased_w2v_small.generate_analogies(restrict_vocab=3000,
+                                                   method='lsh',
+                                                   index=index)
+
+
+def test_lsh_index_max_bucket_size(gender_biased_w2v_small):
+    """Test the LSH pairs of oversized buckets are split and unique."""
+    vectors = gender_biased_w2v_small.model.vectors[:1000]
+    normalized_vectors = vectors / np.linalg.norm(vectors, axis=1)[:, None]
+
+    # a single bit per table puts hundreds of vectors in every bucket
+    index = LSHIndex(n_bits=1).fit(vectors)
+
+    x_indices, y_indices, distances = index.find_pairs(normalized_vectors,
+                                                       delta=1.,
+                                                       max_bucket_size=10)
+    assert (x_indices < y_indices).all()
+    assert len(set(zip(x_indices, y_indices))) == len(x_indices)
+    assert (distances < 1.).all()
+
+    n_split_pairs = len(x_indices)
+    n_pairs = len(index.find_pairs(normalized_vectors, delta=1.)[0])
+    assert 0 < n_split_pairs < n_pairs
@@ -0,0 +1,179 @@
+"""Unit test module for ethically.we.benchmark"""
+# pylint: disable=redefined-outer-name
+
+import copy
+
+import numpy as np
+import pytest
+
+from ethically.we import GenderBiasWE
+from ethically.we.benchmark import (
+    ANALOGIES_TASKS, WORD_PAIRS_TASKS, evaluate_word_analogies_file,
+    evaluate_word_pairs, evaluate_word_pairs_batch, evaluate_word_pairs_file,
+    get_data_resource_path, load_word_analogies, read_word_analogies,
+    resolve_dataset_rows,
+)
+from ethically.we.data import (
+    CACHE_DIR_ENV, read_model_cache, write_model_cache,
+)
+from ethically.we.overlay import OverlayKeyedVectors
+from ethically.we.utils import calc_vocabulary_fingerprint
+
+
+ATOL = 1e-6
+
+# The workers normalize the float16 vectors once more,
+# which changes the benchmarks up to the float16 precision.
+PARALLEL_FLOAT16_ATOL = 1e-2
+
+
+def test_load_word_analogies(gender_biased_w2v_small, tmpdir, monkeypatch):
+    """Test the compiled and memoized benchmark datasets."""
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmpdir))
+    load_word_analogies.cache_clear()
+
+    path = get_data_resource_path(ANALOGIES_TASKS['Google'])
+    dataset = load_word_analogies(path)
+
+    assert len(tmpdir.join('benchmark').listdir()) == 1
+    assert load_word_analogies(path) is dataset
+
+    for name, array in read_word_analogies(path).items():
+        np.testing.assert_array_equal(dataset[name], array)
+
+    model = gender_biased_w2v_small.model
+    words_rows, _ = resolve_dataset_rows(model, dataset)
+    assert resolve_dataset_rows(model, dataset)[0] is words_rows
+
+    # a variant with the same vocabulary shares the rows
+    debiased_model = gender_biased_w2v_small.debias(inplace=False).model
+    assert resolve_dataset_rows(debiased_model, dataset)[0] is words_rows
+
+    # the rows are cached by the content of the dataset
+    load_word_analogies.cache_clear()
+    reloaded_dataset = load_word_analogies(path)
+    assert reloaded_dataset is not dataset
+    assert resolve_dataset_rows(model, reloaded_dataset)[0] is words_rows
+
+    fingerprint = calc_vocabulary_fingerprint(model)
+    assert calc_vocabulary_fingerprint(model) is fingerprint
+    model_copy = copy.deepcopy(model)
+    assert calc_vocabulary_fingerprint(model_copy) == fingerprint
+    model_copy.index2word[0] = 'not-in-vocab'
+    assert calc_vocabulary_fingerprint(model_copy) != fingerprint
+
+    # an overlay shares the fingerprint of its base
+    overlay = OverlayKeyedVectors(model)
+    assert calc_vocabulary_fingerprint(overlay) is fingerprint
+
+    assert all(row == -1 or model.index2word[row].upper() == word.upper()
+               for word, row in zip(dataset['words'], words_rows))
+
+
+def test_evaluate_words_embedding_parallel(gender_biased_w2v_small):
+    """Test the evaluation of the tasks in worker processes."""
+    bias_we = gender_biased_w2v_small
+    (word_pairs_evaluation,
+     word_analogies_evaluation) = bias_we.evaluate_words_embedding()
+
+    (parallel_word_pairs_evaluation,
+     parallel_word_analogies_evaluation,
+     timings) = bias_we.evaluate_words_embedding(n_jobs=2,
+                                                 return_timings=True)
+
+    assert word_pairs_evaluation.equals(parallel_word_pairs_evaluation)
+    assert (word_analogies_evaluation
+            .equals(parallel_word_analogies_evaluation))
+
+    assert (list(timings.index)
+            == (list(word_pairs_evaluation.index)
+                + list(word_analogies_evaluation.index)))
+    assert (timings['seconds'] > 0).all()
+
+    with pytest.raises(ValueError):
+        gender_biased_w2v_small.evaluate_words_embedding(n_jobs=0)
+
+
+def test_evaluate_words_embedding_parallel_dtype(gender_biased_w2v_small,
+                                                 tmpdir):
+    """Test that the workers evaluate the model in its dtype."""
+    gender_biased_we = GenderBiasWE(gender_biased_w2v_small.model,
+                                    only_lower=True, dtype='float16')
+
+    model_path = str(tmpdir.join('model'))
+    write_model_cache(gender_biased_we.model, model_path, normalize=True)
+    assert read_model_cache(model_path).vectors.dtype == np.float16
+
+    evaluations = gender_biased_we.evaluate_words_embedding()
+    parallel_evaluations = gender_biased_we.evaluate_words_embedding(n_jobs=2)
+
+    for evaluation_df, parallel_evaluation_df in zip(evaluations,
+                                                     parallel_evaluations):
+        np.testing.assert_allclose(parallel_evaluation_df.values,
+                                   evaluation_df.values,
+                                   atol=PARALLEL_FLOAT16_ATOL)
+
+
+@pytest.mark.parametrize('kwargs', [{'restrict_vocab': 10000},
+                                    {'restrict_vocab': 10000,
+                                     'case_insensitive': False},
+                                    {'restrict_vocab': 10000,
+                                     'dummy4unknown': True}])
+def test_evaluate_word_analogies_file(gender_biased_w2v_small, kwargs):
+    """Test the native analogies evaluator against gensim."""
+    model = gender_biased_w2v_small.model
+
+    for filename in ANALOGIES_TASKS.values():
+        path = get_data_resource_path(filename)
+
+        score, sections = model.evaluate_word_analogies(path, **kwargs)
+        native_score, native_sections = evaluate_word_analogies_file(model,
+                                                                     path,
+                                                                     **kwargs)
+
+        assert score == native_score
+        assert ([(section['section'],
+                  len(section['correct']), len(section['incorrect']))
+                 for section in sections]
+                == list(zip(native_sections.index,
+                            native_sections['correct'],
+                            native_sections['incorrect'])))
+
+
+@pytest.mark.parametrize('kwargs', [{},
+                                    {'restrict_vocab': 10000,
+                                     'case_insensitive': False},
+                                    {'dummy4unknown': True}])
+def test_evaluate_word_pairs_file(gender_biased_w2v_small, kwargs):
+    """Test the native word pairs evaluator against gensim."""
+    model = gender_biased_w2v_small.model
+
+    for filename in WORD_PAIRS_TASKS.values():
+        path = get_data_resource_path(filename)
+
+        pearson, spearman, oov_ratio = model.evaluate_word_pairs(path,
+                                                                 **kwargs)
+        (native_pearson,
+         native_spearman,
+         native_oov_ratio) = evaluate_word_pairs_file(model, path, **kwargs)
+
+        # the similarities are equal up to float32 rounding,
+        # which may break ties of the ranks differently
+        np.testing.assert_allclose(native_pearson, pearson, atol=ATOL)
+        np.testing.assert_allclose(native_spearman, spearman, atol=1e-4)
+        assert native_oov_ratio == oov_ratio
+
+
+def test_evaluate_word_pairs_batch(gender_biased_w2v_small):
+    """Test the word pairs evaluation of a batch of variants."""
+    models = {'biased': gender_biased_w2v_small.model,
+              'debiased': gender_biased_w2v_small.debias(inplace=False).model}
+
+    word_pairs_evaluation = evaluate_word_pairs_batch(models)
+
+    assert (list(word_pairs_evaluation.index.levels[0])
+            == ['biased', 'debiased'])
+
+    for name, model in models.items():
+        assert (word_pairs_evaluation.loc[name]
+                .equals(evaluate_word_pairs(model)))
@@ -0,0 +1,144 @@
+"""Unit test module for ethically.we.perf and ethically.we.memory"""
+
+import copy
+
+import numpy as np
+import pytest
+
+from ethically.we import GenderBiasWE, memory
+from ethically.we.memory import MemoryMeasurement, MemoryProfiler
+from ethically.we.perf import (
+    PERF_OPERATIONS, compare_results, generate_synthetic_model, load_results,
+    main as perf_main, run_benchmarks, save_results,
+)
+
+
+def test_perf(tmpdir):
+    """Test the benchmark suite on a small synthetic words embedding."""
+    model = generate_synthetic_model(3000, dimension=20)
+
+    assert len(model.vocab) == len(model.index2word) == 3000
+    assert model.vectors.shape == (3000, 20)
+    assert GenderBiasWE(model, only_lower=True).direction is not None
+
+    results = run_benchmarks([3000], dimension=20)
+
+    assert ([result['operation'] for result in results['results']]
+            == list(PERF_OPERATIONS))
+    assert all(result['seconds'] > 0 for result in results['results'])
+
+    results_path = str(tmpdir.join('perf.json'))
+    save_results(results, results_path)
+    assert load_results(results_path) == results
+
+    comparison = compare_results(results, results)
+    assert (comparison['ratio'] == 1).all()
+    assert not comparison['regression'].any()
+
+    slower_results = copy.deepcopy(results)
+    for result in slower_results['results']:
+        result['seconds'] *= 2
+    slower_results_path = str(tmpdir.join('slower_perf.json'))
+    save_results(slower_results, slower_results_path)
+
+    assert compare_results(slower_results, results)['regression'].all()
+
+    # the command line measures again, so its baselines are far
+    # from the measured timings, to check the exit code regardless
+    # of the noise of the timing
+    for factor, exit_code in [(100, 0), (0.01, 1)]:
+        baseline_results = copy.deepcopy(results)
+        for result in baseline_results['results']:
+            result['seconds'] *= factor
+        baseline_path = str(tmpdir.join('baseline_{}.json'.format(factor)))
+        save_results(baseline_results, baseline_path)
+
+        assert perf_main(['--n-words', '3000', '--dimension', '20',
+                          '--operations', 'calc_direct_bias',
+                          '--baseline', baseline_path]) == exit_code
+
+    with pytest.raises(ValueError):
+        run_benchmarks([3000], dimension=20, operations=['nothing'])
+
+
+def test_synthetic_model_word2vec_format(tmpdir):
+    """Test that a synthetic words embedding is saved and loaded back."""
+    from gensim.models.keyedvectors import KeyedVectors
+
+    # the vocabulary includes phrases of the benchmark datasets
+    model = generate_synthetic_model(12000, dimension=5)
+    assert not any(' ' in word for word in model.index2word)
+
+    path = str(tmpdir.join('synthetic.bin'))
+    model.save_word2vec_format(path, binary=True)
+    loaded_model = KeyedVectors.load_word2vec_format(path, binary=True)
+
+    assert loaded_model.index2word == model.index2word
+    np.testing.assert_array_equal(loaded_model.vectors, model.vectors)
+
+
+def test_memory_profiler(gender_biased_w2v_small):
+    """Test the peak memory records of the public methods."""
+    array_size = 10**7
+    debias = GenderBiasWE.debias
+
+    with MemoryProfiler() as profiler:
+        with MemoryMeasurement() as measurement:
+            array = np.ones(array_size, dtype=np.uint8)
+            del array
+
+        gender_biased_w2v_small.calc_direct_bias()
+        gender_biased_w2v_small.debias(inplace=False)
+
+    assert measurement.peak_traced_bytes >= array_size
+    assert profiler.measurement.peak_traced_bytes >= array_size
+
+    records = profiler.report()
+
+    # only the outermost methods are recorded
+    assert (list(records['method'])
+            == ['GenderBiasWE.calc_direct_bias', 'GenderBiasWE.debias'])
+    assert (records['n_words']
+            == len(gender_biased_w2v_small.model.index2word)).all()
+    assert (records['peak_traced_bytes'] > 0).all()
+    np.testing.assert_allclose(records['traced_bytes_per_word'],
+                               records['peak_traced_bytes']
+                               / records['n_words'])
+
+    # the methods are restored
+    assert GenderBiasWE.debias is debias
+
+
+def test_memory_measurement_reset_peak_rss(tmpdir, monkeypatch):
+    """Test the peak RSS is reset only when it is asked for."""
+    clear_refs_path = tmpdir.join('clear_refs')
+    clear_refs_path.write('')
+    monkeypatch.setattr(memory, 'PROC_CLEAR_REFS_PATH', str(clear_refs_path))
+
+    with MemoryMeasurement() as measurement:
+        array = np.ones(10**7, dtype=np.uint8)
+        del array
+
+    assert clear_refs_path.read() == ''
+    assert (measurement.peak_rss_bytes is None
+            or measurement.peak_rss_bytes >= 0)
+
+    with MemoryMeasurement(reset_peak_rss=True):
+        pass
+
+    assert clear_refs_path.read() == memory.CLEAR_REFS_RESET_PEAK_RSS
+
+
+def test_perf_memory():
+    """Test the memory mode of the benchmark suite."""
+    results = run_benchmarks([3000], dimension=20,
+                             operations=['debias_hard'], memory=True)
+
+    result, = results['results']
+    assert result['peak_traced_bytes'] > 0
+    assert (result['traced_bytes_per_word']
+            == result['peak_traced_bytes'] / 3000)
+
+    comparison = compare_results(results, results,
+                                 metric='peak_traced_bytes')
+    assert not comparison['regression'].any()
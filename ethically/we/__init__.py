@@ -1,4 +1,5 @@
-__all__ = ['BiasWordsEmbedding', 'GenderBiasWE']
+__all__ = ['BiasWordsEmbedding', 'GenderBiasWE', 'MultiBiasWordsEmbedding']
 
 from .bias import GenderBiasWE
 from .core import BiasWordsEmbedding
+from .multi import MultiBiasWordsEmbedding
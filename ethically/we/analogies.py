@@ -0,0 +1,447 @@
+"""
+Search of analogies along a direction of a words embedding.
+
+An analogy is a pair of words (x, y) within a distance ``delta``,
+scored by the cosine similarity between x - y and the direction
+(see ``BiasWordsEmbedding.generate_analogies``).
+
+The pairs are searched without the whole distance matrix:
+
+1. ``blocks`` - the distance matrix is calculated in blocks of rows,
+   and only the best scored pairs are kept.
+2. ``pruned`` - as ``blocks``, but pairs that cannot be among
+   the best scored ones are pruned by the projections of their words
+   on the direction. The result is the same as of ``blocks``,
+   and the number of pruned pairs is reported in verbose mode.
+3. ``lsh`` - the pairs within the distance are searched approximately
+   with an :class:`~ethically.we.lsh.LSHIndex`,
+   so some analogies might be missed.
+"""
+
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from .lsh import LSHIndex
+from .utils import (
+    calc_euclidean_distances, calc_rows_dot, calc_vectors_fingerprint,
+    normalize_rows, select_top_k,
+)
+
+
+ANALOGIES_METHODS = ['blocks', 'pruned', 'lsh']
+ANALOGIES_BLOCK_SIZE = 1000
+ANALOGIES_CANDIDATES_FACTOR = 100
+ANALOGIES_PRUNING_TOLERANCE = 1e-3
+
+
+def _as_dtype(array, dtype):
+    if dtype is None:
+        return array
+    return array.astype(dtype, copy=False)
+
+
+def _init_candidates():
+    return (np.empty(0), np.empty(0, dtype=int),
+            np.empty(0, dtype=int), np.empty(0))
+
+
+def _score_analogies_candidates(normalized_vectors, direction,
+                                candidates, n_candidates,
+                                x_indices, y_indices, distances,
+                                chunk_size, dtype):
+    """Score pairs (x, y) and merge them into the top candidates."""
+
+    for chunk_start in range(0, len(x_indices), chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+
+        x_vectors = _as_dtype(normalized_vectors[x_indices[chunk]], dtype)
+        y_vectors = _as_dtype(normalized_vectors[y_indices[chunk]], dtype)
+        normalized_x_minus_y_vectors = normalize_rows(x_vectors - y_vectors)
+
+        cos_distances = normalized_x_minus_y_vectors @ direction
+
+        candidates = select_top_k(
+            n_candidates,
+            *[np.concatenate(arrays)
+              for arrays in zip(candidates,
+                                (cos_distances,
+                                 x_indices[chunk],
+                                 y_indices[chunk],
+                                 distances[chunk]))])
+
+    return candidates
+
+
+def generate_analogies_candidates(normalized_vectors, direction, delta,
+                                  n_candidates, block_size,
+                                  dtype=None, verbose=False):
+    """Find the top scored pairs (x, y) with distance below delta.
+
+    The distance matrix is computed in blocks of rows,
+    and only the ``n_candidates`` best scored pairs are kept,
+    so the peak memory is bounded by ``block_size``
+    instead of the squared vocabulary size.
+
+    :param normalized_vectors: Matrix of the normalized vectors
+    :param direction: The direction vector
+    :param float delta: The maximal distance between x and y
+    :param int n_candidates: The number of the top scored pairs
+    :param int block_size: The number of rows of the distance matrix
+                           to calculate at once
+    :param dtype: The dtype of the calculation, by default
+                  the dtype of the vectors
+    :param bool verbose: Set vebosity
+    :return: Tuple of arrays - scores, x indices, y indices
+             and distances of the candidate pairs.
+    """
+
+    # pylint: disable=R0914
+
+    n_vectors, n_dims = normalized_vectors.shape
+
+    # gathering the vectors of the candidate pairs
+    # takes about the same memory as a block of distances
+    chunk_size = max(1, block_size * n_vectors // n_dims)
+
+    candidates = _init_candidates()
+
+    blocks_starts = range(0, n_vectors, block_size)
+    if verbose:
+        from tqdm import tqdm
+        blocks_starts = tqdm(blocks_starts)
+
+    for block_start in blocks_starts:
+        block_vectors = normalized_vectors[block_start:
+                                           block_start + block_size]
+
+        pairs_distances = calc_euclidean_distances(block_vectors,
+                                                   normalized_vectors,
+                                                   dtype)
+        # as if the whole square distance matrix was calculated
+        diagonal = np.arange(len(block_vectors))
+        pairs_distances[diagonal, block_start + diagonal] = 0
+
+        x_indices, y_indices = np.nonzero((pairs_distances < delta)
+                                          & (pairs_distances != 0))
+        distances = pairs_distances[x_indices, y_indices]
+        x_indices += block_start
+
+        del pairs_distances
+
+        candidates = _score_analogies_candidates(normalized_vectors,
+                                                 direction,
+                                                 candidates,
+                                                 n_candidates,
+                                                 x_indices,
+                                                 y_indices,
+                                                 distances,
+                                                 chunk_size,
+                                                 dtype)
+
+    return candidates
+
+
+def generate_analogies_candidates_pruned(normalized_vectors, direction,
+                                         delta, n_candidates, block_size,
+                                         dtype=None, verbose=False,
+                                         return_counts=False):
+    """Find the top scored pairs (x, y) with distance below delta.
+
+    Same as :func:`generate_analogies_candidates`, but pairs that
+    cannot beat the current lowest top score are pruned
+    by the projections of their words on the direction.
+
+    For unit vectors, write x = p_x * d + r_x where r_x is perpendicular
+    to the direction d, and ||r_x|| = sqrt(1 - p_x ** 2).
+    Then ||x - y|| >= sqrt((p_x - p_y) ** 2 + (||r_x|| - ||r_y||) ** 2),
+    and the score (p_x - p_y) / ||x - y|| is bounded by that.
+    Besides, ||x - y|| >= |p_x - p_y|, so with the words sorted
+    by their projections, only a window of them might be within delta.
+
+    The parameters are the same as of
+    :func:`generate_analogies_candidates`.
+
+    :param bool return_counts: Whether to return also a dictionary
+                               of the numbers of the pruned pairs,
+                               ``n_pruned_window_pairs`` whose distance
+                               was not calculated
+                               and ``n_pruned_bound_pairs``
+                               within delta that were not scored
+    :return: Tuple of arrays - scores, x indices, y indices
+             and distances of the candidate pairs.
+    """
+
+    # pylint: disable=R0912,R0914,R0915
+
+    n_vectors, n_dims = normalized_vectors.shape
+    chunk_size = max(1, block_size * n_vectors // n_dims)
+
+    direction_norm = np.linalg.norm(direction)
+    projections = calc_rows_dot(normalized_vectors,
+                                direction / direction_norm,
+                                dtype)
+
+    sorted_indices = np.argsort(-projections, kind='mergesort')
+    sorted_projections = projections[sorted_indices]
+    sorted_rejections_norms = np.sqrt(np.maximum(0,
+                                                 1 - sorted_projections**2))
+    negative_sorted_projections = -sorted_projections
+
+    candidates = _init_candidates()
+
+    n_pruned_window_pairs = 0
+    n_pruned_bound_pairs = 0
+
+    blocks_starts = range(0, n_vectors, block_size)
+    if verbose:
+        from tqdm import tqdm
+        blocks_starts = tqdm(blocks_starts)
+
+    for block_start in blocks_starts:
+        block_end = min(block_start + block_size, n_vectors)
+
+        if len(candidates[0]) < n_candidates:
+            min_score = -np.inf
+        else:
+            min_score = (candidates[0].min() / direction_norm
+                         - ANALOGIES_PRUNING_TOLERANCE)
+
+        # with a positive min_score, only y below x is relevant
+        window_max = sorted_projections[block_start]
+        if min_score <= 0:
+            window_max += delta
+        window_min = sorted_projections[block_end - 1] - delta
+
+        window_start = np.searchsorted(
+            negative_sorted_projections,
+            -window_max - ANALOGIES_PRUNING_TOLERANCE,
+            side='left')
+        window_end = np.searchsorted(
+            negative_sorted_projections,
+            -window_min + ANALOGIES_PRUNING_TOLERANCE,
+            side='right')
+
+        n_pruned_window_pairs += ((block_end - block_start)
+                                  * (n_vectors
+                                     - (window_end - window_start)))
+
+        block_vectors = normalized_vectors[sorted_indices[block_start:
+                                                          block_end]]
+        window_vectors = normalized_vectors[sorted_indices[window_start:
+                                                           window_end]]
+
+        pairs_distances = calc_euclidean_distances(block_vectors,
+                                                   window_vectors,
+                                                   dtype)
+        # as if the whole square distance matrix was calculated
+        diagonal = np.arange(max(block_start, window_start),
+                             min(block_end, window_end))
+        pairs_distances[diagonal - block_start,
+                        diagonal - window_start] = 0
+
+        x_positions, y_positions = np.nonzero((pairs_distances < delta)
+                                              & (pairs_distances != 0))
+        distances = pairs_distances[x_positions, y_positions]
+        x_positions += block_start
+        y_positions += window_start
+
+        del pairs_distances
+
+        projections_diffs = (sorted_projections[x_positions]
+                             - sorted_projections[y_positions])
+        rejections_norms_diffs = (sorted_rejections_norms[x_positions]
+                                  - sorted_rejections_norms[y_positions])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distances_bounds = np.sqrt(projections_diffs**2
+                                       + rejections_norms_diffs**2)
+            scores_bounds = np.where(projections_diffs > 0,
+                                     projections_diffs / distances_bounds,
+                                     projections_diffs / delta)
+
+        is_kept = ~(scores_bounds < min_score)
+        n_pruned_bound_pairs += len(is_kept) - is_kept.sum()
+
+        candidates = _score_analogies_candidates(
+            normalized_vectors, direction, candidates, n_candidates,
+            sorted_indices[x_positions[is_kept]],
+            sorted_indices[y_positions[is_kept]],
+            distances[is_kept], chunk_size, dtype)
+
+    if verbose:
+        from tabulate import tabulate
+        n_pairs = n_vectors * (n_vectors - 1)
+        table = [['Distance not calculated', n_pruned_window_pairs],
+                 ['Not scored (within delta)', n_pruned_bound_pairs],
+                 ['Total', n_pruned_window_pairs + n_pruned_bound_pairs],
+                 ['Out of all pairs', n_pairs]]
+        print(tabulate(table, headers=['Pruned Pairs', 'Count']))
+
+    if return_counts:
+        counts = {'n_pruned_window_pairs': n_pruned_window_pairs,
+                  'n_pruned_bound_pairs': n_pruned_bound_pairs}
+        return candidates, counts
+
+    return candidates
+
+
+def generate_analogies_candidates_lsh(normalized_vectors, direction, delta,
+                                      n_candidates, block_size, index,
+                                      dtype=None):
+    """Find the top scored pairs (x, y) with distance below delta.
+
+    The pairs within delta are searched approximately
+    with an ``LSHIndex``, instead of calculating the distance matrix.
+    They are scored chunk by chunk, and only the top candidates are kept,
+    so the memory does not depend on the number of pairs.
+
+    The parameters are the same as of
+    :func:`generate_analogies_candidates`, and ``index``
+    is an ``LSHIndex`` fitted on the vectors.
+
+    :return: Tuple of arrays - scores, x indices, y indices
+             and distances of the candidate pairs.
+    """
+
+    n_vectors, n_dims = normalized_vectors.shape
+    chunk_size = max(1, block_size * n_vectors // n_dims)
+
+    candidates = _init_candidates()
+
+    for x_indices, y_indices, distances in index.iter_pairs(
+            normalized_vectors, delta):
+        # the index generates every pair once, but both (x, y) and (y, x)
+        # are candidates, as in the distance matrix
+        candidates = _score_analogies_candidates(normalized_vectors,
+                                                 direction,
+                                                 candidates,
+                                                 n_candidates,
+                                                 np.r_[x_indices, y_indices],
+                                                 np.r_[y_indices, x_indices],
+                                                 np.r_[distances, distances],
+                                                 chunk_size,
+                                                 dtype)
+
+    return candidates
+
+
+def select_analogies(candidates, index2word, n_analogies, multiple):
+    """Select the top scored analogies out of the candidate pairs.
+
+    :param tuple candidates: The candidate pairs, as returned
+                             by :func:`generate_analogies_candidates`
+    :param list index2word: The words of the rows
+    :param int n_analogies: Number of analogies to select
+    :param bool multiple: Whether to allow multiple apprerences of a word
+                          in the analogies
+    :return: List of the analogies, as dictionaries
+    """
+
+    cos_distances, x_indices, y_indices, distances = candidates
+
+    sorted_cos_distances_indices = np.lexsort((y_indices,
+                                               x_indices,
+                                               -cos_distances))
+
+    analogies = []
+    generated_words = set()
+
+    for cos_distance_index in sorted_cos_distances_indices:
+        if len(analogies) == n_analogies:
+            break
+
+        word_x = index2word[x_indices[cos_distance_index]]
+        word_y = index2word[y_indices[cos_distance_index]]
+
+        if multiple or (not multiple
+                        and (word_x not in generated_words
+                             and word_y not in generated_words)):
+            analogies.append({'x': word_x,
+                              'y': word_y,
+                              'score': cos_distances[cos_distance_index],
+                              'distance': distances[cos_distance_index]})
+        generated_words.add(word_x)
+        generated_words.add(word_y)
+
+    return analogies
+
+
+def search_analogies(normalized_vectors, direction, index2word,
+                     n_analogies=100, multiple=False, delta=1.,
+                     block_size=None, method='blocks', index=None,
+                     dtype=None, verbose=False):
+    """Search the top scored analogies along a direction.
+
+    :param normalized_vectors: Matrix of the normalized vectors
+    :param direction: The direction vector
+    :param list index2word: The words of the rows
+    :param int n_analogies: Number of analogies to generate.
+    :param bool multiple: Whether to allow multiple apprerences of a word
+                          in the analogies.
+    :param float delta: The maximal distance between x and y.
+    :param int block_size: The number of rows of the distance matrix
+                           to calculate at once.
+    :param str method: The method of the pairs search,
+                       ``blocks``, ``pruned`` or ``lsh``.
+    :param index: Index for the ``lsh`` method, fitted on
+                  the normalized vectors, or a path of a saved one,
+                  which is fitted and saved again if it was fitted
+                  on other vectors (see ``LSHIndex.load_or_fit``).
+                  By default, an index is fitted on the fly.
+    :type index: LSHIndex or str or None
+    :param dtype: The dtype of the calculation, by default
+                  the dtype of the vectors
+    :param bool verbose: Set vebosity
+    :return: Data Frame of anologies (x, y), thier distances,
+             and their cosine similarity scores
+    """
+
+    if method not in ANALOGIES_METHODS:
+        raise ValueError('method should be one of {}, {} was given'.format(
+            ANALOGIES_METHODS, method))
+
+    if block_size is None:
+        block_size = ANALOGIES_BLOCK_SIZE
+
+    if method == 'pruned':
+        generate_candidates = partial(generate_analogies_candidates_pruned,
+                                      dtype=dtype, verbose=verbose)
+
+    elif method == 'lsh':
+        if index is None:
+            index = LSHIndex().fit(normalized_vectors)
+        elif isinstance(index, str):
+            index = LSHIndex.load_or_fit(index, normalized_vectors)
+        elif index.fingerprint != calc_vectors_fingerprint(normalized_vectors):
+            raise ValueError('index should be fitted on the normalized'
+                             ' vectors, its fingerprint does not match them')
+
+        generate_candidates = partial(generate_analogies_candidates_lsh,
+                                      index=index, dtype=dtype)
+
+    else:
+        generate_candidates = partial(generate_analogies_candidates,
+                                      dtype=dtype, verbose=verbose)
+
+    # Without multiple, a pair might be skipped due to its words,
+    # so if the candidates run out, search again with more of them
+    n_candidates = ANALOGIES_CANDIDATES_FACTOR * n_analogies
+
+    while True:
+        candidates = generate_candidates(normalized_vectors,
+                                         direction,
+                                         delta,
+                                         n_candidates,
+                                         block_size)
+        analogies = select_analogies(candidates, index2word,
+                                     n_analogies, multiple)
+
+        if (len(analogies) == n_analogies
+                or len(candidates[0]) < n_candidates):
+            break
+
+        n_candidates *= 2
+
+    return pd.DataFrame(analogies, columns=['x', 'y', 'distance', 'score'])
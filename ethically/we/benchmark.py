@@ -38,11 +38,19 @@ Analogies Tasks
 
 """
 
+import hashlib
+import json
 import os
+import tempfile
+import time
 import warnings
+from collections import OrderedDict
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
-from pkg_resources import resource_filename
+
+from .utils import calc_rows_dot, calc_vocabulary_fingerprint
 
 
 with warnings.catch_warnings():
@@ -64,8 +72,18 @@ PAIR_WORDS_EVALUATION_FIELDS = ['pearson_r', 'pearson_pvalue',
                                 'spearman_r', 'spearman_pvalue',
                                 'ratio_unkonwn_words']
 
+ANALOGIES_SECTIONS_FIELDS = ['correct', 'incorrect', 'score']
+ANALOGIES_TOTAL_SECTION = 'Total accuracy'
+ANALOGIES_TOPN = 5
+ANALOGIES_BATCH_SIZE = 128
+RESOLVED_ROWS_CACHE_SIZE = 32
+
+_RESOLVED_ROWS_CACHE = OrderedDict()
+
 
 def get_data_resource_path(filename):
+    from pkg_resources import resource_filename
+
     return resource_filename(__name__, os.path.join('data',
                                                     'benchmark',
                                                     filename))
@@ -77,6 +95,515 @@ def prepare_word_pairs_file(src, dst, delimiter='\t'):
     df.loc[:, :2].to_csv(dst, sep=delimiter, index=False, header=False)
 
 
+def read_word_pairs(path, delimiter='\t'):
+    """Parse a word pairs file into arrays of indices.
+
+    The format is the one of ``KeyedVectors.evaluate_word_pairs``,
+    lines of two words and a similarity score, and comment lines
+    that start with ``#``. Invalid lines are skipped.
+
+    :param str path: Path of the word pairs file
+    :param str delimiter: Separator of the fields in a line
+    :return: Dictionary of the words table (``words``),
+             a (pairs, 2) int32 array of indices into the words table
+             (``pairs``) and the gold similarity scores (``gold``).
+    """
+
+    pairs = []
+    gold = []
+
+    with open(path, encoding='utf-8') as pairs_file:
+        for line in pairs_file:
+            if line.startswith('#'):
+                continue
+
+            try:
+                word1, word2, similarity = line.split(delimiter)
+                similarity = float(similarity)
+            except (ValueError, TypeError):
+                continue
+
+            pairs.append((word1, word2))
+            gold.append(similarity)
+
+    words, pairs = np.unique(np.array(pairs, dtype=str).reshape(-1, 2),
+                             return_inverse=True)
+
+    return {'words': words,
+            'pairs': pairs.reshape(-1, 2).astype(np.int32),
+            'gold': np.array(gold, dtype=np.float64)}
+
+
+def read_word_analogies(path):
+    """Parse a word analogies file into arrays of indices.
+
+    The format is the one of ``KeyedVectors.evaluate_word_analogies``,
+    lines of four words split into sections by ``: SECTION NAME`` lines.
+    Lines that are not of four words are skipped.
+
+    :param str path: Path of the word analogies file
+    :return: Dictionary of the section names (``sections``),
+             the words table (``words``), a (questions, 4) int32 array
+             of indices into the words table (``questions``) and
+             the section index of every question (``questions_sections``).
+    """
+
+    sections = []
+    questions = []
+    questions_sections = []
+
+    with open(path, encoding='utf-8') as analogies_file:
+        for line_no, line in enumerate(analogies_file):
+            if line.startswith(': '):
+                sections.append(line.lstrip(': ').strip())
+                continue
+
+            if not sections:
+                raise ValueError('Missing section header before line #{}'
+                                 ' in {}'.format(line_no, path))
+
+            question = line.split()
+            if len(question) == 4:
+                questions.append(question)
+                questions_sections.append(len(sections) - 1)
+
+    words, questions = np.unique(np.array(questions, dtype=str)
+                                 .reshape(-1, 4),
+                                 return_inverse=True)
+
+    return {'sections': np.array(sections, dtype=str),
+            'words': words,
+            'questions': questions.reshape(-1, 4).astype(np.int32),
+            'questions_sections': np.array(questions_sections,
+                                           dtype=np.int32)}
+
+
+def _load_compiled_dataset(read, path, *args):
+    """Load a dataset compiled into ``.npz`` by ``read``, or compile it.
+
+    The compiled file is in the ``benchmark`` directory of the cache,
+    keyed by the path, the size and the modification time of the source.
+    """
+
+    from .data import get_cache_dir
+
+    stat = os.stat(path)
+    key = hashlib.sha1(json.dumps([read.__name__, os.path.abspath(path),
+                                   stat.st_size, stat.st_mtime_ns]
+                                  + list(args))
+                       .encode('utf-8')).hexdigest()
+
+    datasets_path = os.path.join(get_cache_dir(), 'benchmark')
+    dataset_path = os.path.join(datasets_path, key + '.npz')
+
+    if not os.path.exists(dataset_path):
+        dataset = read(path, *args)
+
+        os.makedirs(datasets_path, exist_ok=True)
+        # write into a temporary file and move it into place,
+        # so a concurrent reader never sees a partial file
+        with tempfile.NamedTemporaryFile(dir=datasets_path, suffix='.npz',
+                                         delete=False) as dataset_file:
+            np.savez(dataset_file, **dataset)
+        os.replace(dataset_file.name, dataset_path)
+
+    with np.load(dataset_path) as dataset_npz:
+        dataset = {name: dataset_npz[name] for name in dataset_npz.files}
+
+    for array in dataset.values():
+        array.setflags(write=False)
+
+    return dataset
+
+
+@lru_cache(maxsize=None)
+def load_word_pairs(path, delimiter='\t'):
+    """Load a word pairs file, compiled and memoized.
+
+    See :func:`read_word_pairs` for the returned dictionary,
+    which is shared between calls and read-only.
+    """
+    return _load_compiled_dataset(read_word_pairs, path, delimiter)
+
+
+@lru_cache(maxsize=None)
+def load_word_analogies(path):
+    """Load a word analogies file, compiled and memoized.
+
+    See :func:`read_word_analogies` for the returned dictionary,
+    which is shared between calls and read-only.
+    """
+    return _load_compiled_dataset(read_word_analogies, path)
+
+
+def _get_ok_vocab(model, restrict_vocab, case_insensitive):
+    """Map words to rows as the ``ok_vocab`` of gensim.
+
+    In case insensitive mode, the keys are uppercase,
+    and the first row of a word wins over its other case variants.
+    """
+
+    words = model.index2word[:restrict_vocab]
+
+    if not case_insensitive:
+        return {word: index for index, word in enumerate(words)}
+
+    ok_vocab = {}
+    for index, word in enumerate(words):
+        ok_vocab.setdefault(word.upper(), index)
+    return ok_vocab
+
+
+def _calc_words_fingerprint(words):
+    hasher = hashlib.sha1()
+    hasher.update('\n'.join(words.tolist()).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def _get_cached_rows(key, resolve):
+    try:
+        _RESOLVED_ROWS_CACHE.move_to_end(key)
+        return _RESOLVED_ROWS_CACHE[key]
+
+    except KeyError:
+        rows = resolve()
+        _RESOLVED_ROWS_CACHE[key] = rows
+        if len(_RESOLVED_ROWS_CACHE) > RESOLVED_ROWS_CACHE_SIZE:
+            _RESOLVED_ROWS_CACHE.popitem(last=False)
+        return rows
+
+
+def resolve_dataset_rows(model, dataset, restrict_vocab=300000,
+                         case_insensitive=True):
+    """Resolve the words table of a dataset to rows of a model.
+
+    The rows are cached by the fingerprint of the vocabulary
+    (see :func:`~ethically.we.utils.calc_vocabulary_fingerprint`),
+    so models with the same vocabulary, e.g., the debiased variants
+    of a model, share the lookup, and by the fingerprint of the words
+    table of the dataset.
+
+    :param model: Words embedding.
+    :param dict dataset: Dataset from :func:`load_word_pairs`
+                         or :func:`load_word_analogies`.
+    :param int restrict_vocab: Consider only the first words of the model.
+    :param bool case_insensitive: Whether to match the words
+                                  in their uppercase form.
+    :return: Tuple of the row of every word in the words table
+             (-1 for unknown words) and the canonical row of every row
+             of the model (the first row among its case variants).
+    """
+
+    fingerprint = calc_vocabulary_fingerprint(model)
+    words = dataset['words']
+
+    def resolve():
+        ok_vocab = _get_ok_vocab(model, restrict_vocab, case_insensitive)
+
+        if case_insensitive:
+            vocab_words = model.index2word[:restrict_vocab]
+            canonical_rows = np.array([ok_vocab[word.upper()]
+                                       for word in vocab_words],
+                                      dtype=np.int64)
+        else:
+            canonical_rows = np.arange(len(ok_vocab))
+
+        words_rows = np.array([ok_vocab.get(word.upper()
+                                            if case_insensitive else word,
+                                            -1)
+                               for word in words.tolist()],
+                              dtype=np.int64)
+
+        words_rows.setflags(write=False)
+        canonical_rows.setflags(write=False)
+        return words_rows, canonical_rows
+
+    # the words table stands for the dataset
+    key = (_calc_words_fingerprint(words), fingerprint,
+           restrict_vocab, case_insensitive)
+    return _get_cached_rows(key, resolve)
+
+
+def _normalize_rows_as_gensim(vectors):
+    # as `gensim.matutils.unitvec`, scaling by the reciprocal of the norm
+    norms = np.sqrt(np.einsum('ij,ij->i', vectors, vectors,
+                              dtype=np.float64))
+    norms[norms == 0] = 1
+    return vectors * (1 / norms).astype(vectors.dtype)[:, None]
+
+
+def _gather_vectors(model, rows):
+    from .overlay import OverlayKeyedVectors
+
+    if isinstance(model, OverlayKeyedVectors):
+        return model.get_vectors(rows)
+    return model.vectors[rows]
+
+
+def _calc_word_pairs_scores(gold, is_known, similarities, dummy4unknown):
+    """Calculate the scores of ``KeyedVectors.evaluate_word_pairs``."""
+
+    from scipy import stats
+
+    n_unknown = int((~is_known).sum())
+
+    if dummy4unknown:
+        model_similarities = np.zeros(len(gold))
+        model_similarities[is_known] = similarities
+        oov_ratio = n_unknown / len(gold) * 100
+
+    else:
+        gold = gold[is_known]
+        model_similarities = similarities
+        oov_ratio = n_unknown / (len(gold) + n_unknown) * 100
+
+    spearman = stats.spearmanr(gold, model_similarities)
+    pearson = stats.pearsonr(gold, model_similarities)
+
+    return pearson, spearman, oov_ratio
+
+
+def _calc_word_pairs_tasks(model, datasets, restrict_vocab=300000,
+                           case_insensitive=True, dummy4unknown=False):
+    """Evaluate word pairs datasets in one pass over the model.
+
+    The vectors of all the words of all the datasets are gathered
+    and normalized once, and the similarities of every dataset
+    are row-wise dot products of them.
+    Pairs with unknown words are masked out.
+
+    :return: Dictionary of the tuple of Pearson, Spearman and the ratio
+             of pairs with unknown words of every dataset,
+             as ``KeyedVectors.evaluate_word_pairs``.
+    """
+
+    pairs_rows = {}
+    for name, dataset in datasets.items():
+        words_rows, _ = resolve_dataset_rows(model, dataset,
+                                             restrict_vocab, case_insensitive)
+        pairs_rows[name] = words_rows[dataset['pairs']]
+
+    all_rows = np.unique(np.concatenate([rows[rows >= 0]
+                                         for rows in pairs_rows.values()]))
+    vectors = _normalize_rows_as_gensim(_gather_vectors(model, all_rows))
+
+    results = {}
+    for name, rows in pairs_rows.items():
+        is_known = (rows >= 0).all(axis=1)
+        positions = np.searchsorted(all_rows, rows[is_known])
+
+        similarities = np.einsum('ij,ij->i',
+                                 vectors[positions[:, 0]],
+                                 vectors[positions[:, 1]])
+
+        results[name] = _calc_word_pairs_scores(datasets[name]['gold'],
+                                                is_known, similarities,
+                                                dummy4unknown)
+
+    return results
+
+
+def evaluate_word_pairs_file(model, path, delimiter='\t',
+                             restrict_vocab=300000, case_insensitive=True,
+                             dummy4unknown=False):
+    """
+    Evaluate a word pairs file with vectorized similarities.
+
+    A native replacement of ``KeyedVectors.evaluate_word_pairs``
+    with the same arguments and scores.
+
+    :param model: Words embedding.
+    :param str path: Path of the word pairs file.
+    :param str delimiter: Separator of the fields in a line.
+    :param int restrict_vocab: Consider only the first words of the model.
+    :param bool case_insensitive: Whether to match the words
+                                  in their uppercase form.
+    :param bool dummy4unknown: Whether to use zero similarity for pairs
+                               with unknown words,
+                               instead of skipping them.
+    :return: Tuple of Pearson, Spearman and the ratio of pairs
+             with unknown words.
+    """
+
+    datasets = {path: load_word_pairs(path, delimiter)}
+    return _calc_word_pairs_tasks(model, datasets, restrict_vocab,
+                                  case_insensitive, dummy4unknown)[path]
+
+
+def _predict_word_analogies(vectors_norm, canonical_rows, rows):
+    """Predict the answers of a batch of questions with 3CosAdd.
+
+    It follows ``KeyedVectors.evaluate_word_analogies`` of gensim:
+    the query words are excluded from the top ``ANALOGIES_TOPN``
+    most similar rows, and then the first row that is not
+    a case variant of a query word is the prediction.
+    If there is no such row, the last one is the prediction.
+    A float16 matrix is multiplied in float32, in chunks of rows.
+
+    :return: Array of the predicted canonical rows, -1 for no prediction
+    """
+
+    batch_size = len(rows)
+    batch_indices = np.arange(batch_size)[:, None]
+    compute_dtype = np.promote_types(vectors_norm.dtype, np.float32)
+
+    # the same operations as the weighted mean of `most_similar`
+    means = np.array([vectors_norm[rows[:, 1]] * 1.0,
+                      vectors_norm[rows[:, 2]] * 1.0,
+                      vectors_norm[rows[:, 0]] * -1.0],
+                     dtype=compute_dtype).mean(axis=0)
+    means = _normalize_rows_as_gensim(means)
+
+    if vectors_norm.dtype == compute_dtype:
+        dists = means @ vectors_norm.T
+    else:
+        dists = calc_rows_dot(vectors_norm, means.T, compute_dtype).T
+    dists[batch_indices, rows[:, :3]] = -np.inf
+
+    n_rows = dists.shape[1]
+    topn = min(ANALOGIES_TOPN, n_rows)
+    top_rows = np.argpartition(dists, n_rows - topn, axis=1)[:, -topn:]
+    top_rows = top_rows[batch_indices,
+                        np.argsort(-dists[batch_indices, top_rows],
+                                   axis=1, kind='mergesort')]
+    is_valid = np.isfinite(dists[batch_indices, top_rows])
+
+    predicted_rows = canonical_rows[top_rows]
+    is_candidate = (is_valid
+                    & (predicted_rows[:, :, None]
+                       != rows[:, None, :3]).all(axis=2))
+
+    first_candidates = np.where(is_candidate.any(axis=1),
+                                is_candidate.argmax(axis=1),
+                                is_valid.sum(axis=1) - 1)
+
+    predictions = predicted_rows[np.arange(batch_size), first_candidates]
+    predictions[first_candidates < 0] = -1
+
+    return predictions
+
+
+def evaluate_word_analogies_file(model, path, restrict_vocab=300000,
+                                 case_insensitive=True, dummy4unknown=False,
+                                 batch_size=ANALOGIES_BATCH_SIZE):
+    """
+    Evaluate a word analogies file with batched 3CosAdd.
+
+    A native replacement of ``KeyedVectors.evaluate_word_analogies``
+    with the same arguments and scores. The questions are answered
+    in batches, with one matrix product of the batch and the
+    normalized matrix, instead of a ``most_similar`` call per question.
+
+    :param model: Words embedding.
+    :param str path: Path of the word analogies file.
+    :param int restrict_vocab: Consider only the first words of the model.
+    :param bool case_insensitive: Whether to match the words
+                                  in their uppercase form.
+    :param bool dummy4unknown: Whether to count questions
+                               with unknown words as incorrect,
+                               instead of skipping them.
+    :param int batch_size: The number of questions in a batch.
+    :return: Tuple of the overall score (``None`` when no questions
+             were evaluated) and a DataFrame of the number of correct
+             and incorrect answers and the score of every section.
+    """
+
+    dataset = load_word_analogies(path)
+    questions_sections = dataset['questions_sections']
+
+    words_rows, canonical_rows = resolve_dataset_rows(model, dataset,
+                                                      restrict_vocab,
+                                                      case_insensitive)
+    rows = words_rows[dataset['questions']]
+
+    is_known = (rows >= 0).all(axis=1)
+    known_rows = rows[is_known]
+
+    model.init_sims()
+    vectors_norm = model.vectors_norm[:restrict_vocab]
+
+    is_correct = np.zeros(len(known_rows), dtype=bool)
+    for start in range(0, len(known_rows), batch_size):
+        batch_rows = known_rows[start:start + batch_size]
+        predictions = _predict_word_analogies(vectors_norm, canonical_rows,
+                                              batch_rows)
+        is_correct[start:start + batch_size] = predictions == batch_rows[:, 3]
+
+    sections = dataset['sections'].tolist()
+    n_sections = len(sections)
+    correct = np.bincount(questions_sections[is_known],
+                          weights=is_correct, minlength=n_sections)
+    incorrect = (np.bincount(questions_sections[is_known],
+                             minlength=n_sections)
+                 - correct)
+
+    if dummy4unknown:
+        incorrect += np.bincount(questions_sections[~is_known],
+                                 minlength=n_sections)
+
+    sections_df = pd.DataFrame({'correct': correct.astype(int),
+                                'incorrect': incorrect.astype(int)},
+                               index=sections)
+    sections_df.loc[ANALOGIES_TOTAL_SECTION] = sections_df.sum()
+
+    n_evaluated = sections_df['correct'] + sections_df['incorrect']
+    sections_df['score'] = (sections_df['correct']
+                            / n_evaluated.where(n_evaluated > 0))
+    sections_df = sections_df[ANALOGIES_SECTIONS_FIELDS]
+
+    total_score = sections_df.loc[ANALOGIES_TOTAL_SECTION, 'score']
+    if np.isnan(total_score):
+        total_score = None
+
+    return total_score, sections_df
+
+
+def _load_word_pairs_tasks(names, delimiter='\t'):
+    paths = {name: get_data_resource_path(WORD_PAIRS_TASKS[name])
+             for name in names}
+    return {name: load_word_pairs(path, delimiter)
+            for name, path in paths.items()}
+
+
+def _format_word_pairs_result(pearson, spearman, ratio_unknown_words):
+    return {'pearson_r': pearson[0],
+            'pearson_pvalue': pearson[1],
+            'spearman_r': spearman.correlation,
+            'spearman_pvalue': spearman.pvalue,
+            'ratio_unkonwn_words': ratio_unknown_words}
+
+
+def _evaluate_word_pairs_task(model, name, kwargs_word_pairs):
+    path = get_data_resource_path(WORD_PAIRS_TASKS[name])
+    scores = evaluate_word_pairs_file(model, path, **kwargs_word_pairs)
+    return _format_word_pairs_result(*scores)
+
+
+def _evaluate_word_analogies_task(model, name, kwargs_word_analogies):
+    path = get_data_resource_path(ANALOGIES_TASKS[name])
+    overall_score, _ = evaluate_word_analogies_file(model, path,
+                                                    **kwargs_word_analogies)
+
+    return {'score': overall_score}
+
+
+TASKS_EVALUATORS = {'word_pairs': _evaluate_word_pairs_task,
+                    'word_analogies': _evaluate_word_analogies_task}
+
+
+def _build_word_pairs_df(results):
+    return (pd.DataFrame(results)
+            .reindex(PAIR_WORDS_EVALUATION_FIELDS)
+            .transpose()
+            .round(3))
+
+
+def _build_word_analogies_df(results):
+    return (pd.DataFrame(results)
+            .transpose()
+            .round(3))
+
+
 def evaluate_word_pairs(model, kwargs_word_pairs=None):
     """
     Evaluate word pairs tasks.
@@ -92,27 +619,57 @@ def evaluate_word_pairs(model, kwargs_word_pairs=None):
     if kwargs_word_pairs is None:
         kwargs_word_pairs = {}
 
-    results = {}
+    kwargs_word_pairs = dict(kwargs_word_pairs)
+    datasets = _load_word_pairs_tasks(WORD_PAIRS_TASKS,
+                                      kwargs_word_pairs.pop('delimiter',
+                                                            '\t'))
 
-    for name, filename in WORD_PAIRS_TASKS.items():
-        path = get_data_resource_path(filename)
-        (pearson,
-         spearman,
-         ratio_unknown_words) = model.evaluate_word_pairs(path,
-                                                          **kwargs_word_pairs)  # pylint: disable=C0301
+    tasks_scores = _calc_word_pairs_tasks(model, datasets,
+                                          **kwargs_word_pairs)
+    results = {name: _format_word_pairs_result(*scores)
+               for name, scores in tasks_scores.items()}
 
-        results[name] = {'pearson_r': pearson[0],
-                         'pearson_pvalue': pearson[1],
-                         'spearman_r': spearman.correlation,
-                         'spearman_pvalue': spearman.pvalue,
-                         'ratio_unkonwn_words': ratio_unknown_words}
+    return _build_word_pairs_df(results)
 
-    df = (pd.DataFrame(results)
-          .reindex(PAIR_WORDS_EVALUATION_FIELDS)
-          .transpose()
-          .round(3))
 
-    return df
+def evaluate_word_pairs_batch(models, kwargs_word_pairs=None):
+    """
+    Evaluate word pairs tasks of a batch of models.
+
+    Every model is evaluated on all the tasks in one pass,
+    and models with the same vocabulary, e.g., the debiased
+    variants of a model, share the lookup of the words.
+
+    :param models: Dictionary of names and words embeddings,
+                   or a list of words embeddings.
+    :param kwargs_word_pairs: Kwargs for
+                              evaluate_word_pairs
+                              method.
+    :type kwargs_word_pairs: dict or None
+    :return: DataFrame of evaluation results, indexed by
+             the model and the task.
+    """
+
+    if kwargs_word_pairs is None:
+        kwargs_word_pairs = {}
+
+    if not isinstance(models, dict):
+        models = dict(enumerate(models))
+
+    kwargs_word_pairs = dict(kwargs_word_pairs)
+    datasets = _load_word_pairs_tasks(WORD_PAIRS_TASKS,
+                                      kwargs_word_pairs.pop('delimiter',
+                                                            '\t'))
+
+    dfs = []
+    for model in models.values():
+        tasks_scores = _calc_word_pairs_tasks(model, datasets,
+                                              **kwargs_word_pairs)
+        results = {name: _format_word_pairs_result(*scores)
+                   for name, scores in tasks_scores.items()}
+        dfs.append(_build_word_pairs_df(results))
+
+    return pd.concat(dfs, keys=list(models), names=['model', 'task'])
 
 
 def evaluate_word_analogies(model, kwargs_word_analogies=None):
@@ -130,28 +687,63 @@ def evaluate_word_analogies(model, kwargs_word_analogies=None):
     if kwargs_word_analogies is None:
         kwargs_word_analogies = {}
 
-    results = {}
+    results = {name: _evaluate_word_analogies_task(model, name,
+                                                   kwargs_word_analogies)
+               for name in ANALOGIES_TASKS}
+
+    return _build_word_analogies_df(results)
+
+
+def _run_task(model, task_type, name, kwargs):
+    start = time.perf_counter()
+    result = TASKS_EVALUATORS[task_type](model, name, kwargs)
+    return result, time.perf_counter() - start
+
+
+@lru_cache(maxsize=1)
+def _load_worker_model(model_path):
+    from .data import read_model_cache
+
+    model = read_model_cache(model_path, mmap_mode='r')
+    # the vectors are already normalized, so the normalized matrix
+    # of `init_sims` is the shared read-only matrix, and not a copy
+    model.vectors_norm = model.vectors
+    return model
 
-    for name, filename in ANALOGIES_TASKS.items():
-        path = get_data_resource_path(filename)
-        overall_score, _ = model.evaluate_word_analogies(path,
-                                                         **kwargs_word_analogies)  # pylint: disable=C0301
 
-        results[name] = {'score': overall_score}
+def _run_worker_task(model_path, task_type, name, kwargs):
+    return _run_task(_load_worker_model(model_path), task_type, name, kwargs)
 
-        df = (pd.DataFrame(results)
-              .transpose()
-              .round(3))
 
-    return df
+def _run_tasks_parallel(model, tasks, n_jobs):
+    from concurrent.futures import ProcessPoolExecutor
+    from .data import write_model_cache
+
+    with tempfile.TemporaryDirectory() as model_path:
+        # the workers memory-map the normalized matrix,
+        # so the model is not pickled to each one of them
+        write_model_cache(model, model_path, normalize=True)
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [executor.submit(_run_worker_task, model_path, *task)
+                       for task in tasks]
+            return [future.result() for future in futures]
 
 
 def evaluate_words_embedding(model,
                              kwargs_word_pairs=None,
-                             kwargs_word_analogies=None):
+                             kwargs_word_analogies=None,
+                             n_jobs=1, return_timings=False):
     """
     Evaluate word pairs tasks and word analogies tasks.
 
+    With ``n_jobs`` other than 1, the tasks run concurrently
+    in worker processes. The model is written once, normalized
+    and in its dtype, into a temporary directory, and every worker
+    memory-maps the same read-only matrix. The results match
+    the evaluation in the current process, up to the rounding
+    of the normalization.
+
     :param model: Words embedding.
     :param kwargs_word_pairs: Kwargs fo
                               evaluate_word_pairs
@@ -161,7 +753,58 @@ def evaluate_words_embedding(model,
                                   evaluate_word_analogies
                                   method.
     :type evaluate_word_analogies: dict or None
+    :param int n_jobs: The number of worker processes,
+                       ``None`` or ``-1`` for the number of CPUs,
+                       and 1 for evaluation in the current process.
+    :param bool return_timings: Whether to return also a DataFrame
+                                of the time of each task in seconds.
     :return: Tuple of DataFrame for the evaluation results.
     """
-    return (evaluate_word_pairs(model, kwargs_word_pairs),
-            evaluate_word_analogies(model, kwargs_word_analogies))
+
+    if kwargs_word_pairs is None:
+        kwargs_word_pairs = {}
+
+    if kwargs_word_analogies is None:
+        kwargs_word_analogies = {}
+
+    if n_jobs is None or n_jobs == -1:
+        n_jobs = os.cpu_count()
+
+    elif n_jobs < 1:
+        raise ValueError('n_jobs should be a positive number, -1 or None,'
+                         ' {} was given'.format(n_jobs))
+
+    # the slowest tasks, the analogies, are submitted first
+    tasks = ([('word_analogies', name, kwargs_word_analogies)
+              for name in ANALOGIES_TASKS]
+             + [('word_pairs', name, kwargs_word_pairs)
+                for name in WORD_PAIRS_TASKS])
+
+    if n_jobs == 1:
+        outputs = [_run_task(model, *task) for task in tasks]
+    else:
+        outputs = _run_tasks_parallel(model, tasks, n_jobs)
+
+    results = {task_type: {} for task_type in TASKS_EVALUATORS}
+    timings = {}
+
+    for (task_type, name, _), (result, seconds) in zip(tasks, outputs):
+        results[task_type][name] = result
+        timings[name] = {'task_type': task_type, 'seconds': seconds}
+
+    # keep the order of the tasks as in the serial evaluation
+    evaluation_dfs = (
+        _build_word_pairs_df({name: results['word_pairs'][name]
+                              for name in WORD_PAIRS_TASKS}),
+        _build_word_analogies_df({name: results['word_analogies'][name]
+                                  for name in ANALOGIES_TASKS}))
+
+    if return_timings:
+        timings_df = (pd.DataFrame(timings)
+                      .transpose()
+                      .reindex(list(WORD_PAIRS_TASKS)
+                               + list(ANALOGIES_TASKS)))
+        timings_df['seconds'] = timings_df['seconds'].astype(float)
+        return evaluation_dfs + (timings_df,)
+
+    return evaluation_dfs
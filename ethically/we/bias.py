@@ -5,6 +5,33 @@ from .data import BOLUKBASI_DATA
 from .utils import generate_one_word_forms, generate_words_forms
 
 
+class NeutralWordsData(dict):
+    """Data of words embedding bias with lazy ``neutral_words``.
+
+    The neutral words are kept as an array of rows indices
+    under ``neutral_indices``, and the sorted list of the words
+    is built only on the first access to ``neutral_words``.
+
+    :param dict data: The data
+    :param list index2word: The words of the rows of the model
+    """
+
+    def __init__(self, data, index2word):
+        super().__init__(data)
+        self._index2word = index2word
+
+    def __missing__(self, key):
+        if key != 'neutral_words':
+            raise KeyError(key)
+
+        neutral_words = [self._index2word[index]
+                         for index in self['neutral_indices']]
+        neutral_words.sort()
+
+        self[key] = neutral_words
+        return neutral_words
+
+
 class GenderBiasWE(BiasWordsEmbedding):
     """Audit and Adjust the Gender Bias in English Words Embedding.
 
@@ -12,11 +39,13 @@ class GenderBiasWE(BiasWordsEmbedding):
     :param bool only_lower: Whether the words embedding contrains
                             only lower case words
     :param bool verbose: Set vebosity
+    :param dtype: The dtype of the calculated matrices,
+                  see :class:`~ethically.we.core.BiasWordsEmbedding`
     """
 
     def __init__(self, model, only_lower=False, verbose=False,
-                 identify_direction=True):
-        super().__init__(model, only_lower, verbose)
+                 identify_direction=True, dtype=None):
+        super().__init__(model, only_lower, verbose, dtype=dtype)
         self._initialize_data()
         if identify_direction:
             self._identify_direction('she', 'he',
@@ -35,11 +64,12 @@ class GenderBiasWE(BiasWordsEmbedding):
             self._data[key] = (self._filter_words_by_model(self
                                                            ._data[key]))
 
-        self._data['neutral_words'] = self._extract_neutral_words(self
-                                                                  ._data['specific_full_with_definitional'])  # pylint: disable=C0301
-        self._data['neutral_words'].sort()
+        self._data['neutral_indices'] = self._extract_neutral_indices(
+            self._data['specific_full_with_definitional'])
         self._data['word_group_keys'].append('neutral_words')
 
+        self._data = NeutralWordsData(self._data, self.model.index2word)
+
     def plot_projection_scores(self, words='professions', n_extreme=10,
                                ax=None, axis_projection_step=None):
         if words == 'professions':
@@ -67,12 +97,24 @@ class GenderBiasWE(BiasWordsEmbedding):
                                                           ax,
                                                           scatter_kwargs)
 
+    def _resolve_neutral_words(self, neutral_words):
+        if isinstance(neutral_words, str):
+            if neutral_words == 'professions':
+                return self._data['neutral_profession_names']
+            if neutral_words == 'neutral':
+                return self._data['neutral_indices']
+        return neutral_words
+
     def calc_direct_bias(self, neutral_words='professions', c=None):
-        if isinstance(neutral_words, str) and neutral_words == 'professions':
-            return super().calc_direct_bias(
-                self._data['neutral_profession_names'], c)
-        else:
-            return super().calc_direct_bias(neutral_words)
+        neutral_words = self._resolve_neutral_words(neutral_words)
+        return super().calc_direct_bias(neutral_words, c)
+
+    def estimate_direct_bias(self, neutral_words='neutral', n_samples=None,
+                             confidence=None, c=None, random_state=None):
+        neutral_words = self._resolve_neutral_words(neutral_words)
+        return super().estimate_direct_bias(neutral_words,
+                                            n_samples, confidence, c,
+                                            random_state)
 
     def generate_closest_words_indirect_bias(self,
                                              neutral_positive_end,
@@ -93,7 +135,7 @@ class GenderBiasWE(BiasWordsEmbedding):
         # pylint: disable=C0301
         if method in ['hard', 'neutralize']:
             if neutral_words is None:
-                neutral_words = self._data['neutral_words']
+                neutral_words = self._data['neutral_indices']
 
         if method == 'hard' and equality_sets is None:
             equality_sets = self._data['definitional_pairs']
@@ -112,10 +154,19 @@ class GenderBiasWE(BiasWordsEmbedding):
 
     def learn_full_specific_words(self, seed_specific_words='bolukbasi',
                                   max_non_specific_examples=None,
-                                  debug=None):
+                                  debug=None, chunk_size=None,
+                                  return_margins=None, method='svm',
+                                  batch_size=None, n_epochs=None,
+                                  random_state=None):
         if seed_specific_words == 'bolukbasi':
             seed_specific_words = self._data['specific_seed']
 
         return super().learn_full_specific_words(seed_specific_words,
                                                  max_non_specific_examples,
-                                                 debug)
+                                                 debug,
+                                                 chunk_size,
+                                                 return_margins,
+                                                 method,
+                                                 batch_size,
+                                                 n_epochs,
+                                                 random_state)
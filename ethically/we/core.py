@@ -1,31 +1,46 @@
 import copy
 
-import matplotlib.pylab as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from gensim.models.keyedvectors import KeyedVectors
-from scipy.stats import spearmanr
-from sklearn.decomposition import PCA
-from sklearn.metrics.pairwise import euclidean_distances
-from sklearn.svm import LinearSVC
-from tqdm import tqdm
-
-from tabulate import tabulate
 
 from ..consts import RANDOM_STATE
+from .analogies import search_analogies
 from .benchmark import evaluate_words_embedding
+from .direct import (
+    DIRECT_BIAS_CONFIDENCE, DIRECT_BIAS_N_SAMPLES, calc_direct_bias_sum,
+    estimate_direct_bias_sample,
+)
+from .indirect import calc_indirect_biases
+from .training import (
+    calc_margins, train_specific_words_sgd, train_specific_words_svm,
+)
 from .utils import (
-    cosine_similarity, normalize, project_reject_vector, project_vector,
-    reject_vector, round_to_extreme, take_two_sides_extreme_sorted,
-    update_word_vector,
+    VECTORS_CHUNK_SIZE, cast_model_vectors, check_keyed_vectors,
+    cosine_similarity, get_model_vectors, get_words_indices,
+    group_equality_sets, normalize, normalize_rows, normalize_vectors_inplace,
+    project_reject_rows, project_rows, reject_rows, round_to_extreme,
+    take_two_sides_extreme_sorted,
 )
 
 
 DIRECTION_METHODS = ['single', 'sum', 'pca']
 DEBIAS_METHODS = ['neutralize', 'hard', 'soft']
+DTYPES = ['float64', 'float32', 'float16']
 FIRST_PC_THRESHOLD = 0.5
-MAX_NON_SPECIFIC_EXAMPLES = 1000
+LEARN_SPECIFIC_METHODS = ['svm', 'sgd']
+
+
+def _is_overlay(model):
+    # the overlay module imports gensim,
+    # so it is imported only once there is a model
+    from .overlay import OverlayKeyedVectors
+    return isinstance(model, OverlayKeyedVectors)
+
+
+def _cast_model(model, dtype):
+    if _is_overlay(model):
+        return model.astype(dtype)
+    return cast_model_vectors(model, dtype)
 
 
 class BiasWordsEmbedding:
@@ -35,13 +50,20 @@ class BiasWordsEmbedding:
     :param bool only_lower: Whether the words embedding contrains
                             only lower case words
     :param bool verbose: Set vebosity
+    :param dtype: The dtype of the vectors of the model,
+                  and of the matrices that are calculated
+                  (e.g., in ``generate_analogies``),
+                  one of ``'float64'``, ``'float32'`` or ``'float16'``.
+                  If the vectors of the model are of another dtype,
+                  ``model`` is a copy with the vectors cast to dtype,
+                  sharing the vocabulary of the given model.
+                  The computation is done in float32 at least.
+                  By default, the dtype of the model, without casting.
     """
 
     def __init__(self, model, only_lower=False, verbose=False,
-                 identify_direction=False):
-        if not isinstance(model, KeyedVectors):
-            raise TypeError('model should be of type KeyedVectors, not {}'
-                            .format(type(model)))
+                 identify_direction=False, dtype=None):
+        check_keyed_vectors(model)
 
         # TODO: this is bad Python, ask someone about it
         # probably should be a better design
@@ -52,7 +74,15 @@ class BiasWordsEmbedding:
                              ' for an instance of {}'
                              .format(__class__))
 
+        if dtype is not None:
+            dtype = np.dtype(dtype)
+            if dtype.name not in DTYPES:
+                raise ValueError('dtype should be one of {}, {} was given'
+                                 .format(DTYPES, dtype.name))
+            model = _cast_model(model, dtype)
+
         self.model = model
+        self.dtype = dtype
 
         # TODO: write unitest for when it is False
         self.only_lower = only_lower
@@ -67,7 +97,8 @@ class BiasWordsEmbedding:
         bias_words_embedding = self.__class__(self.model,
                                               self.only_lower,
                                               self._verbose,
-                                              identify_direction=False)
+                                              identify_direction=False,
+                                              dtype=self.dtype)
         bias_words_embedding.direction = copy.deepcopy(self.direction)
         bias_words_embedding.positive_end = copy.deepcopy(self.positive_end)
         bias_words_embedding.negative_end = copy.deepcopy(self.negative_end)
@@ -79,11 +110,27 @@ class BiasWordsEmbedding:
         return bias_words_embedding
 
     def __getitem__(self, key):
-        return self.model[key]
+        return self._as_compute(self.model[key])
 
     def __contains__(self, item):
         return item in self.model
 
+    @property
+    def _compute_dtype(self):
+        if self.dtype is None:
+            return None
+        return np.promote_types(self.dtype, np.float32)
+
+    def _as_compute(self, array):
+        if self.dtype is None:
+            return array
+        return array.astype(self._compute_dtype, copy=False)
+
+    def _as_storage(self, array):
+        if self.dtype is None:
+            return array
+        return array.astype(self.dtype, copy=False)
+
     def _filter_words_by_model(self, words):
         return [word for word in words if word in self]
 
@@ -100,21 +147,24 @@ class BiasWordsEmbedding:
     # however in the source code:
     # https://github.com/tolga-b/debiaswe/blob/10277b23e187ee4bd2b6872b507163ef4198686b/debiaswe/we.py#L235-L245
     def _identify_subspace_by_pca(self, definitional_pairs, n_components):
-        matrix = []
+        from sklearn.decomposition import PCA
 
-        for word1, word2 in definitional_pairs:
-            vector1 = normalize(self[word1])
-            vector2 = normalize(self[word2])
+        # shape: (number of pairs, 2, dimension)
+        vectors = normalize_rows(self._get_vectors(
+            np.array([self._get_words_indices(definitional_pair)
+                      for definitional_pair in definitional_pairs])))
 
-            center = (vector1 + vector2) / 2
+        centers = vectors.mean(axis=1, keepdims=True)
 
-            matrix.append(vector1 - center)
-            matrix.append(vector2 - center)
+        # the rows are vector1 - center, vector2 - center of every pair
+        matrix = (vectors - centers).reshape(-1, vectors.shape[-1])
 
+        # the direction is computed in float64, as in the baseline
         pca = PCA(n_components=n_components)
-        pca.fit(matrix)
+        pca.fit(matrix.astype(np.float64, copy=False))
 
         if self._verbose:
+            from tabulate import tabulate
             table = enumerate(pca.explained_variance_ratio_, start=1)
             headers = ['Principal Component',
                        'Explained Variance Ratio']
@@ -173,10 +223,32 @@ class BiasWordsEmbedding:
             if ends_diff_projection < 0:
                 direction = -direction  # pylint: disable=invalid-unary-operand-type
 
-        self.direction = direction
+        self.direction = self._as_compute(direction)
         self.positive_end = positive_end
         self.negative_end = negative_end
 
+    def _get_words_indices(self, words):
+        return get_words_indices(self.model, words)
+
+    def _get_vectors(self, indices):
+        return self._as_compute(get_model_vectors(self.model, indices))
+
+    def _set_vectors(self, indices, vectors):
+        if _is_overlay(self.model):
+            self.model.set_vectors(indices, vectors)
+        else:
+            from .overlay import preserve_base_rows
+            preserve_base_rows(self.model, indices)
+            self.model.vectors[indices] = vectors
+
+    def _normalize_vectors(self):
+        if _is_overlay(self.model):
+            self.model.normalize_vectors()
+        else:
+            from .overlay import preserve_base_rows
+            preserve_base_rows(self.model, slice(None))
+            normalize_vectors_inplace(self.model)
+
     def project_on_direction(self, word):
         """Project the normalized vector of the word on the direction.
 
@@ -184,21 +256,31 @@ class BiasWordsEmbedding:
         :return float: The projection scalar
         """
 
+        return self.project_words_on_direction([word])[0]
+
+    def project_words_on_direction(self, words):
+        """Project the normalized vectors of words on the direction.
+
+        All the words are resolved to their rows in the model matrix,
+        and scored with a single matrix-vector product.
+
+        :param list words: The words to project,
+                           or an array of their indices in the model
+        :return: Array of the projection scalars, in the order of words
+        """
+
         self._is_direction_identified()
 
-        vector = self[word]
-        projection_score = self.model.cosine_similarities(self.direction,
-                                                          [vector])[0]
-        return projection_score
+        indices = self._get_words_indices(words)
+        vectors = self._get_vectors(indices)
+
+        return self.model.cosine_similarities(self.direction, vectors)
 
     def _calc_projection_scores(self, words):
         self._is_direction_identified()
 
         df = pd.DataFrame({'word': words})
-
-        # TODO: maybe using cosine_similarities on all the vectors?
-        # it might be faster
-        df['projection'] = df['word'].apply(self.project_on_direction)
+        df['projection'] = self.project_words_on_direction(words)
         df = df.sort_values('projection', ascending=False)
 
         return df
@@ -212,6 +294,9 @@ class BiasWordsEmbedding:
         :return: The ax object of the plot
         """
 
+        import matplotlib.pylab as plt
+        import seaborn as sns
+
         self._is_direction_identified()
 
         projections_df = self._calc_projection_scores(words)
@@ -258,6 +343,9 @@ class BiasWordsEmbedding:
         :return float: The ax object of the plot
         """
 
+        import matplotlib.pylab as plt
+        import seaborn as sns
+
         if ax is None:
             _, ax = plt.subplots(1)
 
@@ -266,9 +354,7 @@ class BiasWordsEmbedding:
         for name in names:
             words = word_groups[name]
             label = '{} (#{})'.format(name, len(words))
-            vectors = [self[word] for word in words]
-            projections = self.model.cosine_similarities(self.direction,
-                                                         vectors)
+            projections = self.project_words_on_direction(words)
             sns.distplot(projections, hist=False, label=label, ax=ax)
 
         plt.axvline(0, color='k', linestyle='--')
@@ -282,6 +368,60 @@ class BiasWordsEmbedding:
 
         return ax
 
+    @classmethod
+    def calc_bias_across_words_embeddings(cls, words_embedding_bias_dict,
+                                          words):
+        """
+        Calculate the projections and rho of words for words embeddings.
+
+        The vocabularies are joined once into arrays of the rows
+        of the words in every model (models that share the vocabulary,
+        e.g., debiased overlays of the same model, are resolved once),
+        and the projections of every model are calculated
+        with a single matrix-vector product.
+
+        :param dict words_embedding_bias_dict: ``WordsEmbeddingBias`` objects
+                                               as values,
+                                               and their names as keys.
+        :param list words: Words to be projected.
+        :return tuple: DataFrame of the projections of the words
+                       that are in all the models, a column per model,
+                       and DataFrame of the Spearman rho
+                       between every two models.
+        """
+        # pylint: disable=W0212
+
+        words = list(words)
+
+        vocabs_indices = {}
+        for web in words_embedding_bias_dict.values():
+            vocab = web.model.vocab
+            if id(vocab) not in vocabs_indices:
+                vocabs_indices[id(vocab)] = np.fromiter((vocab[word].index
+                                                         if word in vocab
+                                                         else -1
+                                                         for word in words),
+                                                        dtype=np.int64,
+                                                        count=len(words))
+
+        is_intersection = np.logical_and.reduce([indices >= 0
+                                                 for indices
+                                                 in vocabs_indices.values()])
+
+        intersection_words = [word for word, is_in_all
+                              in zip(words, is_intersection) if is_in_all]
+
+        projections = {}
+        for name, web in words_embedding_bias_dict.items():
+            indices = vocabs_indices[id(web.model.vocab)][is_intersection]
+            projections[name] = web.project_words_on_direction(indices)
+
+        df = pd.DataFrame(projections,
+                          index=intersection_words,
+                          columns=list(words_embedding_bias_dict))
+
+        return df, df.corr(method='spearman')
+
     @classmethod
     def _calc_bias_across_words_embeddings(cls,
                                            words_embedding_bias_dict,
@@ -295,23 +435,13 @@ class BiasWordsEmbedding:
         :param list words: Words to be projected.
         :return tuple: Projections and spearman rho.
         """
-        # pylint: disable=W0212
+
         assert len(words_embedding_bias_dict) == 2, 'Support only in two'\
                                                     'words embeddings'
 
-        intersection_words = [word for word in words
-                              if all(word in web
-                                     for web in (words_embedding_bias_dict
-                                                 .values()))]
-
-        projections = {name: web._calc_projection_scores(intersection_words)['projection']  # pylint: disable=C0301
-                       for name, web in words_embedding_bias_dict.items()}
-
-        df = pd.DataFrame(projections)
-        df.index = intersection_words
-
-        rho, _ = spearmanr(*df.transpose().values)
-        return df, rho
+        df, rhos = cls.calc_bias_across_words_embeddings(
+            words_embedding_bias_dict, words)
+        return df, rhos.iat[0, 1]
 
     @classmethod
     def plot_bias_across_words_embeddings(cls, words_embedding_bias_dict,
@@ -329,6 +459,8 @@ class BiasWordsEmbedding:
         """
         # pylint: disable=W0212
 
+        import matplotlib.pylab as plt
+
         df, rho = cls._calc_bias_across_words_embeddings(words_embedding_bias_dict,  # pylint: disable=C0301
                                                          words)
 
@@ -361,9 +493,9 @@ class BiasWordsEmbedding:
 
         return ax
 
-    # TODO: refactor for speed and clarity
     def generate_analogies(self, n_analogies=100, multiple=False,
-                           delta=1., restrict_vocab=30000):
+                           delta=1., restrict_vocab=30000, block_size=None,
+                           method='blocks', index=None):
         """
         Generate anologies based on the bias directionself.
 
@@ -373,84 +505,109 @@ class BiasWordsEmbedding:
         ``delta`` is used for semantically coherent. Default vale of 1
         corresponds to an angle <= pi/3.
 
+        The pairs are searched without the whole distance matrix,
+        see the methods in :mod:`ethically.we.analogies`.
+
         :param int n_analogies: Number of analogies to generate.
         :param bool multiple: Whether to allow multiple apprerences of a word
                               in the analogies.
         :param float delta: Threshold for semantic similarity.
                             The maximal distance between x and y.
         :param int restrict_vocab: The vocabulary size to use.
+        :param int block_size: The number of rows of the distance matrix
+                               to calculate at once.
+        :param str method: The method of the pairs search,
+                           ``blocks``, ``pruned`` or ``lsh``.
+        :param index: Index for the ``lsh`` method, fitted on
+                      the normalized vectors of ``restrict_vocab`` rows,
+                      or a path of a saved one, which is fitted again
+                      if it does not match them.
+                      By default, an index is fitted on the fly.
+        :type index: LSHIndex or str or None
         :return: Data Frame of anologies (x, y), thier distances,
                  and their cosine similarity scores
         """
 
-        # pylint: disable=C0301,R0914
-
         self._is_direction_identified()
 
-        restrict_vocab_vectors = self.model.vectors[:restrict_vocab]
+        restrict_vocab_vectors = self._get_vectors(slice(restrict_vocab))
+        normalized_vectors = self._as_storage(
+            normalize_rows(restrict_vocab_vectors))
 
-        normalized_vectores = (restrict_vocab_vectors
-                               / np.linalg.norm(restrict_vocab_vectors, axis=1)[:, None])
+        return search_analogies(normalized_vectors, self.direction,
+                                self.model.index2word, n_analogies,
+                                multiple, delta, block_size, method, index,
+                                self._compute_dtype, self._verbose)
 
-        pairs_distances = euclidean_distances(normalized_vectores, normalized_vectores)
-        pairs_indices = np.array(np.nonzero(
-            ((pairs_distances < delta)
-             & (pairs_distances != 0)))).T
-        x_vecores = np.take(normalized_vectores, pairs_indices[:, 0], axis=0)
-        y_vecores = np.take(normalized_vectores, pairs_indices[:, 1], axis=0)
+    def calc_direct_bias(self, neutral_words, c=None):
+        """Calculate the direct bias.
 
-        x_minus_y_vectors = x_vecores - y_vecores
-        normalized_x_minus_y_vectors = (x_minus_y_vectors
-                                        / np.linalg.norm(x_minus_y_vectors, axis=1)[:, None])
+        Based on the projection of neuteral words on the direction.
 
-        cos_distances = normalized_x_minus_y_vectors @ self.direction
+        The projections are calculated and summed in chunks of rows,
+        so the direct bias can be calculated on all the vocabulary.
 
-        sorted_cos_distances_indices = np.argsort(cos_distances)[::-1]
+        :param list neutral_words: List of neutral words,
+                                   or an array of their indices
+        :param c: Strictness of bias measuring
+        :type c: float or None
+        :return: The direct bias, nan if there are no neutral words
+        """
 
-        sorted_cos_distances_indices_iter = iter(sorted_cos_distances_indices)
+        self._is_direction_identified()
 
-        analogies = []
-        generated_words = set()
+        if c is None:
+            c = 1
 
-        while len(analogies) < n_analogies:
-            cos_distance_index = next(sorted_cos_distances_indices_iter)
-            paris_index = pairs_indices[cos_distance_index]
-            word_x, word_y = [self.model.index2word[index]
-                              for index in paris_index]
+        indices = self._get_words_indices(neutral_words)
+        if not len(indices):  # pylint: disable=len-as-condition
+            return np.nan
 
-            if multiple or (not multiple
-                            and (word_x not in generated_words
-                                 and word_y not in generated_words)):
-                analogies.append({'x': word_x,
-                                  'y': word_y,
-                                  'score': cos_distances[cos_distance_index],
-                                  'distance': pairs_distances[tuple(paris_index)]})
-            generated_words.add(word_x)
-            generated_words.add(word_y)
+        total = calc_direct_bias_sum(self._get_vectors, indices,
+                                     self.direction, c)
 
-        df = pd.DataFrame(analogies)
-        df = df[['x', 'y', 'distance', 'score']]
-        return df
+        return total / len(indices)
 
-    def calc_direct_bias(self, neutral_words, c=None):
-        """Calculate the direct bias.
+    def estimate_direct_bias(self, neutral_words, n_samples=None,
+                             confidence=None, c=None, random_state=None):
+        """Estimate the direct bias from a random sample of the words.
 
-        Based on the projection of neuteral words on the direction.
+        See :func:`~ethically.we.direct.estimate_direct_bias_sample`.
 
-        :param list neutral_words: List of neutral words
+        :param list neutral_words: List of neutral words,
+                                   or an array of their indices
+        :param int n_samples: The number of the sampled words
+        :param float confidence: The confidence level of the interval
         :param c: Strictness of bias measuring
         :type c: float or None
-        :return: The direct bias
+        :param int random_state: The seed of the sampling
+        :return: Tuple of the estimated direct bias,
+                 and the lower and upper bounds of the interval
         """
 
+        self._is_direction_identified()
+
+        if n_samples is None:
+            n_samples = DIRECT_BIAS_N_SAMPLES
+        if confidence is None:
+            confidence = DIRECT_BIAS_CONFIDENCE
         if c is None:
             c = 1
+        if random_state is None:
+            random_state = RANDOM_STATE
+
+        if n_samples < 2:
+            raise ValueError('n_samples should be at least 2,'
+                             ' {} was given'.format(n_samples))
+        if not 0 < confidence < 1:
+            raise ValueError('confidence should be between 0 and 1,'
+                             ' {} was given'.format(confidence))
 
-        projections = self._calc_projection_scores(neutral_words)['projection']
-        direct_bias_terms = np.abs(projections) ** c
-        direct_bias = direct_bias_terms.sum() / len(neutral_words)
+        indices = self._get_words_indices(neutral_words)
 
-        return direct_bias
+        return estimate_direct_bias_sample(self._get_vectors, indices,
+                                           self.direction, c, n_samples,
+                                           confidence, random_state)
 
     def calc_indirect_bias(self, word1, word2):
         """Calculate the indirect bias between two words.
@@ -464,21 +621,28 @@ class BiasWordsEmbedding:
         :return The indirect bias between the two words
         """
 
-        self._is_direction_identified()
+        return self.calc_indirect_bias_matrix([word1], [word2])[0, 0]
 
-        vector1 = normalize(self[word1])
-        vector2 = normalize(self[word2])
+    def calc_indirect_bias_matrix(self, words1, words2, tile_size=None):
+        """Calculate the indirect bias between all the pairs of two lists.
 
-        perpendicular_vector1 = reject_vector(vector1, self.direction)
-        perpendicular_vector2 = reject_vector(vector2, self.direction)
+        The matrix is calculated in tiles,
+        see :mod:`ethically.we.indirect`.
 
-        inner_product = vector1 @ vector2
-        perpendicular_similarity = cosine_similarity(perpendicular_vector1,
-                                                     perpendicular_vector2)
+        :param words1: List of words, or an array of their indices
+        :param words2: List of words, or an array of their indices
+        :param int tile_size: The number of rows and of columns of a tile
+        :return: Array of the indirect biases,
+                 ``(len(words1), len(words2))``
+        """
 
-        indirect_bias = ((inner_product - perpendicular_similarity)
-                         / inner_product)
-        return indirect_bias
+        self._is_direction_identified()
+
+        return calc_indirect_biases(self._get_vectors,
+                                    self._get_words_indices(words1),
+                                    self._get_words_indices(words2),
+                                    self.direction, tile_size,
+                                    self._compute_dtype)
 
     def generate_closest_words_indirect_bias(self,
                                              neutral_positive_end,
@@ -501,10 +665,10 @@ class BiasWordsEmbedding:
         neutral_direction = normalize(self[neutral_positive_end]
                                       - self[neutral_negative_end])
 
-        vectors = [normalize(self[word]) for word in words]
-        df = (pd.DataFrame([{'word': word,
-                             'projection': vector @ neutral_direction}
-                            for word, vector in zip(words, vectors)])
+        indices = self._get_words_indices(words)
+        vectors = normalize_rows(self._get_vectors(indices))
+        df = (pd.DataFrame({'word': words,
+                            'projection': vectors @ neutral_direction})
               .sort_values('projection', ascending=False))
 
         df = take_two_sides_extreme_sorted(df, n_extreme,
@@ -512,99 +676,140 @@ class BiasWordsEmbedding:
                                            neutral_positive_end,
                                            neutral_negative_end)
 
-        df['indirect_bias'] = df.apply(lambda r:
-                                       self.calc_indirect_bias(r['word'],
-                                                               r['end']),
-                                       axis=1)
+        ends = [neutral_positive_end, neutral_negative_end]
+        indirect_biases = self.calc_indirect_bias_matrix(df['word'], ends)
+        ends_positions = np.where(df['end'] == neutral_positive_end, 0, 1)
+        df['indirect_bias'] = indirect_biases[np.arange(len(df)),
+                                              ends_positions]
 
         df = df.set_index(['end', 'word'])
         df = df[['projection', 'indirect_bias']]
 
         return df
 
-    def _extract_neutral_words(self, specific_words):
-        extended_specific_words = set()
+    def _extract_neutral_indices(self, specific_words):
+        """Find the rows of the words that are not specific.
+
+        Only the specific words are looked up in the vocabulary,
+        so it does not iterate over the whole vocabulary.
+
+        :param list specific_words: List of specific words
+        :return: Array of the indices of the neutral words, in rows order
+        """
+
+        vocab = self.model.vocab
+        is_neutral = np.ones(len(self.model.index2word), dtype=bool)
 
         # because or specific_full data was trained on partial words embedding
         for word in specific_words:
-            extended_specific_words.add(word)
-            extended_specific_words.add(word.lower())
-            extended_specific_words.add(word.upper())
-            extended_specific_words.add(word.title())
+            for word_form in (word, word.lower(), word.upper(), word.title()):
+                if word_form in vocab:
+                    is_neutral[vocab[word_form].index] = False
 
-        neutral_words = [word for word in self.model.vocab
-                         if word not in extended_specific_words]
-
-        return neutral_words
+        return np.flatnonzero(is_neutral)
 
     def _neutralize(self, neutral_words):
         self._is_direction_identified()
 
+        indices = self._get_words_indices(neutral_words)
+        direction = normalize(self.direction)
+
+        if _is_overlay(self.model):
+            self.model.reject_vectors(indices, direction)
+            self._normalize_vectors()
+            return
+
+        # the overlays that share the model keep the rows as they were,
+        # copied at once rather than chunk by chunk
+        from .overlay import preserve_base_rows
+        preserve_base_rows(self.model, indices)
+
+        chunks_starts = range(0, len(indices), VECTORS_CHUNK_SIZE)
         if self._verbose:
-            neutral_words_iter = tqdm(neutral_words)
-        else:
-            neutral_words_iter = iter(neutral_words)
+            from tqdm import tqdm
+            chunks_starts = tqdm(chunks_starts)
 
-        for word in neutral_words_iter:
-            neutralized_vector = reject_vector(self[word],
-                                               self.direction)
-            update_word_vector(self.model, word, neutralized_vector)
+        # rank-1 update v - (v @ d) * d of all the neutral words rows
+        for chunk_start in chunks_starts:
+            chunk_indices = indices[chunk_start:
+                                    chunk_start + VECTORS_CHUNK_SIZE]
+            vectors = self._get_vectors(chunk_indices)
+            reject_rows(vectors, direction, out=vectors)
+            self._set_vectors(chunk_indices, vectors)
 
-        self.model.init_sims(replace=True)
+        self._normalize_vectors()
 
     def _equalize(self, equality_sets):
         # pylint: disable=R0914
 
         self._is_direction_identified()
 
+        direction = normalize(self.direction)
+
         if self._verbose:
             words_data = []
 
-        for equality_set_index, equality_set_words in enumerate(equality_sets):
-            equality_set_vectors = [normalize(self[word])
-                                    for word in equality_set_words]
-            center = np.mean(equality_set_vectors, axis=0)
-            (projected_center,
-             rejected_center) = project_reject_vector(center,
-                                                      self.direction)
-            scaling = np.sqrt(1 - np.linalg.norm(rejected_center)**2)
-
-            for word, vector in zip(equality_set_words, equality_set_vectors):
-                projected_vector = project_vector(vector, self.direction)
-
-                projected_part = normalize(projected_vector - projected_center)
-
-                # In the code it is different of Bolukbasi
-                # It behaves the same only for equality_sets
-                # with size of 2 (pairs) - not sure!
-                # However, my code is the same as the article
-                # equalized_vector = rejected_center + scaling * self.direction
-                # https://github.com/tolga-b/debiaswe/blob/10277b23e187ee4bd2b6872b507163ef4198686b/debiaswe/debias.py#L36-L37
-                # For pairs, projected_part_vector1 == -projected_part_vector2,
-                # and this is the same as
-                # projected_part_vector1 == self.direction
-                equalized_vector = rejected_center + scaling * projected_part
-
-                update_word_vector(self.model, word, equalized_vector)
-
-                if self._verbose:
-                    words_data.append({
-                        'equality_set_index': equality_set_index,
-                        'word': word,
-                        'scaling': scaling,
-                        'projected_scalar': vector @ self.direction,
-                        'equalized_projected_scalar': (equalized_vector
-                                                       @ self.direction),
-                    })
+        for (equality_sets_indices,
+             equality_sets_words) in group_equality_sets(equality_sets):
 
-        if self._verbose:
+            indices = np.array([self._get_words_indices(equality_set_words)
+                                for equality_set_words in equality_sets_words])
+
+            # shape: (number of sets, set size, dimension)
+            equality_sets_vectors = normalize_rows(self._get_vectors(indices))
+
+            centers = np.mean(equality_sets_vectors, axis=1)
+            (projected_centers,
+             rejected_centers) = project_reject_rows(centers, direction)
+            scalings = np.sqrt(1 - np.linalg.norm(rejected_centers, axis=1)**2)
+
+            projected_vectors = project_rows(equality_sets_vectors, direction)
+
+            projected_parts = (projected_vectors
+                               - projected_centers[:, None, :])
+            normalize_rows(projected_parts, out=projected_parts)
+
+            # In the code it is different of Bolukbasi
+            # It behaves the same only for equality_sets
+            # with size of 2 (pairs) - not sure!
+            # However, my code is the same as the article
+            # equalized_vector = rejected_center + scaling * self.direction
+            # https://github.com/tolga-b/debiaswe/blob/10277b23e187ee4bd2b6872b507163ef4198686b/debiaswe/debias.py#L36-L37
+            # For pairs, projected_part_vector1 == -projected_part_vector2,
+            # and this is the same as
+            # projected_part_vector1 == self.direction
+            equalized_vectors = (rejected_centers[:, None, :]
+                                 + scalings[:, None, None] * projected_parts)
+
+            n_dims = equalized_vectors.shape[-1]
+            self._set_vectors(indices.ravel(),
+                              equalized_vectors.reshape(-1, n_dims))
+
+            if self._verbose:
+                words_data.append(pd.DataFrame({
+                    'equality_set_index': np.repeat(equality_sets_indices,
+                                                    indices.shape[1]),
+                    'word': [word
+                             for equality_set_words in equality_sets_words
+                             for word in equality_set_words],
+                    'scaling': np.repeat(scalings, indices.shape[1]),
+                    'projected_scalar': (equality_sets_vectors
+                                         @ self.direction).ravel(),
+                    'equalized_projected_scalar': (equalized_vectors
+                                                   @ self.direction).ravel(),
+                }))
+
+        if self._verbose and words_data:
+            from tabulate import tabulate
             print('Equalize Words Data '
                   '(all equal for 1-dim bias space (direction):')
-            words_data_df = (pd.DataFrame(words_data)
+            words_data_df = (pd.concat(words_data)
+                             .sort_values('equality_set_index',
+                                          kind='mergesort')
                              .set_index(['equality_set_index', 'word']))
             print(tabulate(words_data_df, headers='keys'))
 
-        self.model.init_sims(replace=True)
+        self._normalize_vectors()
 
     def debias(self, method='hard', neutral_words=None, equality_sets=None,
                inplace=True):
@@ -617,7 +822,11 @@ class BiasWordsEmbedding:
                                    for the equalize step.
                                    The sets represent the direction.
         :param bool inplace: Whether to debias the object inplace
-                             or return a new one
+                             or return a new one.
+                             The new one shares the vectors
+                             of the words embedding, and stores
+                             only the changes on top of them
+                             (see ``OverlayKeyedVectors``).
 
         .. warning::
 
@@ -628,10 +837,17 @@ class BiasWordsEmbedding:
         """
 
         # pylint: disable=W0212
+
+        from .overlay import OverlayKeyedVectors
+
         if inplace:
             bias_words_embedding = self
         else:
-            bias_words_embedding = copy.deepcopy(self)
+            bias_words_embedding = copy.copy(self)
+            if _is_overlay(self.model):
+                bias_words_embedding.model = copy.deepcopy(self.model)
+            else:
+                bias_words_embedding.model = OverlayKeyedVectors(self.model)
 
         if method not in DEBIAS_METHODS:
             raise ValueError('method should be one of {}, {} was given'.format(
@@ -654,7 +870,8 @@ class BiasWordsEmbedding:
 
     def evaluate_words_embedding(self,
                                  kwargs_word_pairs=None,
-                                 kwargs_word_analogies=None):
+                                 kwargs_word_analogies=None,
+                                 n_jobs=1, return_timings=False):
         """
         Evaluate word pairs tasks and word analogies tasks.
 
@@ -667,66 +884,102 @@ class BiasWordsEmbedding:
                                       evaluate_word_analogies
                                       method.
         :type evaluate_word_analogies: dict or None
+        :param int n_jobs: The number of worker processes
+                           that evaluate the tasks concurrently,
+                           ``None`` or ``-1`` for the number of CPUs.
+        :param bool return_timings: Whether to return also a DataFrame
+                                    of the time of each task in seconds.
         :return: Tuple of DataFrame for the evaluation results.
         """
 
-        return evaluate_words_embedding(self.model,
-                                        kwargs_word_pairs,
-                                        kwargs_word_analogies)
+        try:
+            return evaluate_words_embedding(self.model,
+                                            kwargs_word_pairs,
+                                            kwargs_word_analogies,
+                                            n_jobs=n_jobs,
+                                            return_timings=return_timings)
+        finally:
+            # most_similar materializes the normalized vectors of an overlay
+            if _is_overlay(self.model):
+                self.model.release_sims()
 
     def learn_full_specific_words(self, seed_specific_words,
-                                  max_non_specific_examples=None, debug=None):
+                                  max_non_specific_examples=None, debug=None,
+                                  chunk_size=None, return_margins=None,
+                                  method='svm', batch_size=None,
+                                  n_epochs=None, random_state=None):
         """Learn specific words given a list of seed specific wordsself.
 
-        Using Linear SVM.
+        Using Linear SVM, in memory or with stochastic gradient descent
+        (``'sgd'``), see :mod:`ethically.we.training`.
+
+        All the words are classified with ``decision_function``
+        on chunks of rows of the normalized vectors.
 
         :param list seed_specific_words: List of seed specific words
         :param int max_non_specific_examples: The number of non-specifc words
-                                              to sample for training
-        :return: List of learned specific words and the classifier object
+                                              to sample for training.
+                                              For ``'svm'`` these are
+                                              the first words in the
+                                              vocabulary, and for ``'sgd'``
+                                              a random sample
+                                              (by default all of them).
+        :param int chunk_size: The number of rows to classify at once
+        :param bool return_margins: Whether to return also the margins
+                                    of all the words, as an array
+                                    in the order of ``model.index2word``
+        :param str method: The training method, ``'svm'`` or ``'sgd'``
+        :param int batch_size: The number of rows in a mini-batch
+                               for ``'sgd'``
+        :param int n_epochs: The number of passes over the training rows
+                             for ``'sgd'``
+        :param int random_state: The seed of the sampling and the training
+                                 for ``'sgd'``
+        :return: List of learned specific words and the classifier object.
+                 With ``debug``, also the training data,
+                 for ``'sgd'`` the indices of the rows instead of
+                 the vectors.
         """
 
-        if debug is None:
-            debug = False
-
-        if max_non_specific_examples is None:
-            max_non_specific_examples = MAX_NON_SPECIFIC_EXAMPLES
-
-        data = []
-        non_specific_example_count = 0
+        # pylint: disable=R0914
 
-        for word in self.model.vocab:
-            is_specific = word in seed_specific_words
+        if method not in LEARN_SPECIFIC_METHODS:
+            raise ValueError('method should be one of {}, {} was given'.format(
+                LEARN_SPECIFIC_METHODS, method))
 
-            if not is_specific:
-                non_specific_example_count += 1
-                if non_specific_example_count <= max_non_specific_examples:
-                    data.append((self[word], is_specific))
-            else:
-                data.append((self[word], is_specific))
+        if debug is None:
+            debug = False
 
-        np.random.seed(RANDOM_STATE)
-        np.random.shuffle(data)
+        if return_margins is None:
+            return_margins = False
 
-        X, y = zip(*data)
+        if method == 'svm':
+            clf, X, y = train_specific_words_svm(self.model, self._get_vectors,
+                                                 seed_specific_words,
+                                                 max_non_specific_examples,
+                                                 self.dtype)
 
-        X = np.array(X)
-        X /= np.linalg.norm(X, axis=1)[:, None]
+        else:
+            clf, X, y = train_specific_words_sgd(self.model, self._get_vectors,
+                                                 seed_specific_words,
+                                                 max_non_specific_examples,
+                                                 batch_size, n_epochs,
+                                                 random_state, self._verbose)
 
-        y = np.array(y).astype('int')
+        margins = calc_margins(clf, self._get_vectors,
+                               len(self.model.index2word), chunk_size,
+                               self._compute_dtype)
 
-        clf = LinearSVC(C=1, class_weight='balanced',
-                        random_state=RANDOM_STATE)
+        # the same as clf.predict
+        full_specific_words = [self.model.index2word[index]
+                               for index in np.flatnonzero(margins > 0)]
 
-        clf.fit(X, y)
+        results = (full_specific_words, clf)
 
-        full_specific_words = []
-        for word in self.model.vocab:
-            vector = [normalize(self[word])]
-            if clf.predict(vector):
-                full_specific_words.append(word)
+        if return_margins:
+            results += (margins,)
 
-        if not debug:
-            return full_specific_words, clf
+        if debug:
+            results += (X, y)
 
-        return full_specific_words, clf, X, y
+        return results
@@ -1,49 +1,314 @@
 # TODO how import files from a package
+import hashlib
 import json
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
 
-from gensim.models.keyedvectors import KeyedVectors
-from pkg_resources import resource_filename, resource_string
+import numpy as np
 
 
-def load_w2v_small():
+CACHE_DIR_ENV = 'ETHICALLY_CACHE_DIR'
+DEFAULT_CACHE_DIR = os.path.join('~', '.cache', 'ethically')
+
+CACHE_VECTORS_FILENAME = 'vectors.npy'
+CACHE_WORDS_FILENAME = 'words.txt'
+CACHE_COUNTS_FILENAME = 'counts.npy'
+CACHE_META_FILENAME = 'meta.json'
+
+
+def get_cache_dir(cache_dir=None):
+    """Get the cache directory of converted words embedding models.
+
+    :param str cache_dir: The cache directory, by default
+                          the ``ETHICALLY_CACHE_DIR`` environment variable
+                          or ``~/.cache/ethically``.
+    """
+
+    if cache_dir is None:
+        cache_dir = os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+    return os.path.expanduser(cache_dir)
+
+
+def _get_source_meta(path, binary, glove):
+    stat = os.stat(path)
+    return {'path': path,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'binary': binary,
+            'glove': glove}
+
+
+def _get_model_cache_path(cache_dir, path, binary, glove):
+    key = hashlib.sha1(json.dumps([path, binary, glove])
+                       .encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, 'models', key)
+
+
+def _is_cache_valid(model_cache_path, source_meta):
+    meta_path = os.path.join(model_cache_path, CACHE_META_FILENAME)
+
+    if not os.path.exists(meta_path):
+        return False
+
+    with open(meta_path) as meta_file:
+        return json.load(meta_file) == source_meta
+
+
+def _load_source_model(path, binary, glove):
+    from gensim.models.keyedvectors import KeyedVectors
+
+    if not glove:
+        return KeyedVectors.load_word2vec_format(path, binary=binary)
+
+    from gensim.scripts.glove2word2vec import glove2word2vec
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        word2vec_path = os.path.join(temp_dir, 'word2vec.txt')
+        glove2word2vec(path, word2vec_path)
+        return KeyedVectors.load_word2vec_format(word2vec_path)
+
+
+def _iter_vectors_chunks(model):
+    from ..overlay import OverlayKeyedVectors
+    from ..utils import VECTORS_CHUNK_SIZE
+
+    for start in range(0, len(model.index2word), VECTORS_CHUNK_SIZE):
+        chunk = slice(start, start + VECTORS_CHUNK_SIZE)
+        if isinstance(model, OverlayKeyedVectors):
+            yield chunk, model.get_vectors(chunk)
+        else:
+            yield chunk, model.vectors[chunk]
+
+
+def _get_vectors_dtype(model):
+    from ..overlay import OverlayKeyedVectors
+
+    if isinstance(model, OverlayKeyedVectors):
+        return model.dtype
+    return model.vectors.dtype
+
+
+def write_model_cache(model, path, normalize=False):
+    """Write a words embedding into a directory in the cache format.
+
+    The vectors are written chunk by chunk, in the dtype of the model,
+    so an overlay model is never materialized as a whole.
+    They are normalized in float32 at least.
+
+    :param model: Words embedding model of ``gensim.model.KeyedVectors``
+    :param str path: Path of the directory, which is created
+    :param bool normalize: Whether to write the vectors normalized
+    """
+
+    from ..utils import normalize_rows
+
+    os.makedirs(path, exist_ok=True)
+
+    dtype = _get_vectors_dtype(model)
+    compute_dtype = np.promote_types(dtype, np.float32)
+
+    vectors = np.lib.format.open_memmap(os.path.join(path,
+                                                     CACHE_VECTORS_FILENAME),
+                                        mode='w+', dtype=dtype,
+                                        shape=(len(model.index2word),
+                                               model.vector_size))
+
+    for chunk, chunk_vectors in _iter_vectors_chunks(model):
+        if normalize:
+            chunk_vectors = normalize_rows(
+                chunk_vectors.astype(compute_dtype, copy=False))
+        vectors[chunk] = chunk_vectors
+
+    vectors.flush()
+    del vectors
+
+    with open(os.path.join(path, CACHE_WORDS_FILENAME), 'w',
+              encoding='utf-8') as words_file:
+        words_file.write('\n'.join(model.index2word))
+
+    np.save(os.path.join(path, CACHE_COUNTS_FILENAME),
+            np.array([model.vocab[word].count
+                      for word in model.index2word], dtype=np.int64))
+
+
+def read_model_cache(path, mmap_mode='r'):
+    """Read a words embedding from a directory in the cache format.
+
+    :param str path: Path of the directory
+    :param mmap_mode: Memory-map mode of the vectors matrix,
+                      see :func:`load_w2v`
+    :return: Words embedding model of ``gensim.model.KeyedVectors``
+    """
+
+    from gensim.models.keyedvectors import KeyedVectors, Vocab
+
+    vectors = np.load(os.path.join(path, CACHE_VECTORS_FILENAME),
+                      mmap_mode=mmap_mode)
+
+    with open(os.path.join(path, CACHE_WORDS_FILENAME),
+              encoding='utf-8') as words_file:
+        words = words_file.read().split('\n') if len(vectors) else []
+
+    counts = np.load(os.path.join(path, CACHE_COUNTS_FILENAME))
+
+    model = KeyedVectors(vectors.shape[1])
+    model.vectors = vectors
+    model.index2word = words
+    model.vocab = {word: Vocab(index=index, count=count)
+                   for index, (word, count) in enumerate(zip(words,
+                                                             counts.tolist()))}
+
+    return model
+
+
+def _write_cache(model_cache_path, source_meta):
+    model = _load_source_model(source_meta['path'],
+                               source_meta['binary'], source_meta['glove'])
+
+    os.makedirs(os.path.dirname(model_cache_path), exist_ok=True)
+
+    # write into a temporary directory and move it into place,
+    # so a concurrent reader never sees a partial cache
+    temp_path = tempfile.mkdtemp(dir=os.path.dirname(model_cache_path))
+
+    try:
+        write_model_cache(model, temp_path)
+
+        with open(os.path.join(temp_path, CACHE_META_FILENAME),
+                  'w') as meta_file:
+            json.dump(source_meta, meta_file)
+
+        shutil.rmtree(model_cache_path, ignore_errors=True)
+        os.replace(temp_path, model_cache_path)
+
+    except BaseException:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        raise
+
+
+def load_w2v(path, binary=True, glove=False, mmap_mode='r', cache_dir=None):
+    """Load a word2vec or GloVe words embedding through a native cache.
+
+    The first time a file is loaded, it is converted into
+    a cache directory with a float32 ``.npy`` matrix of the vectors
+    and the vocabulary. Afterwards, the matrix is loaded with ``np.load``
+    and ``mmap_mode``, so processes that load the same model
+    share its pages through the OS.
+
+    The cache is keyed by the path of the file, and it is converted again
+    when the size or the modification time of the file change.
+
+    :param str path: Path of the words embedding file
+    :param bool binary: Whether the word2vec file is in the binary format
+    :param bool glove: Whether the file is in the GloVe text format
+                       (without the header line)
+    :param mmap_mode: Memory-map mode of the vectors matrix,
+                      ``'r'`` is read-only, ``'c'`` is copy-on-write
+                      (required for inplace debiasing)
+                      and ``None`` loads it into memory
+    :param str cache_dir: The cache directory, see :func:`get_cache_dir`
+    :return: Words embedding model of ``gensim.model.KeyedVectors``
+    """
+
+    path = os.path.abspath(path)
+    binary = binary and not glove
+
+    source_meta = _get_source_meta(path, binary, glove)
+    model_cache_path = _get_model_cache_path(get_cache_dir(cache_dir),
+                                             path, binary, glove)
+
+    if not _is_cache_valid(model_cache_path, source_meta):
+        _write_cache(model_cache_path, source_meta)
+
+    return read_model_cache(model_cache_path, mmap_mode)
+
+
+def load_w2v_small(mmap_mode='c', cache_dir=None):
+    """Load the small Google News word2vec words embedding of Bolukbasi.
+
+    :param mmap_mode: Memory-map mode of the vectors matrix,
+                      see :func:`load_w2v`
+    :param str cache_dir: The cache directory, see :func:`get_cache_dir`
+    :return: Words embedding model of ``gensim.model.KeyedVectors``
+    """
+
+    from pkg_resources import resource_filename
+
     # pylint: disable=C0301
-    return KeyedVectors.load_word2vec_format(
+    return load_w2v(
         resource_filename(__name__, 'GoogleNews-vectors-negative300-bolukbasi.bin'),
-        binary=True)
+        binary=True, mmap_mode=mmap_mode, cache_dir=cache_dir)
 
 
 def load_json_resource(resource_name):
+    from pkg_resources import resource_string
+
     return json.loads(
         resource_string(__name__, resource_name + '.json').decode('utf-8')
 
     )
 
 
-BOLUKBASI_DATA = load_json_resource('bolukbasi')
+class LazyData(Mapping):
+    """Read-only mapping that is built on the first access.
+
+    :param build: Function without arguments that returns the mapping
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._data = None
+
+    def _get_data(self):
+        if self._data is None:
+            self._data = self._build()
+        return self._data
 
-BOLUKBASI_DATA['gender']['profession_names'] = list(
-    zip(*BOLUKBASI_DATA['gender']['professions']))[0]
+    def __getitem__(self, key):
+        return self._get_data()[key]
 
+    def __iter__(self):
+        return iter(self._get_data())
+
+    def __len__(self):
+        return len(self._get_data())
+
+    def __repr__(self):
+        return repr(self._get_data())
+
+
+def _build_bolukbasi_data():
+    data = load_json_resource('bolukbasi')
+
+    data['gender']['profession_names'] = list(
+        zip(*data['gender']['professions']))[0]
+
+    data['gender']['specific_full'].sort()
+
+    # TODO: in the code of the article, the last definitional pair
+    # is not in the specific full
+    data['gender']['specific_full_with_definitional'] = list(
+        set.union(
+            *map(set, data['gender']['definitional_pairs'])
+        ) | set(data['gender']['specific_full'])
+    )
+    data['gender']['specific_full_with_definitional'].sort()
+
+    data['gender']['neutral_profession_names'] = list(
+        set(data['gender']['profession_names'])
+        - set(data['gender']['specific_full_with_definitional'])
+    )
+    data['gender']['neutral_profession_names'].sort()
 
-BOLUKBASI_DATA['gender']['specific_full'].sort()
+    data['gender']['word_group_keys'] = ['profession_names',
+                                         'neutral_profession_names',
+                                         'specific_seed',
+                                         'specific_full',
+                                         'specific_full_with_definitional']
 
-# TODO: in the code of the article, the last definitional pair
-# is not in the specific full
-BOLUKBASI_DATA['gender']['specific_full_with_definitional'] = list(
-    set.union(
-        *map(set, BOLUKBASI_DATA['gender']['definitional_pairs'])
-    ) | set(BOLUKBASI_DATA['gender']['specific_full'])
-)
-BOLUKBASI_DATA['gender']['specific_full_with_definitional'].sort()
+    return data
 
-BOLUKBASI_DATA['gender']['neutral_profession_names'] = list(
-    set(BOLUKBASI_DATA['gender']['profession_names'])
-    - set(BOLUKBASI_DATA['gender']['specific_full_with_definitional'])
-)
-BOLUKBASI_DATA['gender']['neutral_profession_names'].sort()
 
-BOLUKBASI_DATA['gender']['word_group_keys'] = ['profession_names',
-                                               'neutral_profession_names',
-                                               'specific_seed',
-                                               'specific_full',
-                                               'specific_full_with_definitional']  # pylint: disable=C0301
+BOLUKBASI_DATA = LazyData(_build_bolukbasi_data)
@@ -0,0 +1,94 @@
+"""
+Direct bias of neutral words.
+
+The direct bias is the mean of ``|projection| ** c`` of the normalized
+vectors of neutral words on the direction
+(see Bolukbasi et al., 2016, section 5.1).
+
+It is calculated on chunks of rows, so it can be calculated
+on all the vocabulary, or estimated from a random sample of the words,
+with a confidence interval.
+"""
+
+import numpy as np
+
+from .utils import VECTORS_CHUNK_SIZE, normalize, normalize_rows
+
+
+DIRECT_BIAS_N_SAMPLES = 10000
+DIRECT_BIAS_CONFIDENCE = 0.95
+
+
+def calc_direct_bias_sum(get_vectors, indices, direction, c):
+    """Calculate the sum of ``|projection| ** c`` of rows in chunks.
+
+    :param get_vectors: Function that returns the vectors
+                        of an array of indices of rows
+    :param indices: Array of indices of rows
+    :param direction: The direction vector
+    :param float c: Strictness of bias measuring
+    :return float: The sum
+    """
+
+    direction = normalize(direction)
+
+    total = 0.
+    for start in range(0, len(indices), VECTORS_CHUNK_SIZE):
+        chunk_indices = indices[start:start + VECTORS_CHUNK_SIZE]
+        vectors = normalize_rows(get_vectors(chunk_indices))
+        total += np.sum(np.abs(vectors @ direction) ** c,
+                        dtype=np.float64)
+
+    return total
+
+
+def estimate_direct_bias_sample(get_vectors, indices, direction, c,
+                                n_samples, confidence, random_state):
+    """Estimate the direct bias from a random sample of rows.
+
+    The confidence interval is based on the normal approximation
+    of the mean of the sample, with finite population correction.
+    If the sample covers all the rows, the direct bias is exact,
+    and if there are no rows, it is nan.
+
+    :param get_vectors: Function that returns the vectors
+                        of an array of indices of rows
+    :param indices: Array of indices of rows
+    :param direction: The direction vector
+    :param float c: Strictness of bias measuring
+    :param int n_samples: The number of the sampled rows
+    :param float confidence: The confidence level of the interval
+    :param int random_state: The seed of the sampling
+    :return: Tuple of the estimated direct bias,
+             and the lower and upper bounds of the interval
+    """
+
+    # pylint: disable=R0914
+
+    from scipy.stats import norm
+
+    n_words = len(indices)
+
+    if not n_words:
+        return np.nan, (np.nan, np.nan)
+
+    if n_samples >= n_words:
+        direct_bias = calc_direct_bias_sum(get_vectors, indices,
+                                           direction, c) / n_words
+        return direct_bias, (direct_bias, direct_bias)
+
+    random_generator = np.random.RandomState(random_state)
+    sample_positions = random_generator.choice(n_words, n_samples,
+                                               replace=False)
+    sample_indices = np.sort(indices[sample_positions])
+
+    vectors = normalize_rows(get_vectors(sample_indices))
+    projections = vectors @ normalize(direction)
+    terms = np.abs(projections).astype(np.float64) ** c
+
+    direct_bias = terms.mean()
+    standard_error = (terms.std(ddof=1) / np.sqrt(n_samples)
+                      * np.sqrt((n_words - n_samples) / (n_words - 1)))
+    margin = norm.ppf((1 + confidence) / 2) * standard_error
+
+    return direct_bias, (direct_bias - margin, direct_bias + margin)
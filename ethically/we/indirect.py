@@ -0,0 +1,74 @@
+"""
+Indirect bias between all the pairs of two lists of words.
+
+The indirect bias between two words is the part of their similarity
+that is due to the direction, so it is calculated from the similarity
+of their normalized vectors, and of the normalized rejections
+of the direction from them (see Bolukbasi et al., 2016, section 5.2).
+
+The matrix of all the pairs is calculated in tiles of rows and columns,
+so the memory of the intermediate matrices is bounded by the tiles.
+"""
+
+import numpy as np
+
+from .utils import normalize_rows, reject_rows
+
+
+INDIRECT_BIAS_TILE_SIZE = 1000
+
+
+def _calc_indirect_bias_vectors(vectors, direction):
+    vectors = normalize_rows(vectors)
+    perpendicular_vectors = normalize_rows(reject_rows(vectors, direction))
+    return vectors, perpendicular_vectors
+
+
+def calc_indirect_biases(get_vectors, indices1, indices2, direction,
+                         tile_size=None, dtype=None):
+    """Calculate the indirect bias between all the pairs of two lists.
+
+    Each tile takes two matrix products, of the normalized vectors
+    and of the normalized rejections of the direction from them.
+
+    :param get_vectors: Function that returns the vectors
+                        of an array of indices of rows
+    :param indices1: Array of indices of rows
+    :param indices2: Array of indices of rows
+    :param direction: The direction vector
+    :param int tile_size: The number of rows and of columns of a tile
+    :param dtype: The dtype of the matrix
+    :return: Array of the indirect biases,
+             ``(len(indices1), len(indices2))``
+    """
+
+    # pylint: disable=R0914
+
+    if tile_size is None:
+        tile_size = INDIRECT_BIAS_TILE_SIZE
+
+    indirect_biases = np.empty((len(indices1), len(indices2)), dtype=dtype)
+
+    for start1 in range(0, len(indices1), tile_size):
+        tile_indices1 = indices1[start1:start1 + tile_size]
+        (vectors1,
+         perpendicular_vectors1) = _calc_indirect_bias_vectors(
+             get_vectors(tile_indices1), direction)
+
+        for start2 in range(0, len(indices2), tile_size):
+            tile_indices2 = indices2[start2:start2 + tile_size]
+            (vectors2,
+             perpendicular_vectors2) = _calc_indirect_bias_vectors(
+                 get_vectors(tile_indices2), direction)
+
+            inner_products = vectors1 @ vectors2.T
+            perpendicular_similarities = (perpendicular_vectors1
+                                          @ perpendicular_vectors2.T)
+
+            tile = indirect_biases[start1:start1 + tile_size,
+                                   start2:start2 + tile_size]
+            np.subtract(inner_products, perpendicular_similarities,
+                        out=tile)
+            tile /= inner_products
+
+    return indirect_biases
@@ -0,0 +1,379 @@
+"""
+Approximate nearest neighbours index for words embedding.
+
+Random projection locality sensitive hashing (LSH)
+for the cosine similarity, based on Charikar, 2002.
+Every table hashes a vector to the signs of its projections
+on random hyperplanes, so close vectors tend to fall
+into the same bucket in at least one of the tables.
+
+The index is meant to be built once per model and saved next to it,
+e.g. ``GoogleNews-vectors-negative300.bin.lsh.npz``,
+and then used for queries of all the pairs of words within a distance,
+instead of calculating the whole distance matrix.
+
+Reference: https://www.cs.princeton.edu/courses/archive/spr04/cos598B/bib/CharikarEstim.pdf
+"""
+
+import math
+import os
+
+import numpy as np
+
+from ..consts import RANDOM_STATE
+from .utils import calc_euclidean_distances, calc_vectors_fingerprint
+
+
+LSH_N_TABLES = 32
+LSH_BUCKET_SIZE = 64
+LSH_CHUNK_SIZE = 100000
+LSH_MAX_BUCKET_SIZE = 1024
+
+
+def _get_npz_path(path):
+    # the same as numpy.savez does
+    if not path.endswith('.npz'):
+        path += '.npz'
+    return path
+
+
+def _as_float32_at_least(vectors):
+    return vectors.astype(np.promote_types(vectors.dtype, np.float32),
+                          copy=False)
+
+
+def _calc_distances(vectors, squared_norms, x_indices, y_indices):
+    inner_products = np.einsum('ij,ij->i',
+                               _as_float32_at_least(vectors[x_indices]),
+                               _as_float32_at_least(vectors[y_indices]))
+    squared_distances = (squared_norms[x_indices] + squared_norms[y_indices]
+                         - 2 * inner_products)
+    return np.sqrt(np.maximum(squared_distances, 0))
+
+
+def _group_codes(codes, max_bucket_size):
+    """Group the rows by their codes, and split the oversized buckets.
+
+    The rows of a bucket are split into groups of at most
+    ``max_bucket_size`` consecutive rows, so the number of pairs
+    in a group is bounded.
+
+    :return: Tuple of the rows sorted by their groups,
+             the end of the group of every sorted row,
+             and the group of every row.
+    """
+
+    n_codes = len(codes)
+
+    sorted_indices = np.argsort(codes, kind='mergesort')
+    sorted_codes = codes[sorted_indices]
+
+    positions = np.arange(n_codes)
+    is_bucket_start = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+    buckets_starts = np.maximum.accumulate(np.where(is_bucket_start,
+                                                    positions, 0))
+    is_group_start = (positions - buckets_starts) % max_bucket_size == 0
+
+    groups_starts = np.flatnonzero(is_group_start)
+    groups_ends = np.r_[groups_starts[1:], n_codes]
+    positions_groups_ends = np.repeat(groups_ends,
+                                      groups_ends - groups_starts)
+
+    groups = np.empty(n_codes, dtype=np.int32)
+    groups[sorted_indices] = np.cumsum(is_group_start) - 1
+
+    return sorted_indices, positions_groups_ends, groups
+
+
+def _iter_group_pairs(sorted_indices, positions_groups_ends):
+    """Generate all the pairs of rows that share a group.
+
+    Pairs are generated by their offset in the sorted order,
+    so every step takes at most ``LSH_CHUNK_SIZE`` memory.
+    """
+
+    positions = np.arange(len(sorted_indices))
+    offset = 1
+
+    while True:
+        positions = positions[positions + offset
+                              < positions_groups_ends[positions]]
+        if not len(positions):  # pylint: disable=len-as-condition
+            break
+
+        for chunk_start in range(0, len(positions), LSH_CHUNK_SIZE):
+            chunk = positions[chunk_start:chunk_start + LSH_CHUNK_SIZE]
+            yield sorted_indices[chunk], sorted_indices[chunk + offset]
+
+        offset += 1
+
+
+class LSHIndex:
+    """Random projection LSH index over the vectors of a words embedding.
+
+    :param int n_tables: Number of hash tables,
+                         more tables give higher recall
+                         but take more time and memory.
+    :param int n_bits: Number of hyperplanes per table,
+                       by default such that a bucket
+                       holds about 64 vectors.
+    :param int random_state: Seed of the random hyperplanes.
+    """
+
+    def __init__(self, n_tables=None, n_bits=None,
+                 random_state=RANDOM_STATE):
+        if n_tables is None:
+            n_tables = LSH_N_TABLES
+
+        if n_bits is not None and not 0 < n_bits <= 64:
+            raise ValueError('n_bits should be between 1 and 64,'
+                             ' {} was given'.format(n_bits))
+
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.random_state = random_state
+
+        self.mean = None
+        self.hyperplanes = None
+        self.codes = None
+        self.fingerprint = None
+
+    def _is_fitted(self):
+        if self.codes is None:
+            raise RuntimeError('The index was not fitted or loaded')
+
+    def fit(self, vectors):
+        """Hash the vectors of a words embedding.
+
+        The fingerprint of the vectors is kept in ``fingerprint``
+        (see :func:`~ethically.we.utils.calc_vectors_fingerprint`).
+
+        :param vectors: Matrix of the vectors, e.g. ``model.vectors``
+        :return: The index itself
+        """
+
+        n_vectors, n_dims = vectors.shape
+
+        if self.n_bits is None:
+            self.n_bits = int(np.clip(round(math.log2(max(n_vectors, 1)
+                                                      / LSH_BUCKET_SIZE)),
+                                      1, 64))
+
+        # The vectors of words embedding are not centered,
+        # so without it most of them would fall into the same buckets
+        self.mean = np.zeros(n_dims, dtype=np.float32)
+        for start in range(0, n_vectors, LSH_CHUNK_SIZE):
+            chunk = _as_float32_at_least(vectors[start:start + LSH_CHUNK_SIZE])
+            self.mean += (chunk
+                          / np.linalg.norm(chunk, axis=1)[:, None]).sum(axis=0)
+        self.mean /= max(n_vectors, 1)
+
+        random_generator = np.random.RandomState(self.random_state)
+        self.hyperplanes = (random_generator
+                            .randn(self.n_tables * self.n_bits, n_dims)
+                            .astype(np.float32))
+
+        codes_dtype = np.uint32 if self.n_bits <= 32 else np.uint64
+        powers = (np.ones(1, dtype=codes_dtype)
+                  << np.arange(self.n_bits, dtype=codes_dtype))
+
+        self.codes = np.empty((self.n_tables, n_vectors), dtype=codes_dtype)
+
+        for start in range(0, n_vectors, LSH_CHUNK_SIZE):
+            chunk = _as_float32_at_least(vectors[start:start + LSH_CHUNK_SIZE])
+            centered_chunk = (chunk / np.linalg.norm(chunk, axis=1)[:, None]
+                              - self.mean)
+            bits = (centered_chunk @ self.hyperplanes.T) > 0
+            bits = bits.reshape(len(chunk), self.n_tables, self.n_bits)
+            chunk_codes = (bits * powers).sum(axis=2, dtype=codes_dtype)
+            self.codes[:, start:start + len(chunk)] = chunk_codes.T
+
+        self.fingerprint = calc_vectors_fingerprint(vectors)
+
+        return self
+
+    def iter_pairs(self, normalized_vectors, delta, max_bucket_size=None):
+        """Generate pairs of vectors within a distance, approximately.
+
+        The pairs are generated in chunks, table by table,
+        so the memory does not depend on the number of pairs.
+        The rows of a bucket are split into groups of at most
+        ``max_bucket_size`` rows, so the pairs of an oversized bucket
+        are bounded too. A pair is generated only by the first table
+        in which its vectors share a group, so it is generated once.
+
+        The vectors should be the normalized rows of the matrix
+        that the index was fitted on, or of its first rows
+        (e.g. with ``restrict_vocab``).
+
+        :param normalized_vectors: Matrix of the normalized vectors.
+        :param float delta: The maximal distance between the vectors.
+        :param int max_bucket_size: The maximal number of rows of a group.
+        :return: Generator of tuples of arrays - x indices, y indices
+                 and distances, every pair with x < y.
+        """
+
+        # pylint: disable=R0914
+
+        self._is_fitted()
+
+        if max_bucket_size is None:
+            max_bucket_size = LSH_MAX_BUCKET_SIZE
+
+        n_vectors = len(normalized_vectors)
+
+        if n_vectors > self.codes.shape[1]:
+            raise ValueError('The index was fitted on {} vectors,'
+                             ' but {} were given'
+                             .format(self.codes.shape[1], n_vectors))
+
+        compute_dtype = np.promote_types(normalized_vectors.dtype,
+                                         np.float32)
+        squared_norms = np.einsum('ij,ij->i',
+                                  normalized_vectors, normalized_vectors,
+                                  dtype=compute_dtype)
+
+        groups = np.empty((self.n_tables, n_vectors), dtype=np.int32)
+
+        for table, codes in enumerate(self.codes[:, :n_vectors]):
+            (sorted_indices,
+             positions_groups_ends,
+             groups[table]) = _group_codes(codes, max_bucket_size)
+
+            for x_indices, y_indices in _iter_group_pairs(
+                    sorted_indices, positions_groups_ends):
+                # the pairs that share a group in a former table
+                # were already generated by it
+                is_new = ~(groups[:table, x_indices]
+                           == groups[:table, y_indices]).any(axis=0)
+                x_indices, y_indices = x_indices[is_new], y_indices[is_new]
+
+                distances = _calc_distances(normalized_vectors, squared_norms,
+                                            x_indices, y_indices)
+                mask = (distances < delta) & (distances != 0)
+
+                x_indices, y_indices = x_indices[mask], y_indices[mask]
+                yield (np.minimum(x_indices, y_indices).astype(np.int64),
+                       np.maximum(x_indices, y_indices).astype(np.int64),
+                       distances[mask])
+
+    def find_pairs(self, normalized_vectors, delta, max_bucket_size=None):
+        """Find pairs of vectors within a distance, approximately.
+
+        All the pairs are returned at once,
+        see :meth:`iter_pairs` for the parameters.
+
+        :return: Tuple of arrays - x indices, y indices and distances,
+                 each pair once with x < y.
+        """
+
+        pairs = [(np.empty(0, dtype=np.int64),
+                  np.empty(0, dtype=np.int64),
+                  np.empty(0))]
+        pairs.extend(self.iter_pairs(normalized_vectors, delta,
+                                     max_bucket_size))
+
+        x_indices, y_indices, distances = (np.concatenate(arrays)
+                                           for arrays in zip(*pairs))
+
+        return x_indices, y_indices, distances
+
+    def calc_recall(self, normalized_vectors, delta, block_size=1000):
+        """Calculate the recall of the index against the exact pairs search.
+
+        The exact pairs are found with the brute-force distance matrix,
+        calculated in blocks of rows.
+
+        :param normalized_vectors: Matrix of the normalized vectors.
+        :param float delta: The maximal distance between the vectors.
+        :param int block_size: The number of rows of the distance matrix
+                               to calculate at once.
+        :return: The ratio of the exact pairs found by the index.
+        """
+
+        n_vectors = len(normalized_vectors)
+        compute_dtype = np.promote_types(normalized_vectors.dtype, np.float32)
+
+        x_indices, y_indices, _ = self.find_pairs(normalized_vectors, delta)
+        found_pairs_keys = x_indices * n_vectors + y_indices
+
+        n_exact_pairs = 0
+        n_found_exact_pairs = 0
+
+        for block_start in range(0, n_vectors, block_size):
+            block_vectors = normalized_vectors[block_start:
+                                               block_start + block_size]
+
+            pairs_distances = calc_euclidean_distances(block_vectors,
+                                                       normalized_vectors,
+                                                       compute_dtype)
+
+            x_indices, y_indices = np.nonzero((pairs_distances < delta)
+                                              & (pairs_distances != 0))
+            x_indices += block_start
+
+            is_upper = x_indices < y_indices
+            exact_pairs_keys = (x_indices[is_upper].astype(np.int64)
+                                * n_vectors
+                                + y_indices[is_upper])
+
+            n_exact_pairs += len(exact_pairs_keys)
+            n_found_exact_pairs += np.isin(exact_pairs_keys,
+                                           found_pairs_keys,
+                                           assume_unique=True).sum()
+
+        if not n_exact_pairs:
+            return 1.
+
+        return n_found_exact_pairs / n_exact_pairs
+
+    def save(self, path):
+        """Save the index to a ``.npz`` file."""
+        self._is_fitted()
+        np.savez(_get_npz_path(path),
+                 n_tables=self.n_tables,
+                 n_bits=self.n_bits,
+                 random_state=self.random_state,
+                 mean=self.mean,
+                 hyperplanes=self.hyperplanes,
+                 codes=self.codes,
+                 fingerprint=self.fingerprint or '')
+
+    @classmethod
+    def load(cls, path):
+        """Load an index from a ``.npz`` file."""
+        with np.load(_get_npz_path(path)) as data:
+            index = cls(int(data['n_tables']), int(data['n_bits']),
+                        int(data['random_state']))
+            index.mean = data['mean']
+            index.hyperplanes = data['hyperplanes']
+            index.codes = data['codes']
+            if 'fingerprint' in data:
+                index.fingerprint = str(data['fingerprint']) or None
+        return index
+
+    @classmethod
+    def load_or_fit(cls, path, vectors, **kwargs):
+        """Load an index from a file, or fit it and save it there.
+
+        The index is saved with the fingerprint of the vectors,
+        and a saved index is loaded only if it was fitted
+        on the same vectors. Otherwise, e.g., if the model
+        was modified, the index is fitted again.
+
+        :param str path: The path of the index ``.npz`` file,
+                         usually next to the model file.
+        :param vectors: Matrix of the vectors, e.g. ``model.vectors``
+        :return: The index
+        """
+
+        fingerprint = calc_vectors_fingerprint(vectors)
+
+        if os.path.exists(_get_npz_path(path)):
+            index = cls.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+
+        index = cls(**kwargs).fit(vectors)
+        index.save(path)
+        return index
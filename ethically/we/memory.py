@@ -0,0 +1,289 @@
+"""
+Peak memory profiling of words embedding bias operations.
+
+Memory, rather than time, limits the size of the models that can be
+audited and debiased: the distance matrix of ``generate_analogies``,
+copies of the model in ``debias(inplace=False)`` and the training data
+of ``learn_full_specific_words`` may all be in the order of the model.
+
+``MemoryProfiler`` is a context manager that records, for every call
+of a public method of ``BiasWordsEmbedding`` (and its subclasses)
+within it, the peak of the allocations that are traced by ``tracemalloc``
+(NumPy reports its arrays to ``tracemalloc``) and the peak resident set
+size of the process, taken from ``VmHWM`` in ``/proc/self/status``
+on Linux, both above their values at the start of the call.
+The peaks are also reported per word of the vocabulary,
+to estimate the memory of the same operation on a larger model::
+
+    with MemoryProfiler() as profiler:
+        gender_bias_we.debias(inplace=False)
+        gender_bias_we.learn_full_specific_words()
+
+    print(profiler.report())
+
+Only the outermost public method is recorded,
+the methods that it calls are part of its record.
+The profiler patches the classes, so it is not thread-safe.
+
+The peak RSS of the process can be reset only by writing
+to ``/proc/self/clear_refs``, which also clears the referenced bits
+of the pages of the whole process, so it is done only with
+``reset_peak_rss=True``. Otherwise, the peak RSS of a call is known
+only if it is higher than the former peak of the process.
+"""
+
+import functools
+import inspect
+import re
+import time
+import tracemalloc
+
+import pandas as pd
+
+
+PROC_STATUS_PATH = '/proc/self/status'
+PROC_CLEAR_REFS_PATH = '/proc/self/clear_refs'
+# writing 5 to clear_refs resets the peak RSS (VmHWM) of the process
+CLEAR_REFS_RESET_PEAK_RSS = '5'
+
+MEMORY_RECORD_FIELDS = ['method', 'n_words', 'seconds',
+                        'peak_traced_bytes', 'peak_rss_bytes',
+                        'traced_bytes_per_word', 'rss_bytes_per_word']
+
+
+def _read_proc_status(field):
+    """Read a memory field of ``/proc/self/status`` in bytes."""
+    try:
+        with open(PROC_STATUS_PATH) as status_file:
+            status = status_file.read()
+    except OSError:
+        return None
+
+    match = re.search(r'^{}:\s+(\d+) kB'.format(field), status, re.MULTILINE)
+    if match is None:
+        return None
+    return int(match.group(1)) * 1024
+
+
+def _reset_peak_rss():
+    """Reset the peak RSS of the process, if the OS supports it."""
+    try:
+        with open(PROC_CLEAR_REFS_PATH, 'w') as clear_refs_file:
+            clear_refs_file.write(CLEAR_REFS_RESET_PEAK_RSS)
+    except OSError:
+        return False
+    return True
+
+
+_active_measurements = []
+
+
+class MemoryMeasurement:
+    """Measure the peak memory of a block of code.
+
+    The traced peak is the peak of the ``tracemalloc`` traced memory
+    above the traced memory at the start. Before Python 3.9,
+    the peak cannot be reset, so it is the peak since the tracing
+    started, which is an upper bound. The RSS peak is the peak
+    resident set size of the process during the block above
+    the resident set size at the start, or ``None``
+    if it cannot be measured.
+
+    Measurements can be nested, the peaks of the inner ones
+    are taken into account in the outer ones.
+
+    :param bool reset_peak_rss: Whether to reset the peak RSS
+                                of the process at the start
+                                (see :mod:`ethically.we.memory`)
+    """
+
+    def __init__(self, reset_peak_rss=False):
+        self.reset_peak_rss = reset_peak_rss
+
+        self.seconds = None
+        self.peak_traced_bytes = None
+        self.peak_rss_bytes = None
+
+        self._started_tracing = False
+        self._start_traced = None
+        self._start_time = None
+        self._is_rss_reset = None
+        self._start_rss = None
+        self._start_peak_rss = None
+        self._inner_peak_traced = 0
+        self._inner_peak_rss = 0
+
+    def _update_inner_peaks(self, peak_traced, peak_rss):
+        self._inner_peak_traced = max(self._inner_peak_traced, peak_traced)
+        if peak_rss is not None:
+            self._inner_peak_rss = max(self._inner_peak_rss, peak_rss)
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        # the peaks are reset below, so the outer measurement
+        # keeps the peaks up to now
+        if _active_measurements:
+            _active_measurements[-1]._update_inner_peaks(
+                tracemalloc.get_traced_memory()[1],
+                _read_proc_status('VmHWM'))
+
+        _active_measurements.append(self)
+
+        # resetting the peak keeps the traces of the allocations
+        # that were done before, unlike restarting the tracing
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self._start_traced, _ = tracemalloc.get_traced_memory()
+
+        self._is_rss_reset = self.reset_peak_rss and _reset_peak_rss()
+        self._start_rss = _read_proc_status('VmRSS')
+        self._start_peak_rss = _read_proc_status('VmHWM')
+
+        self._start_time = time.perf_counter()
+
+    def stop(self):
+        self.seconds = time.perf_counter() - self._start_time
+
+        _, peak_traced = tracemalloc.get_traced_memory()
+        peak_traced = max(peak_traced, self._inner_peak_traced)
+        self.peak_traced_bytes = max(peak_traced - self._start_traced, 0)
+
+        peak_rss = _read_proc_status('VmHWM')
+        if peak_rss is not None and self._start_rss is not None:
+            peak_rss = max(peak_rss, self._inner_peak_rss)
+            # without a reset, the peak is known only if it is a new one
+            if self._is_rss_reset or peak_rss > self._start_peak_rss:
+                self.peak_rss_bytes = max(peak_rss - self._start_rss, 0)
+
+        _active_measurements.remove(self)
+        if _active_measurements:
+            _active_measurements[-1]._update_inner_peaks(peak_traced,
+                                                         peak_rss)
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def _iter_subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _iter_subclasses(subclass)
+
+
+class MemoryProfiler:
+    """Record the peak memory of the public methods of words embedding bias.
+
+    :param classes: The classes whose public methods are recorded,
+                    by default ``BiasWordsEmbedding`` and its subclasses.
+    :type classes: list or None
+    :param bool reset_peak_rss: Whether to reset the peak RSS
+                                of the process at the start of every call
+                                (see :mod:`ethically.we.memory`)
+    """
+
+    def __init__(self, classes=None, reset_peak_rss=False):
+        if classes is None:
+            from .core import BiasWordsEmbedding
+            classes = list(_iter_subclasses(BiasWordsEmbedding))
+
+        self.classes = classes
+        self.reset_peak_rss = reset_peak_rss
+        self.records = []
+        self.measurement = MemoryMeasurement(reset_peak_rss)
+
+        self._originals = []
+        self._depth = 0
+
+    def _wrap(self, name, method):
+        @functools.wraps(method)
+        def wrapper(instance, *args, **kwargs):
+            if self._depth:
+                return method(instance, *args, **kwargs)
+
+            self._depth += 1
+            measurement = MemoryMeasurement(self.reset_peak_rss)
+            try:
+                with measurement:
+                    return method(instance, *args, **kwargs)
+            finally:
+                self._depth -= 1
+                self._record(name, instance, measurement)
+
+        return wrapper
+
+    def _record(self, name, instance, measurement):
+        n_words = len(instance.model.index2word)
+
+        def per_word(n_bytes):
+            if n_bytes is None or not n_words:
+                return None
+            return n_bytes / n_words
+
+        record = {'method': name,
+                  'n_words': n_words,
+                  'seconds': measurement.seconds,
+                  'peak_traced_bytes': measurement.peak_traced_bytes,
+                  'peak_rss_bytes': measurement.peak_rss_bytes,
+                  'traced_bytes_per_word': per_word(measurement
+                                                    .peak_traced_bytes),
+                  'rss_bytes_per_word': per_word(measurement
+                                                 .peak_rss_bytes)}
+
+        self.records.append(record)
+
+    def __enter__(self):
+        for cls in self.classes:
+            for name, attribute in list(vars(cls).items()):
+                if name.startswith('_') or not inspect.isfunction(attribute):
+                    continue
+
+                self._originals.append((cls, name, attribute))
+                setattr(cls, name,
+                        self._wrap('{}.{}'.format(cls.__name__, name),
+                                   attribute))
+
+        self.measurement.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.measurement.stop()
+
+        for cls, name, attribute in reversed(self._originals):
+            setattr(cls, name, attribute)
+        self._originals = []
+
+    def report(self):
+        """Report the records of the method calls.
+
+        :return: DataFrame of the method, the size of the vocabulary,
+                 the time, the peak traced and RSS bytes
+                 and the peaks per word of every recorded call.
+        """
+        return pd.DataFrame(self.records,
+                            columns=MEMORY_RECORD_FIELDS)
+
+    @staticmethod
+    def estimate_bytes(records, n_words):
+        """Estimate the peak bytes of the calls on a larger vocabulary.
+
+        The estimation is linear in the size of the vocabulary,
+        so it does not fit operations whose memory is bounded otherwise,
+        e.g., ``generate_analogies`` by ``restrict_vocab``.
+
+        :param records: DataFrame of :meth:`report`
+        :param int n_words: The size of the vocabulary
+        :return: Series of the estimated peak traced bytes
+        """
+        return (records.set_index('method')['traced_bytes_per_word']
+                * n_words)
@@ -0,0 +1,228 @@
+"""
+Audit several bias directions of the same words embedding together.
+
+Every instance of ``BiasWordsEmbedding`` holds a single direction,
+so auditing, e.g., gender, race and age on the same model scans
+the vocabulary once per direction. ``MultiBiasWordsEmbedding``
+stacks the directions into a matrix, and calculates the projections
+on all of them with a single matrix product per chunk of the vocabulary::
+
+    multi_bias_we = MultiBiasWordsEmbedding.from_bias_words_embeddings(
+        {'gender': gender_bias_we, 'race': race_bias_we})
+
+    projections, direct_biases = multi_bias_we.audit(neutral_words)
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .utils import (
+    VECTORS_CHUNK_SIZE, check_keyed_vectors, get_model_vectors,
+    get_words_indices, normalize_rows,
+)
+
+
+class MultiBiasWordsEmbedding:
+    """Audit several bias directions of a words embedding in one pass.
+
+    :param model: Words embedding model of ``gensim.model.KeyedVectors``
+    :param directions: The directions by their names
+    :type directions: dict or OrderedDict
+    :param int chunk_size: The number of vectors in a chunk
+                           of the matrix product
+    """
+
+    def __init__(self, model, directions, chunk_size=VECTORS_CHUNK_SIZE):
+        check_keyed_vectors(model)
+
+        if not directions:
+            raise ValueError('directions should not be empty')
+
+        directions = OrderedDict(directions)
+
+        self.model = model
+        self.names = list(directions)
+        self.chunk_size = chunk_size
+
+        # shape: (number of directions, dimension)
+        self.directions = normalize_rows(np.array([np.asarray(direction,
+                                                              dtype=float)
+                                                   for direction
+                                                   in directions.values()]))
+
+        if self.directions.shape[1] != model.vector_size:
+            raise ValueError('The dimension of the directions should be {},'
+                             ' {} was given'
+                             .format(model.vector_size,
+                                     self.directions.shape[1]))
+
+    @classmethod
+    def from_bias_words_embeddings(cls, bias_words_embeddings,
+                                   chunk_size=VECTORS_CHUNK_SIZE):
+        """Stack the directions of several words embedding bias instances.
+
+        :param bias_words_embeddings: Instances of ``BiasWordsEmbedding``
+                                      with identified directions
+                                      by their names, which should share
+                                      the same model
+        :type bias_words_embeddings: dict or OrderedDict
+        :param int chunk_size: The number of vectors in a chunk
+                               of the matrix product
+        :return: MultiBiasWordsEmbedding
+        """
+
+        bias_words_embeddings = OrderedDict(bias_words_embeddings)
+
+        models = {id(bias_words_embedding.model)
+                  for bias_words_embedding in bias_words_embeddings.values()}
+        if len(models) > 1:
+            raise ValueError('All the words embedding bias instances'
+                             ' should share the same model')
+
+        directions = OrderedDict()
+        for name, bias_words_embedding in bias_words_embeddings.items():
+            bias_words_embedding._is_direction_identified()  # pylint: disable=W0212
+            directions[name] = bias_words_embedding.direction
+
+        model = next(iter(bias_words_embeddings.values())).model
+
+        return cls(model, directions, chunk_size)
+
+    def _get_vectors(self, indices):
+        vectors = get_model_vectors(self.model, indices)
+        return vectors.astype(np.promote_types(vectors.dtype, np.float32),
+                              copy=False)
+
+    def _calc_projections(self, indices=None):
+        """Project the normalized vectors of rows on all the directions.
+
+        :param indices: Array of indices of the rows,
+                        or None for all the vocabulary
+        :return: Array of the projections,
+                 (number of rows, number of directions)
+        """
+
+        if indices is None:
+            n_rows = len(self.model.index2word)
+        else:
+            n_rows = len(indices)
+
+        projections = np.empty((n_rows, len(self.names)))
+
+        for start in range(0, n_rows, self.chunk_size):
+            if indices is None:
+                chunk = slice(start, start + self.chunk_size)
+            else:
+                chunk = indices[start:start + self.chunk_size]
+
+            vectors = normalize_rows(self._get_vectors(chunk))
+            projections[start:start + len(vectors)] = (vectors
+                                                       @ self.directions.T)
+
+        return projections
+
+    def project_words_on_directions(self, words=None, tidy=False):
+        """Project the normalized vectors of words on all the directions.
+
+        :param list words: The words to project,
+                           or None for all the vocabulary
+        :param bool tidy: Whether to return the projections in long format,
+                          with a row per word and direction
+        :return: DataFrame of the projections,
+                 with a row per word and a column per direction,
+                 or with the columns ``word``, ``direction``
+                 and ``projection`` if ``tidy``
+        """
+
+        if words is None:
+            words = self.model.index2word
+            projections = self._calc_projections()
+        else:
+            indices = get_words_indices(self.model, words)
+            projections = self._calc_projections(indices)
+
+        projections_df = pd.DataFrame(projections,
+                                      index=pd.Index(words, name='word'),
+                                      columns=pd.Index(self.names,
+                                                       name='direction'))
+
+        if tidy:
+            projections_df = (projections_df.stack()
+                              .rename('projection')
+                              .reset_index())
+
+        return projections_df
+
+    @staticmethod
+    def _calc_direct_biases(projections, c=None):
+        if c is None:
+            c = 1
+
+        return (np.abs(projections) ** c).mean(axis=0)
+
+    def calc_direct_biases(self, neutral_words, c=None):
+        """Calculate the direct bias of all the directions.
+
+        :param list neutral_words: List of neutral words
+        :param c: Strictness of bias measuring
+        :type c: float or None
+        :return: Series of the direct biases by the directions
+        """
+
+        projections = self.project_words_on_directions(neutral_words)
+        return self._calc_direct_biases(projections, c)
+
+    def audit(self, neutral_words, words=None, c=None):
+        """Project words on all the directions and calculate direct biases.
+
+        All the words and the neutral words are projected
+        with one pass over their vectors.
+
+        :param list neutral_words: List of neutral words
+        :param list words: The words to project,
+                           or None for all the vocabulary
+        :param c: Strictness of bias measuring
+        :type c: float or None
+        :return: Tuple of DataFrame of the projections,
+                 with a row per word and a column per direction,
+                 and Series of the direct biases by the directions
+        """
+
+        if words is None:
+            indices = np.arange(len(self.model.index2word))
+            words = self.model.index2word
+        else:
+            indices = get_words_indices(self.model, words)
+
+        neutral_indices = get_words_indices(self.model, neutral_words)
+
+        # the neutral words that are not among the words
+        # are projected in the same pass
+        extra_neutral_indices = np.setdiff1d(neutral_indices, indices)
+        all_indices = np.r_[indices, extra_neutral_indices]
+
+        if (len(extra_neutral_indices) == 0  # pylint: disable=len-as-condition
+                and len(indices) == len(self.model.index2word)
+                and (indices == np.arange(len(indices))).all()):
+            all_projections = self._calc_projections()
+        else:
+            all_projections = self._calc_projections(all_indices)
+
+        columns = pd.Index(self.names, name='direction')
+
+        projections = pd.DataFrame(all_projections[:len(indices)],
+                                   index=pd.Index(words, name='word'),
+                                   columns=columns)
+
+        # the position of every row among all the projected rows
+        rows_positions = np.empty(len(self.model.index2word), dtype=np.int64)
+        rows_positions[all_indices] = np.arange(len(all_indices))
+
+        neutral_projections = all_projections[rows_positions[neutral_indices]]
+        direct_biases = pd.Series(self._calc_direct_biases(neutral_projections,
+                                                           c),
+                                  index=columns)
+
+        return projections, direct_biases
@@ -0,0 +1,323 @@
+"""
+Copy-on-write words embedding on top of a shared base model.
+
+Debiasing a words embedding, not inplace, used to copy
+the whole model. Instead, ``OverlayKeyedVectors`` keeps a reference
+to the base model, and stores only what was changed on top of it:
+
+1. Rejections of directions from a subset of the rows (neutralize),
+   as a direction and a boolean mask over the rows.
+2. Norms of the rows, after they were normalized.
+3. Rows that were set explicitly (equalize).
+
+The vector of a word is calculated from the base model when it is needed,
+in float32 at least, and returned in the dtype of the base model,
+so each variant of a model takes about one float and one boolean
+per word, and the rows that were set explicitly.
+
+When the rows of the base model are modified inplace
+by ``BiasWordsEmbedding`` (e.g., debiasing the base inplace),
+they are copied into the overlays that share it first,
+so the overlays keep the rows as they were (copy-on-write).
+Modifying ``base.vectors`` directly changes its overlays too.
+"""
+
+import copy
+import weakref
+
+import numpy as np
+from gensim.models.keyedvectors import KeyedVectors
+
+from .utils import VECTORS_CHUNK_SIZE, cast_model_vectors, reject_rows
+
+
+# the overlays that share a base model, by the base model
+_BASE_OVERLAYS = weakref.WeakKeyDictionary()
+
+
+def _find_rows(rows_indices, indices):
+    """Find indices in a sorted array of indices of rows."""
+    positions = np.searchsorted(rows_indices, indices)
+    positions = np.minimum(positions, len(rows_indices) - 1)
+
+    if not len(rows_indices):  # pylint: disable=len-as-condition
+        return positions, np.zeros(np.shape(indices), dtype=bool)
+
+    return positions, rows_indices[positions] == indices
+
+
+def preserve_base_rows(base, indices):
+    """Copy rows of a base model into the overlays that share it.
+
+    It should be called before the rows of the base are modified inplace,
+    so its overlays keep the rows as they were.
+
+    :param base: Words embedding model of ``gensim.model.KeyedVectors``
+    :param indices: Array of indices of the rows, or a slice
+    """
+
+    # pylint: disable=W0212
+
+    for overlay in list(_BASE_OVERLAYS.get(base, ())):
+        overlay._preserve_base_rows(indices)
+
+
+class OverlayKeyedVectors(KeyedVectors):
+    """Copy-on-write ``KeyedVectors`` on top of a base model.
+
+    Lookups, ``cosine_similarities`` and ``similarity`` work
+    as in the base class, row by row. ``vectors`` keeps
+    the materialized read-only matrix, and ``init_sims``
+    keeps the materialized normalized matrix in ``vectors_norm``
+    (e.g. for ``most_similar``), until the overlay is modified
+    or ``release_sims`` is called.
+
+    :param base: Words embedding model of ``gensim.model.KeyedVectors``,
+                 whose rows are copied into the overlay before
+                 they are modified inplace (see :func:`preserve_base_rows`).
+    """
+
+    # pylint: disable=W0231
+
+    def __init__(self, base):
+        if isinstance(base, OverlayKeyedVectors):
+            raise TypeError('base should not be an OverlayKeyedVectors,'
+                            ' use copy.deepcopy to copy an overlay')
+
+        self.base = base
+
+        self.vocab = base.vocab
+        self.index2word = base.index2word
+        self.vector_size = base.vector_size
+        self.vectors_norm = None
+
+        _BASE_OVERLAYS.setdefault(base, weakref.WeakSet()).add(self)
+
+        self._vectors = None
+        self._base_indices = np.empty(0, dtype=np.int64)
+        self._base_vectors = np.empty((0, base.vector_size),
+                                      dtype=base.vectors.dtype)
+        self._rejections = []
+        self._norms = None
+        self._changed_indices = np.empty(0, dtype=np.int64)
+        self._changed_vectors = np.empty((0, base.vector_size),
+                                         dtype=base.vectors.dtype)
+
+    def __deepcopy__(self, memo):
+        overlay = self.__class__(self.base)
+        overlay._base_indices = self._base_indices.copy()
+        overlay._base_vectors = self._base_vectors.copy()
+        overlay._rejections = copy.deepcopy(self._rejections, memo)
+        overlay._norms = copy.deepcopy(self._norms, memo)
+        overlay._changed_indices = self._changed_indices.copy()
+        overlay._changed_vectors = self._changed_vectors.copy()
+        return overlay
+
+    def __len__(self):
+        return len(self.base.vectors)
+
+    @property
+    def dtype(self):
+        """The dtype of the vectors, as the base model."""
+        return self.base.vectors.dtype
+
+    @property
+    def _compute_dtype(self):
+        return np.promote_types(self.dtype, np.float32)
+
+    def astype(self, dtype):
+        """Copy the overlay on top of a copy of the base cast to dtype.
+
+        :param dtype: The dtype of the vectors of the copy.
+        :return: A new ``OverlayKeyedVectors``,
+                 or the overlay itself if it is already of dtype.
+        """
+
+        dtype = np.dtype(dtype)
+        if dtype == self.dtype:
+            return self
+
+        overlay = self.__class__(cast_model_vectors(self.base, dtype))
+        overlay._base_indices = self._base_indices.copy()
+        overlay._base_vectors = self._base_vectors.astype(dtype)
+        overlay._rejections = copy.deepcopy(self._rejections)
+        overlay._norms = copy.deepcopy(self._norms)
+        overlay._changed_indices = self._changed_indices.copy()
+        overlay._changed_vectors = self._changed_vectors.astype(dtype)
+        return overlay
+
+    @property
+    def vectors(self):
+        """The materialized read-only matrix of the vectors."""
+        if self._vectors is None:
+            self._vectors = self.get_vectors(slice(None))
+            self._vectors.flags.writeable = False
+        return self._vectors
+
+    @property
+    def nbytes(self):
+        """The number of bytes that the overlay stores on top of the base."""
+        return (self._base_indices.nbytes
+                + self._base_vectors.nbytes
+                + sum(direction.nbytes + mask.nbytes
+                      for direction, mask in self._rejections)
+                + (self._norms.nbytes if self._norms is not None else 0)
+                + self._changed_indices.nbytes
+                + self._changed_vectors.nbytes)
+
+    def _find_changed(self, indices):
+        return _find_rows(self._changed_indices, indices)
+
+    def _preserve_base_rows(self, indices):
+        if isinstance(indices, slice):
+            indices = np.arange(len(self))[indices]
+
+        indices = np.unique(indices)
+        _, is_preserved = _find_rows(self._base_indices, indices)
+        new_indices = indices[~is_preserved]
+
+        if not len(new_indices):  # pylint: disable=len-as-condition
+            return
+
+        base_indices = np.r_[self._base_indices, new_indices]
+        base_vectors = np.r_[self._base_vectors,
+                             self.base.vectors[new_indices]]
+
+        order = np.argsort(base_indices)
+        self._base_indices = base_indices[order]
+        self._base_vectors = base_vectors[order]
+
+    def get_vectors(self, indices):
+        """Calculate the vectors of rows.
+
+        :param indices: Array of indices of the rows, or a slice.
+        :return: A new array of the vectors, in the dtype of the base.
+        """
+
+        return self._calc_vectors(indices).astype(self.dtype, copy=False)
+
+    def _calc_vectors(self, indices):
+        if isinstance(indices, slice):
+            indices = np.arange(len(self))[indices]
+        else:
+            indices = np.asarray(indices)
+
+        vectors = np.array(self.base.vectors[indices],
+                           dtype=self._compute_dtype)
+
+        positions, is_preserved = _find_rows(self._base_indices, indices)
+        vectors[is_preserved] = self._base_vectors[positions[is_preserved]]
+
+        for direction, mask in self._rejections:
+            rows_mask = mask[indices]
+            if rows_mask.any():
+                vectors[rows_mask] = reject_rows(vectors[rows_mask],
+                                                 direction)
+
+        if self._norms is not None:
+            vectors /= self._norms[indices][..., None]
+
+        positions, is_changed = self._find_changed(indices)
+        vectors[is_changed] = self._changed_vectors[positions[is_changed]]
+
+        return vectors
+
+    def set_vectors(self, indices, vectors):
+        """Set the vectors of rows.
+
+        :param indices: Indices of the rows.
+        :param vectors: The new vectors of the rows.
+        """
+
+        indices = np.asarray(indices)
+        vectors = np.asarray(vectors, dtype=self._changed_vectors.dtype)
+
+        positions, is_changed = self._find_changed(indices)
+        self._changed_vectors[positions[is_changed]] = vectors[is_changed]
+
+        new_indices, new_positions = np.unique(indices[~is_changed],
+                                               return_index=True)
+        changed_indices = np.r_[self._changed_indices, new_indices]
+        changed_vectors = np.r_[self._changed_vectors,
+                                vectors[~is_changed][new_positions]]
+
+        order = np.argsort(changed_indices)
+        self._changed_indices = changed_indices[order]
+        self._changed_vectors = changed_vectors[order]
+
+        self.release_sims()
+
+    def reject_vectors(self, indices, direction):
+        """Reject a direction from the vectors of rows.
+
+        :param indices: Indices of the rows.
+        :param direction: Unit vector of the direction.
+        """
+
+        mask = np.zeros(len(self), dtype=bool)
+        mask[indices] = True
+
+        # rows that were set explicitly are changed directly
+        positions, is_changed = self._find_changed(np.arange(len(self))[mask])
+        changed_positions = positions[is_changed]
+        changed_vectors = self._changed_vectors[changed_positions]
+        self._changed_vectors[changed_positions] = reject_rows(
+            changed_vectors.astype(self._compute_dtype, copy=False), direction)
+
+        self._rejections.append((np.array(direction), mask))
+
+        self.release_sims()
+
+    def normalize_vectors(self):
+        """Normalize all the vectors, as ``init_sims(replace=True)``."""
+
+        norms = np.empty(len(self), dtype=self._compute_dtype)
+
+        for start in range(0, len(self), VECTORS_CHUNK_SIZE):
+            chunk = self._calc_vectors(slice(start,
+                                             start + VECTORS_CHUNK_SIZE))
+            norms[start:start + len(chunk)] = np.sqrt((chunk ** 2).sum(-1))
+
+        if self._norms is None:
+            self._norms = norms
+        else:
+            self._norms *= norms
+
+        self._changed_vectors /= norms[self._changed_indices][:, None]
+
+        self.release_sims()
+
+    def word_vec(self, word, use_norm=False):
+        if word not in self.vocab:
+            raise KeyError("word '%s' not in vocabulary" % word)
+
+        vector = self.get_vectors([self.vocab[word].index])[0]
+
+        if use_norm:
+            vector /= np.sqrt((vector ** 2).sum(-1))
+
+        vector.setflags(write=False)
+        return vector
+
+    def init_sims(self, replace=False):
+        if replace:
+            self.normalize_vectors()
+
+        elif self.vectors_norm is None:
+            self.vectors_norm = self.get_vectors(slice(None))
+            for start in range(0, len(self), VECTORS_CHUNK_SIZE):
+                chunk = self.vectors_norm[start:start + VECTORS_CHUNK_SIZE]
+                chunk /= np.sqrt((chunk ** 2).sum(-1))[:, None]
+
+    def release_sims(self):
+        """Release the materialized ``vectors`` and ``vectors_norm``."""
+        self._vectors = None
+        self.vectors_norm = None
+
+    def materialize(self):
+        """Materialize the overlay into a new independent ``KeyedVectors``."""
+        model = KeyedVectors(self.vector_size)
+        model.vocab = copy.deepcopy(self.vocab)
+        model.index2word = list(self.index2word)
+        model.vectors = self.get_vectors(slice(None))
+        return model
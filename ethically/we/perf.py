@@ -0,0 +1,424 @@
+r"""
+Performance benchmarks of the hot paths on synthetic words embedding.
+
+Real models cannot be downloaded in CI, so the benchmarks run on
+seeded synthetic ``KeyedVectors`` of a configurable vocabulary size
+and dimension. The vocabulary contains the words of the Bolukbasi
+data and of the benchmark datasets, and the rest are filler words.
+A gender direction is planted in the definitional pairs,
+so the direction is identified as in a real model.
+
+The results are saved as JSON, and they can be compared against
+a saved baseline, so regressions are visible. Operations that take
+less than ``PERF_MIN_SECONDS`` are called repeatedly, and their mean time
+is reported, so the timing of fast operations is not dominated by noise::
+
+    python -m ethically.we.perf --n-words 10000 100000 \
+        --output perf.json --baseline baseline.json
+
+With ``--memory``, the peak memory of every operation is recorded too
+(see :mod:`ethically.we.memory`), and it can be compared
+against the baseline with ``--metric peak_traced_bytes``.
+
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from ..consts import RANDOM_STATE
+from .memory import MemoryMeasurement
+from .utils import VECTORS_CHUNK_SIZE
+
+
+PERF_N_WORDS = [10000, 100000]
+PERF_DIMENSION = 300
+PERF_DIRECTION_STRENGTH = 3.
+PERF_BIAS_SCALE = 0.3
+PERF_REPEAT = 1
+PERF_MIN_SECONDS = 0.05
+PERF_REGRESSION_TOLERANCE = 1.25
+PERF_METRICS = ['seconds', 'peak_traced_bytes', 'peak_rss_bytes']
+
+
+def _generate_synthetic_words(n_words):
+    from .benchmark import (
+        ANALOGIES_TASKS, WORD_PAIRS_TASKS, get_data_resource_path,
+        load_word_analogies, load_word_pairs,
+    )
+    from .data import BOLUKBASI_DATA
+
+    gender_data = BOLUKBASI_DATA['gender']
+
+    words = OrderedDict()
+
+    for pair in (gender_data['definitional_pairs']
+                 + gender_data['equalize_pairs']):
+        words.update((word, None) for word in pair)
+
+    words.update((word, None) for word in gender_data['specific_seed'])
+    words.update((word, None) for word in gender_data['specific_full'])
+    words.update((profession[0], None)
+                 for profession in gender_data['professions'])
+
+    datasets = ([load_word_pairs(get_data_resource_path(filename))
+                 for filename in WORD_PAIRS_TASKS.values()]
+                + [load_word_analogies(get_data_resource_path(filename))
+                   for filename in ANALOGIES_TASKS.values()])
+
+    for dataset in datasets:
+        words.update((word.lower(), None)
+                     for word in dataset['words'].tolist())
+
+    # the words of the datasets might be phrases, but the words
+    # of a word2vec file cannot contain whitespaces
+    words = OrderedDict(('_'.join(word.split()), None)
+                        for word in words if word.split())
+
+    words = list(words)[:n_words]
+    words.extend('word{}'.format(index)
+                 for index in range(n_words - len(words)))
+
+    return words
+
+
+def generate_synthetic_model(n_words, dimension=PERF_DIMENSION,
+                             random_state=RANDOM_STATE):
+    """Generate a seeded synthetic words embedding.
+
+    The vectors are normal, and the definitional pairs of
+    the Bolukbasi data differ mostly along a random gender direction.
+    The professions have a random projection on the direction,
+    so they have direct bias.
+
+    :param int n_words: The size of the vocabulary
+    :param int dimension: The dimension of the vectors
+    :param int random_state: The seed of the generation
+    :return: Words embedding model of ``gensim.model.KeyedVectors``
+             with float32 vectors and only lower case words
+    """
+
+    from gensim.models.keyedvectors import KeyedVectors, Vocab
+
+    from .data import BOLUKBASI_DATA
+
+    rng = np.random.RandomState(random_state)
+
+    words = _generate_synthetic_words(n_words)
+
+    vectors = np.empty((n_words, dimension), dtype=np.float32)
+    for start in range(0, n_words, VECTORS_CHUNK_SIZE):
+        chunk = vectors[start:start + VECTORS_CHUNK_SIZE]
+        chunk[:] = rng.randn(*chunk.shape)
+
+    direction = rng.randn(dimension)
+    direction /= np.linalg.norm(direction)
+
+    index = {word: row for row, word in enumerate(words)}
+    gender_data = BOLUKBASI_DATA['gender']
+
+    for female, male in gender_data['definitional_pairs']:
+        if female in index and male in index:
+            base = rng.randn(dimension)
+            vectors[index[female]] = base + PERF_DIRECTION_STRENGTH * direction
+            vectors[index[male]] = base - PERF_DIRECTION_STRENGTH * direction
+
+    for profession in gender_data['professions']:
+        if profession[0] in index:
+            vectors[index[profession[0]]] += (PERF_BIAS_SCALE
+                                              * rng.randn()
+                                              * direction)
+
+    model = KeyedVectors(dimension)
+    model.vectors = vectors
+    model.index2word = words
+    model.vocab = {word: Vocab(index=row, count=n_words - row)
+                   for row, word in enumerate(words)}
+
+    return model
+
+
+def _identify_direction(model):
+    from .bias import GenderBiasWE
+    return GenderBiasWE(model, only_lower=True)
+
+
+def _identify_direction_warm(model):
+    # the first identification pays for the lazy imports
+    _identify_direction(model)
+    return lambda: _identify_direction(model)
+
+
+def _calc_projection_scores(model):
+    gender_bias_we = _identify_direction(model)
+    words = model.index2word
+    return lambda: gender_bias_we._calc_projection_scores(words)  # pylint: disable=W0212
+
+
+def _calc_direct_bias(model):
+    gender_bias_we = _identify_direction(model)
+    neutral_words = gender_bias_we._data['neutral_words']  # pylint: disable=W0212
+    return lambda: gender_bias_we.calc_direct_bias(neutral_words)
+
+
+def _generate_analogies(model):
+    gender_bias_we = _identify_direction(model)
+    return gender_bias_we.generate_analogies
+
+
+def _debias_neutralize(model):
+    gender_bias_we = _identify_direction(model)
+    return lambda: gender_bias_we.debias('neutralize', inplace=False)
+
+
+def _debias_hard(model):
+    gender_bias_we = _identify_direction(model)
+    return lambda: gender_bias_we.debias('hard', inplace=False)
+
+
+def _learn_full_specific_words(model):
+    gender_bias_we = _identify_direction(model)
+    return gender_bias_we.learn_full_specific_words
+
+
+def _evaluate_word_pairs(model):
+    from .benchmark import evaluate_word_pairs
+    return lambda: evaluate_word_pairs(model)
+
+
+def _evaluate_word_analogies(model):
+    from .benchmark import evaluate_word_analogies
+    return lambda: evaluate_word_analogies(model)
+
+
+# every operation prepares a function without arguments,
+# and only the call of the function is timed
+PERF_OPERATIONS = OrderedDict([
+    ('identify_direction', _identify_direction_warm),
+    ('calc_projection_scores', _calc_projection_scores),
+    ('calc_direct_bias', _calc_direct_bias),
+    ('generate_analogies', _generate_analogies),
+    ('debias_neutralize', _debias_neutralize),
+    ('debias_hard', _debias_hard),
+    ('learn_full_specific_words', _learn_full_specific_words),
+    ('evaluate_word_pairs', _evaluate_word_pairs),
+    ('evaluate_word_analogies', _evaluate_word_analogies),
+])
+
+
+def _time_run(run):
+    """Time a run, repeated until it takes at least ``PERF_MIN_SECONDS``.
+
+    :return: The mean time of a call in seconds
+    """
+
+    n_calls = 0
+    start = time.perf_counter()
+
+    while True:
+        run()
+        n_calls += 1
+
+        seconds = time.perf_counter() - start
+        if seconds >= PERF_MIN_SECONDS:
+            return seconds / n_calls
+
+
+def _get_meta(dimension, random_state, repeat):
+    return {'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'dimension': dimension,
+            'random_state': random_state,
+            'repeat': repeat}
+
+
+def run_benchmarks(n_words_list=None, dimension=PERF_DIMENSION,
+                   operations=None, repeat=PERF_REPEAT,
+                   random_state=RANDOM_STATE, memory=False, verbose=False):
+    """Time the hot paths on synthetic words embedding.
+
+    :param list n_words_list: The vocabulary sizes
+    :param int dimension: The dimension of the vectors
+    :param list operations: Names of operations of ``PERF_OPERATIONS``,
+                            by default all of them
+    :param int repeat: The number of times to time every operation,
+                       the minimal time is reported. Without ``memory``,
+                       every time is the mean of calls that take
+                       together at least ``PERF_MIN_SECONDS``.
+    :param int random_state: The seed of the synthetic models
+    :param bool memory: Whether to record also the peak memory
+                        of every operation, the maximal peak
+                        is reported. The tracing of the allocations
+                        slows the operations down.
+    :param bool verbose: Set verbosity
+    :return: Dictionary of the results, with the ``meta`` of the run
+             and the ``results`` records of vocabulary size,
+             operation and seconds, and with ``memory``
+             also the peak traced and RSS bytes and
+             the peak traced bytes per word
+    """
+
+    if n_words_list is None:
+        n_words_list = PERF_N_WORDS
+
+    if operations is None:
+        operations = list(PERF_OPERATIONS)
+
+    for operation in operations:
+        if operation not in PERF_OPERATIONS:
+            raise ValueError('operation should be one of {}, {} was given'
+                             .format(list(PERF_OPERATIONS), operation))
+
+    results = []
+
+    for n_words in n_words_list:
+        model = generate_synthetic_model(n_words, dimension, random_state)
+
+        for operation in operations:
+            measurements = []
+
+            for _ in range(repeat):
+                run = PERF_OPERATIONS[operation](model)
+
+                if memory:
+                    with MemoryMeasurement() as measurement:
+                        run()
+                    measurements.append(measurement)
+
+                else:
+                    measurements.append(_time_run(run))
+
+            if memory:
+                result = _summarize_memory(measurements, n_words)
+            else:
+                result = {'seconds': min(measurements)}
+
+            results.append(dict(n_words=n_words, operation=operation,
+                                **result))
+
+            if verbose:
+                print('{:>10} {:<28} {:.4f}s'.format(n_words, operation,
+                                                     result['seconds'])
+                      + ('  {:>12} bytes/word'.format(
+                          round(result['traced_bytes_per_word']))
+                         if memory else ''))
+
+    return {'meta': _get_meta(dimension, random_state, repeat),
+            'results': results}
+
+
+def _summarize_memory(measurements, n_words):
+    peak_traced_bytes = max(measurement.peak_traced_bytes
+                            for measurement in measurements)
+
+    peaks_rss_bytes = [measurement.peak_rss_bytes
+                       for measurement in measurements
+                       if measurement.peak_rss_bytes is not None]
+
+    peak_rss_bytes = max(peaks_rss_bytes) if peaks_rss_bytes else None
+
+    return {'seconds': min(measurement.seconds
+                           for measurement in measurements),
+            'peak_traced_bytes': peak_traced_bytes,
+            'peak_rss_bytes': peak_rss_bytes,
+            'traced_bytes_per_word': peak_traced_bytes / n_words}
+
+
+def save_results(results, path):
+    """Save benchmark results as JSON."""
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2)
+
+
+def load_results(path):
+    """Load benchmark results from JSON."""
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def compare_results(results, baseline,
+                    tolerance=PERF_REGRESSION_TOLERANCE, metric='seconds'):
+    """Compare benchmark results against a baseline.
+
+    :param dict results: The current results of :func:`run_benchmarks`
+    :param dict baseline: The baseline results of :func:`run_benchmarks`
+    :param float tolerance: The ratio of the current value
+                            to the baseline value,
+                            above which an operation is a regression
+    :param str metric: The compared metric, ``'seconds'``,
+                       or with memory results ``'peak_traced_bytes'``
+                       or ``'peak_rss_bytes'``
+    :return: DataFrame of the baseline and the current values,
+             their ratio and whether it is a regression,
+             for the operations in both of them
+    """
+
+    if metric not in PERF_METRICS:
+        raise ValueError('metric should be one of {}, {} was given'
+                         .format(PERF_METRICS, metric))
+
+    current_df = (pd.DataFrame(results['results'])
+                  .set_index(['n_words', 'operation']))
+    baseline_df = (pd.DataFrame(baseline['results'])
+                   .set_index(['n_words', 'operation']))
+
+    df = pd.concat([baseline_df[metric].rename('baseline'),
+                    current_df[metric].rename('current')],
+                   axis=1, join='inner')
+
+    df['ratio'] = df['current'] / df['baseline']
+    df['regression'] = df['ratio'] > tolerance
+
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[1],
+                                     prog='python -m ethically.we.perf')
+    parser.add_argument('--n-words', type=int, nargs='+',
+                        default=PERF_N_WORDS)
+    parser.add_argument('--dimension', type=int, default=PERF_DIMENSION)
+    parser.add_argument('--operations', nargs='+',
+                        choices=list(PERF_OPERATIONS))
+    parser.add_argument('--repeat', type=int, default=PERF_REPEAT)
+    parser.add_argument('--random-state', type=int, default=RANDOM_STATE)
+    parser.add_argument('--output', help='Path of the JSON results')
+    parser.add_argument('--baseline', help='Path of JSON baseline results')
+    parser.add_argument('--tolerance', type=float,
+                        default=PERF_REGRESSION_TOLERANCE)
+    parser.add_argument('--memory', action='store_true',
+                        help='Record also the peak memory')
+    parser.add_argument('--metric', choices=PERF_METRICS,
+                        default='seconds')
+
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.n_words, args.dimension,
+                             args.operations, args.repeat,
+                             args.random_state, args.memory, verbose=True)
+
+    if args.output is not None:
+        save_results(results, args.output)
+
+    if args.baseline is not None:
+        comparison_df = compare_results(results,
+                                        load_results(args.baseline),
+                                        args.tolerance, args.metric)
+        print(comparison_df.round(4).to_string())
+
+        if comparison_df['regression'].any():
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""
+Out-of-core audit of words embedding files in the word2vec format.
+
+Loading a large model (e.g., the 3.6 GB GoogleNews word2vec)
+into a ``KeyedVectors`` takes all of its vectors in memory,
+before even the direction is identified. Instead, the file is read
+in chunks of rows, so the memory is bounded by the size of a chunk:
+
+1. The words that identify the direction (e.g., the definitional pairs)
+   are collected into a small ``KeyedVectors``, and the reading stops
+   as soon as all of them were found.
+2. The rest of the file is streamed, and every chunk is projected
+   on the direction, summed into the direct bias and merged
+   into the bounded sets of the most extreme words.
+
+::
+
+    audit = audit_word2vec_gender_bias('GoogleNews-vectors-negative300.bin',
+                                       binary=True)
+    print(audit['direct_bias'])
+    print(audit['extreme'])
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .utils import normalize, normalize_rows, select_top_k
+
+
+STREAMING_CHUNK_SIZE = 10000
+STREAMING_READ_SIZE = 2**20
+
+
+def _read_word2vec_header(w2v_file, encoding, unicode_errors):
+    header = w2v_file.readline().decode(encoding, unicode_errors)
+    vocab_size, vector_size = (int(value) for value in header.split())
+    return vocab_size, vector_size
+
+
+def _iter_binary_chunks(w2v_file, vocab_size, vector_size, chunk_size,
+                        encoding, unicode_errors):
+    vector_bytes = vector_size * np.dtype(np.float32).itemsize
+
+    buffer = b''
+    position = 0
+
+    for chunk_start in range(0, vocab_size, chunk_size):
+        n_rows = min(chunk_size, vocab_size - chunk_start)
+
+        words = []
+        vectors = np.empty((n_rows, vector_size), dtype=np.float32)
+
+        for row in range(n_rows):
+            while True:
+                space = buffer.find(b' ', position)
+                if space != -1 and len(buffer) >= space + 1 + vector_bytes:
+                    break
+
+                more = w2v_file.read(STREAMING_READ_SIZE)
+                if not more:
+                    raise EOFError('unexpected end of input;'
+                                   ' is count incorrect'
+                                   ' or file otherwise damaged?')
+                buffer = buffer[position:] + more
+                position = 0
+
+            # as gensim, newlines between the records are skipped
+            words.append(buffer[position:space].replace(b'\n', b'')
+                         .decode(encoding, unicode_errors))
+            vectors[row] = np.frombuffer(buffer, dtype=np.float32,
+                                         count=vector_size,
+                                         offset=space + 1)
+            position = space + 1 + vector_bytes
+
+        yield words, vectors
+
+
+def _iter_text_chunks(w2v_file, vocab_size, vector_size, chunk_size,
+                      encoding, unicode_errors):
+    for chunk_start in range(0, vocab_size, chunk_size):
+        n_rows = min(chunk_size, vocab_size - chunk_start)
+
+        words = []
+        vectors = np.empty((n_rows, vector_size), dtype=np.float32)
+
+        for row in range(n_rows):
+            line = w2v_file.readline()
+            if not line:
+                raise EOFError('unexpected end of input;'
+                               ' is count incorrect'
+                               ' or file otherwise damaged?')
+
+            parts = line.decode(encoding, unicode_errors).rstrip().split(' ')
+            if len(parts) != vector_size + 1:
+                raise ValueError('invalid vector on line {}'
+                                 ' (is this really the text format?)'
+                                 .format(chunk_start + row + 1))
+
+            words.append(parts[0])
+            vectors[row] = np.array(parts[1:], dtype=np.float32)
+
+        yield words, vectors
+
+
+def iter_word2vec_chunks(path, binary=True, chunk_size=STREAMING_CHUNK_SIZE,
+                         encoding='utf8', unicode_errors='strict',
+                         limit=None):
+    """Read a words embedding file in the word2vec format in chunks of rows.
+
+    :param str path: Path of the file
+    :param bool binary: Whether the file is in the binary format
+    :param int chunk_size: The number of rows in a chunk
+    :param str encoding: The encoding of the words
+    :param str unicode_errors: The handling of decoding errors
+                               (e.g., ``'ignore'`` for GoogleNews)
+    :param int limit: The maximal number of rows to read
+    :return: Generator of tuples of the list of the words of a chunk
+             and the float32 array of their vectors
+    """
+
+    with open(path, 'rb') as w2v_file:
+        vocab_size, vector_size = _read_word2vec_header(w2v_file,
+                                                        encoding,
+                                                        unicode_errors)
+        if limit is not None:
+            vocab_size = min(vocab_size, limit)
+
+        iter_chunks = _iter_binary_chunks if binary else _iter_text_chunks
+
+        yield from iter_chunks(w2v_file, vocab_size, vector_size, chunk_size,
+                               encoding, unicode_errors)
+
+
+def load_word2vec_words(path, words, binary=True,
+                        chunk_size=STREAMING_CHUNK_SIZE,
+                        encoding='utf8', unicode_errors='strict',
+                        limit=None):
+    """Load only some of the words of a file in the word2vec format.
+
+    The file is read until all the words were found,
+    and the first occurrence of every word is taken.
+
+    :param str path: Path of the file
+    :param list words: The words to load
+    :param bool binary: Whether the file is in the binary format
+    :param int chunk_size: The number of rows in a chunk
+    :param str encoding: The encoding of the words
+    :param str unicode_errors: The handling of decoding errors
+    :param int limit: The maximal number of rows to read
+    :return: ``gensim.model.KeyedVectors`` of the words that were found,
+             in the order of the file
+    """
+
+    from gensim.models.keyedvectors import KeyedVectors
+
+    words = set(words)
+    found_vectors = OrderedDict()
+
+    with open(path, 'rb') as w2v_file:
+        _, vector_size = _read_word2vec_header(w2v_file,
+                                               encoding, unicode_errors)
+
+    for chunk_words, vectors in iter_word2vec_chunks(path, binary,
+                                                     chunk_size,
+                                                     encoding,
+                                                     unicode_errors,
+                                                     limit):
+        for word, vector in zip(chunk_words, vectors):
+            if word in words and word not in found_vectors:
+                found_vectors[word] = vector
+
+        if len(found_vectors) == len(words):
+            break
+
+    model = KeyedVectors(vector_size)
+    if found_vectors:
+        model.add(list(found_vectors), np.array(list(found_vectors.values())))
+
+    return model
+
+
+def iter_word2vec_projections(path, direction, binary=True,
+                              chunk_size=STREAMING_CHUNK_SIZE,
+                              encoding='utf8', unicode_errors='strict',
+                              limit=None):
+    """Project the normalized vectors of a word2vec file on a direction.
+
+    :param str path: Path of the file
+    :param direction: The direction vector
+    :param bool binary: Whether the file is in the binary format
+    :param int chunk_size: The number of rows in a chunk
+    :param str encoding: The encoding of the words
+    :param str unicode_errors: The handling of decoding errors
+    :param int limit: The maximal number of rows to read
+    :return: Generator of tuples of the list of the words of a chunk
+             and the array of their projections
+    """
+
+    direction = normalize(np.asarray(direction, dtype=np.float32))
+
+    for words, vectors in iter_word2vec_chunks(path, binary, chunk_size,
+                                               encoding, unicode_errors,
+                                               limit):
+        yield words, normalize_rows(vectors, out=vectors) @ direction
+
+
+def _merge_extreme(extreme, n_extreme, projections, words):
+    """Merge the projections of a chunk into the most extreme words."""
+
+    (highest_projections, highest_words,
+     lowest_projections, lowest_words) = extreme
+
+    highest_projections = np.r_[highest_projections, projections]
+    highest_words = np.r_[highest_words, words]
+    highest_projections, highest_words = select_top_k(n_extreme,
+                                                      highest_projections,
+                                                      highest_words)
+
+    negative_lowest_projections = -np.r_[lowest_projections, projections]
+    lowest_words = np.r_[lowest_words, words]
+    negative_lowest_projections, lowest_words = select_top_k(
+        n_extreme, negative_lowest_projections, lowest_words)
+
+    return (highest_projections, highest_words,
+            -negative_lowest_projections, lowest_words)
+
+
+def audit_word2vec_gender_bias(path, binary=True, only_lower=False,
+                               words='professions', n_extreme=10, c=None,
+                               direction=None,
+                               chunk_size=STREAMING_CHUNK_SIZE,
+                               encoding='utf8', unicode_errors='strict',
+                               limit=None, verbose=False):
+    """Audit the gender bias of a word2vec file without loading it.
+
+    The direction is identified as in
+    :class:`~ethically.we.bias.GenderBiasWE`, from the definitional pairs
+    only, and then the file is streamed to calculate the direct bias
+    of all the neutral words and to find the most extreme ones.
+
+    :param str path: Path of the file
+    :param bool binary: Whether the file is in the binary format
+    :param bool only_lower: Whether the words embedding contrains
+                            only lower case words
+    :param list words: The words whose projections are kept,
+                       by default the neutral profession names
+    :param int n_extreme: The number of the most extreme neutral words
+                          of every side of the direction
+    :param c: Strictness of bias measuring
+    :type c: float or None
+    :param direction: The direction, by default it is identified
+                      from the file
+    :param int chunk_size: The number of rows in a chunk
+    :param str encoding: The encoding of the words
+    :param str unicode_errors: The handling of decoding errors
+    :param int limit: The maximal number of rows to read
+    :param bool verbose: Set vebosity
+    :return: Dictionary of the ``direction``, the ``direct_bias``
+             of the neutral words, the numbers of the words
+             (``n_words``) and the neutral words (``n_neutral_words``),
+             Series of the ``projections`` of the words,
+             and DataFrame of the most ``extreme`` neutral words
+             and their projections.
+    """
+
+    # pylint: disable=R0914
+
+    from .bias import GenderBiasWE
+    from .data import BOLUKBASI_DATA
+    from .utils import generate_words_forms
+
+    data = BOLUKBASI_DATA['gender']
+
+    if c is None:
+        c = 1
+
+    if isinstance(words, str) and words == 'professions':
+        words = data['neutral_profession_names']
+
+    if direction is None:
+        direction_words = ({word for pair in data['definitional_pairs']
+                            for word in pair}
+                           | {'she', 'he'})
+        direction_model = load_word2vec_words(path, direction_words, binary,
+                                              chunk_size, encoding,
+                                              unicode_errors, limit)
+        direction = GenderBiasWE(direction_model, only_lower,
+                                 verbose).direction
+
+    # as GenderBiasWE, all the forms of the specific words are not neutral
+    specific_words = set(data['specific_full_with_definitional'])
+    specific_words.update(generate_words_forms(specific_words))
+
+    kept_words = set(words)
+    kept_projections = {}
+
+    direct_bias_sum = 0.
+    n_words = 0
+    n_neutral_words = 0
+
+    extreme = (np.empty(0), np.empty(0, dtype=object),
+               np.empty(0), np.empty(0, dtype=object))
+
+    for chunk_words, projections in iter_word2vec_projections(path,
+                                                              direction,
+                                                              binary,
+                                                              chunk_size,
+                                                              encoding,
+                                                              unicode_errors,
+                                                              limit):
+        n_words += len(chunk_words)
+
+        for word, projection in zip(chunk_words, projections):
+            if word in kept_words and word not in kept_projections:
+                kept_projections[word] = projection
+
+        is_neutral = np.fromiter((word not in specific_words
+                                  for word in chunk_words),
+                                 dtype=bool, count=len(chunk_words))
+
+        neutral_projections = projections[is_neutral]
+        n_neutral_words += len(neutral_projections)
+        direct_bias_sum += np.sum(np.abs(neutral_projections) ** c,
+                                  dtype=np.float64)
+
+        neutral_words = np.array(chunk_words, dtype=object)[is_neutral]
+        extreme = _merge_extreme(extreme, n_extreme,
+                                 neutral_projections, neutral_words)
+
+    (highest_projections, highest_words,
+     lowest_projections, lowest_words) = extreme
+
+    extreme_df = (pd.DataFrame({'word': np.r_[highest_words, lowest_words],
+                                'projection': np.r_[highest_projections,
+                                                    lowest_projections]},
+                               columns=['word', 'projection'])
+                  .drop_duplicates('word')
+                  .sort_values('projection', ascending=False)
+                  .reset_index(drop=True))
+
+    projections = pd.Series([kept_projections[word] for word in words
+                             if word in kept_projections],
+                            index=[word for word in words
+                                   if word in kept_projections],
+                            name='projection')
+
+    return {'direction': direction,
+            'direct_bias': (direct_bias_sum / n_neutral_words
+                            if n_neutral_words else None),
+            'n_words': n_words,
+            'n_neutral_words': n_neutral_words,
+            'projections': projections,
+            'extreme': extreme_df}
@@ -0,0 +1,207 @@
+"""
+Training of classifiers of specific words.
+
+The classifiers separate specific words (e.g., gender specific words
+as *he*, *she* and *brother*) from neutral words by their
+normalized vectors (see ``BiasWordsEmbedding.learn_full_specific_words``):
+
+1. ``svm`` - a linear SVM, trained on all the specific words and
+   the first non specific words of the vocabulary, in memory.
+2. ``sgd`` - a linear SVM trained with stochastic gradient descent
+   on mini-batches of rows, so the training data is not materialized
+   in memory and it can be far larger (e.g., with a memory-mapped model).
+"""
+
+import time
+
+import numpy as np
+
+from ..consts import RANDOM_STATE
+from .utils import VECTORS_CHUNK_SIZE, normalize_rows
+
+
+MAX_NON_SPECIFIC_EXAMPLES = 1000
+SGD_BATCH_SIZE = 10000
+SGD_N_EPOCHS = 5
+
+
+def train_specific_words_svm(model, get_vectors, seed_specific_words,
+                             max_non_specific_examples=None, dtype=None):
+    """Train a linear SVM of the specific words.
+
+    :param model: Words embedding model of ``gensim.model.KeyedVectors``
+    :param get_vectors: Function that returns the vectors
+                        of an array of indices of rows
+    :param list seed_specific_words: List of seed specific words
+    :param int max_non_specific_examples: The number of the first
+                                          non-specifc words to train on
+    :param dtype: The dtype of the training data,
+                  by default the dtype of the vectors
+    :return: Tuple of the classifier, the training data
+             and the labels
+    """
+
+    from sklearn.svm import LinearSVC
+
+    if max_non_specific_examples is None:
+        max_non_specific_examples = MAX_NON_SPECIFIC_EXAMPLES
+
+    data = []
+    non_specific_example_count = 0
+
+    for word, vocab in model.vocab.items():
+        is_specific = word in seed_specific_words
+
+        if not is_specific:
+            non_specific_example_count += 1
+            if non_specific_example_count <= max_non_specific_examples:
+                data.append((vocab.index, is_specific))
+        else:
+            data.append((vocab.index, is_specific))
+
+    np.random.seed(RANDOM_STATE)
+    np.random.shuffle(data)
+
+    indices, y = zip(*data)
+
+    X = normalize_rows(get_vectors(np.array(indices)))
+    if dtype is not None:
+        X = X.astype(dtype, copy=False)
+
+    y = np.array(y).astype('int')
+
+    clf = LinearSVC(C=1, class_weight='balanced',
+                    random_state=RANDOM_STATE)
+
+    clf.fit(X, y)
+
+    return clf, X, y
+
+
+def train_specific_words_sgd(model, get_vectors, seed_specific_words,
+                             max_non_specific_examples=None,
+                             batch_size=None, n_epochs=None,
+                             random_state=None, verbose=False):
+    """Train a linear SVM of the specific words with SGD on mini-batches.
+
+    :param model: Words embedding model of ``gensim.model.KeyedVectors``
+    :param get_vectors: Function that returns the vectors
+                        of an array of indices of rows
+    :param list seed_specific_words: List of seed specific words
+    :param int max_non_specific_examples: The number of non-specifc words
+                                          to sample for training
+                                          (by default all of them)
+    :param int batch_size: The number of rows in a mini-batch
+    :param int n_epochs: The number of passes over the training rows
+    :param int random_state: The seed of the sampling and the training
+    :param bool verbose: Set vebosity
+    :return: Tuple of the classifier, the indices of the training rows
+             and the labels
+    """
+
+    # pylint: disable=R0914
+
+    from sklearn.linear_model import SGDClassifier
+
+    if batch_size is None:
+        batch_size = SGD_BATCH_SIZE
+
+    if n_epochs is None:
+        n_epochs = SGD_N_EPOCHS
+
+    if random_state is None:
+        random_state = RANDOM_STATE
+
+    random_generator = np.random.RandomState(random_state)
+
+    vocab = model.vocab
+    is_specific = np.zeros(len(model.index2word), dtype=bool)
+    is_specific[[vocab[word].index
+                 for word in seed_specific_words
+                 if word in vocab]] = True
+
+    # stratified sample - all the specific rows
+    # and a uniform sample of the non specific rows
+    specific_indices = np.flatnonzero(is_specific)
+    non_specific_indices = np.flatnonzero(~is_specific)
+
+    if (max_non_specific_examples is not None
+            and max_non_specific_examples < len(non_specific_indices)):
+        non_specific_indices = random_generator.choice(
+            non_specific_indices, max_non_specific_examples,
+            replace=False)
+
+    if not len(specific_indices):  # pylint: disable=len-as-condition
+        raise ValueError('seed_specific_words should have at least'
+                         ' one word in the model vocabulary')
+
+    if not len(non_specific_indices):  # pylint: disable=len-as-condition
+        raise ValueError('There should be at least one non specific word'
+                         ' to train on, but there are none')
+
+    train_indices = np.r_[specific_indices, non_specific_indices]
+    n_samples = len(train_indices)
+
+    # the same weights as class_weight='balanced',
+    # which is not supported by partial_fit
+    class_weight = {0: n_samples / (2 * len(non_specific_indices)),
+                    1: n_samples / (2 * len(specific_indices))}
+
+    # alpha that corresponds to C=1 of LinearSVC
+    clf = SGDClassifier(loss='hinge', alpha=1 / n_samples,
+                        class_weight=class_weight,
+                        random_state=random_state)
+
+    start_time = time.time()
+
+    for _ in range(n_epochs):
+        random_generator.shuffle(train_indices)
+
+        for batch_start in range(0, n_samples, batch_size):
+            # sorted for sequential reads of a memory-mapped matrix
+            batch_indices = np.sort(train_indices[batch_start:
+                                                  batch_start + batch_size])
+
+            vectors = normalize_rows(get_vectors(batch_indices))
+
+            clf.partial_fit(vectors,
+                            is_specific[batch_indices].astype('int'),
+                            classes=[0, 1])
+
+    if verbose:
+        from tabulate import tabulate
+        elapsed_time = time.time() - start_time
+        n_rows = n_samples * n_epochs
+        print(tabulate([['Rows', n_rows],
+                        ['Seconds', elapsed_time],
+                        ['Rows/s', (n_rows / elapsed_time
+                                    if elapsed_time else np.nan)]],
+                       headers=['SGD Training', '']))
+
+    return clf, train_indices, is_specific[train_indices].astype('int')
+
+
+def calc_margins(clf, get_vectors, n_vectors, chunk_size=None, dtype=None):
+    """Calculate the margins of all the rows with ``decision_function``.
+
+    :param clf: The classifier
+    :param get_vectors: Function that returns the vectors
+                        of a slice of rows
+    :param int n_vectors: The number of rows
+    :param int chunk_size: The number of rows to classify at once
+    :param dtype: The dtype of the margins
+    :return: Array of the margins of the rows
+    """
+
+    if chunk_size is None:
+        chunk_size = VECTORS_CHUNK_SIZE
+
+    margins = np.empty(n_vectors, dtype=dtype)
+
+    for chunk_start in range(0, n_vectors, chunk_size):
+        chunk = slice(chunk_start, chunk_start + chunk_size)
+        vectors = normalize_rows(get_vectors(chunk))
+        margins[chunk_start:
+                chunk_start + len(vectors)] = clf.decision_function(vectors)
+
+    return margins
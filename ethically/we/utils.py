@@ -1,9 +1,18 @@
+import hashlib
 import math
+import weakref
 
 import numpy as np
 import pandas as pd
 
 
+VECTORS_CHUNK_SIZE = 100000
+
+# the fingerprint of the vocabulary of a model,
+# with the id and the length of the words list it was calculated on
+_VOCABULARY_FINGERPRINTS = weakref.WeakKeyDictionary()
+
+
 def round_to_extreme(value, digits=2):
     place = 10**digits
     new_value = math.ceil(abs(value) * place) / place
@@ -12,15 +21,29 @@ def round_to_extreme(value, digits=2):
     return new_value
 
 
+def _float_dtype(array):
+    """Return the floating dtype of an array, or float64 for the others."""
+    dtype = np.asarray(array).dtype
+    if np.issubdtype(dtype, np.floating):
+        return dtype
+    return np.dtype(np.float64)
+
+
+def _compute_dtype(dtype):
+    """Return the dtype to calculate in, float32 at least."""
+    return np.promote_types(dtype, np.float32)
+
+
 def normalize(v):
-    """Normalize a 1-D vector."""
+    """Normalize a 1-D vector, keeping its floating dtype."""
     if v.ndim != 1:
         raise ValueError('v should be 1-D, {}-D was given'.format(
             v.ndim))
-    norm = np.linalg.norm(v)
+    dtype = _float_dtype(v)
+    norm = np.linalg.norm(v.astype(_compute_dtype(dtype), copy=False))
     if norm == 0:
         return v
-    return v / norm
+    return (v / norm).astype(dtype, copy=False)
 
 
 def cosine_similarity(v, u):
@@ -32,27 +55,254 @@ def cosine_similarity(v, u):
 
 
 def project_vector(v, u):
-    """Projecting the vector v onto direction u."""
-    normalize_u = normalize(u)
+    """Projecting the vector v onto direction u, in the dtype of v."""
+    normalize_u = normalize(u).astype(_float_dtype(v), copy=False)
     return (v @ normalize_u) * normalize_u
 
 
 def reject_vector(v, u):
-    """Rejecting the vector v onto direction u."""
+    """Rejecting the vector v onto direction u, in the dtype of v."""
     return v - project_vector(v, u)
 
 
 def project_reject_vector(v, u):
     """Projecting and rejecting the vector v onto direction u."""
     projected_vector = project_vector(v, u)
-    rejected_vector = v - project_vector(v, u)
+    rejected_vector = v - projected_vector
     return projected_vector, rejected_vector
 
 
-def update_word_vector(model, word, new_vector):
-    model.syn0[model.vocab[word].index] = new_vector
-    if model.syn0norm is not None:
-        model.syn0norm[model.vocab[word].index] = normalize(new_vector)
+def normalize_rows(vectors, out=None):
+    """Normalize the rows (the last axis) of a matrix.
+
+    Rows with zero norm are kept as they are.
+
+    :param vectors: Matrix of vectors, e.g. (n, d)
+    :param out: Array for the result, can be ``vectors`` itself
+    """
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1
+    return np.divide(vectors, norms, out=out)
+
+
+def _as_subspace(u, dtype):
+    """Return the unit vector as a (1, d) subspace, or the (k, d) one."""
+    if u.ndim == 1:
+        u = normalize(u)[None, :]
+    return u.astype(dtype, copy=False)
+
+
+def project_rows(vectors, u, out=None):
+    """Projecting the rows of a matrix onto direction or subspace u.
+
+    :param vectors: Matrix of vectors, e.g. (n, d)
+    :param u: Direction (d,) or orthonormal rows of a subspace (k, d)
+    :param out: Array for the result
+    """
+    subspace = _as_subspace(u, _float_dtype(vectors))
+    return np.matmul(vectors @ subspace.T, subspace, out=out)
+
+
+def reject_rows(vectors, u, out=None):
+    """Rejecting the rows of a matrix from direction or subspace u.
+
+    :param vectors: Matrix of vectors, e.g. (n, d)
+    :param u: Direction (d,) or orthonormal rows of a subspace (k, d)
+    :param out: Array for the result, can be ``vectors`` itself
+    """
+    return np.subtract(vectors, project_rows(vectors, u), out=out)
+
+
+def project_reject_rows(vectors, u):
+    """Projecting and rejecting the rows of a matrix onto u."""
+    projected_vectors = project_rows(vectors, u)
+    rejected_vectors = vectors - projected_vectors
+    return projected_vectors, rejected_vectors
+
+
+def cosine_similarity_rows(vectors1, vectors2):
+    """Calculate the cosine similarity between matching rows.
+
+    The matrices are broadcast against each other,
+    and rows with zero norm have zero similarity.
+    """
+    inner_products = np.einsum('...i,...i->...', vectors1, vectors2)
+    norms = (np.linalg.norm(vectors1, axis=-1)
+             * np.linalg.norm(vectors2, axis=-1))
+    norms = np.where(norms == 0, 1, norms)
+    return inner_products / norms
+
+
+def normalize_vectors_inplace(model):
+    """Normalize all the vectors of a model inplace.
+
+    The same as ``model.init_sims(replace=True)``,
+    but in chunks of rows rather than row by row.
+    The norms are calculated in float32 at least.
+    """
+    vectors = model.vectors
+    compute_dtype = _compute_dtype(vectors.dtype)
+    for start in range(0, len(vectors), VECTORS_CHUNK_SIZE):
+        chunk = vectors[start:start + VECTORS_CHUNK_SIZE]
+        norms = np.linalg.norm(chunk.astype(compute_dtype, copy=False),
+                               axis=-1)
+        chunk /= norms.astype(vectors.dtype)[:, None]
+    model.vectors_norm = vectors
+
+
+def cast_model_vectors(model, dtype):
+    """Copy a ``KeyedVectors`` with its vectors cast to dtype.
+
+    The copy shares the vocabulary of the model,
+    and the model itself is returned if its vectors are already of dtype.
+    """
+    from gensim.models.keyedvectors import KeyedVectors
+
+    dtype = np.dtype(dtype)
+    if model.vectors.dtype == dtype:
+        return model
+
+    cast_model = KeyedVectors(model.vector_size)
+    cast_model.vocab = model.vocab
+    cast_model.index2word = model.index2word
+    cast_model.vectors = model.vectors.astype(dtype)
+    return cast_model
+
+
+def check_keyed_vectors(model):
+    """Check that the model is of type ``KeyedVectors``."""
+    from gensim.models.keyedvectors import KeyedVectors
+
+    if not isinstance(model, KeyedVectors):
+        raise TypeError('model should be of type KeyedVectors, not {}'
+                        .format(type(model)))
+
+
+def get_words_indices(model, words):
+    """Resolve words to their row indices in the model matrix.
+
+    An array of integer indices is returned as is.
+    """
+    if (isinstance(words, np.ndarray)
+            and np.issubdtype(words.dtype, np.integer)):
+        return words
+
+    vocab = model.vocab
+    return np.fromiter((vocab[word].index for word in words),
+                       dtype=np.int64)
+
+
+def get_model_vectors(model, indices):
+    """Get the vectors of rows of a model, which might be an overlay."""
+    # the overlay module imports gensim,
+    # so it is imported only once there is a model
+    from .overlay import OverlayKeyedVectors
+
+    if isinstance(model, OverlayKeyedVectors):
+        return model.get_vectors(indices)
+    return model.vectors[indices]
+
+
+def calc_rows_dot(vectors, other, dtype=None, chunk_size=VECTORS_CHUNK_SIZE):
+    """Calculate ``vectors @ other`` on chunks of rows cast to dtype.
+
+    E.g., for a float16 matrix and float32 dtype,
+    the products are accumulated in float32 without a cast copy
+    of the whole matrix.
+    """
+    if dtype is None:
+        return vectors @ other
+
+    results = [vectors[start:start + chunk_size].astype(dtype, copy=False)
+               @ other
+               for start in range(0, len(vectors), chunk_size)]
+
+    if not results:
+        return np.empty((0,) + np.shape(other)[1:], dtype=dtype)
+
+    return np.concatenate(results)
+
+
+def calc_euclidean_distances(X, Y, dtype=None):
+    """Calculate the euclidean distances between the rows of X and Y.
+
+    If the matrices are not of dtype (e.g., float16 for float32 dtype),
+    Y is cast in tiles of ``len(X)`` rows, so the accumulation is done
+    in dtype without a cast copy of the whole of Y.
+    """
+    from sklearn.metrics.pairwise import euclidean_distances
+
+    if dtype is None or X.dtype == Y.dtype == dtype:
+        return euclidean_distances(X, Y)
+
+    X = X.astype(dtype, copy=False)
+    tile_size = max(len(X), 1)
+
+    distances = np.empty((len(X), len(Y)), dtype=dtype)
+    for start in range(0, len(Y), tile_size):
+        distances[:, start:start + tile_size] = euclidean_distances(
+            X, Y[start:start + tile_size].astype(dtype, copy=False))
+
+    return distances
+
+
+def calc_vocabulary_fingerprint(model):
+    """Calculate a fingerprint of the vocabulary of a words embedding.
+
+    It is the SHA-1 of the words in rows order, so models
+    that share their vocabulary, e.g., the debiased variants
+    of a model, have the same fingerprint.
+    It is calculated once per base model, which an overlay
+    shares with its variants, and again only if the words changed.
+
+    :param model: Words embedding model of ``gensim.model.KeyedVectors``
+    :return: Hex digest of the fingerprint
+    """
+
+    words = model.index2word
+
+    base = model
+    while getattr(base, 'base', None) is not None:
+        base = base.base
+
+    # comparing the words to a copy of the list is much faster
+    # than hashing them, as the strings themselves are shared
+    memo_words, fingerprint = _VOCABULARY_FINGERPRINTS.get(base,
+                                                           (None, None))
+    if memo_words == words:
+        return fingerprint
+
+    hasher = hashlib.sha1()
+
+    for start in range(0, len(words), VECTORS_CHUNK_SIZE):
+        hasher.update('\n'.join(words[start:start + VECTORS_CHUNK_SIZE])
+                      .encode('utf-8'))
+        hasher.update(b'\n')
+
+    fingerprint = hasher.hexdigest()
+    _VOCABULARY_FINGERPRINTS[base] = (list(words), fingerprint)
+    return fingerprint
+
+
+def calc_vectors_fingerprint(vectors):
+    """Calculate a fingerprint of a matrix of vectors.
+
+    It is the SHA-1 of the dtype, the shape and the values
+    of the matrix, hashed in chunks of rows.
+
+    :param vectors: Matrix of vectors, e.g. ``model.vectors``
+    :return: Hex digest of the fingerprint
+    """
+
+    hasher = hashlib.sha1()
+    hasher.update('{} {}\n'.format(vectors.dtype.str, vectors.shape)
+                  .encode('utf-8'))
+
+    for start in range(0, len(vectors), VECTORS_CHUNK_SIZE):
+        chunk = vectors[start:start + VECTORS_CHUNK_SIZE]
+        hasher.update(np.ascontiguousarray(chunk))
+
+    return hasher.hexdigest()
 
 
 def generate_one_word_forms(word):
@@ -63,6 +313,44 @@ def generate_words_forms(words):
     return sum([generate_one_word_forms(word) for word in words], [])
 
 
+def group_equality_sets(equality_sets):
+    """Group the equality sets into batches that can be equalized at once.
+
+    A set must be equalized after all the previous sets that share
+    a word with it, and every batch has sets of the same size.
+
+    :return: List of batches, each is a tuple of the sets indices
+             and the sets themselves.
+    """
+
+    words_waves = {}
+    batches = {}
+
+    for equality_set_index, equality_set_words in enumerate(equality_sets):
+        wave = 1 + max((words_waves.get(word, -1)
+                        for word in equality_set_words),
+                       default=-1)
+
+        for word in equality_set_words:
+            words_waves[word] = wave
+
+        batch = batches.setdefault((wave, len(equality_set_words)),
+                                   ([], []))
+        batch[0].append(equality_set_index)
+        batch[1].append(equality_set_words)
+
+    return [batches[key] for key in sorted(batches)]
+
+
+def select_top_k(k, scores, *arrays):
+    """Select the k highest scores, and the matching items of the arrays."""
+    if len(scores) > k:
+        top_indices = np.argpartition(-scores, k - 1)[:k]
+        scores = scores[top_indices]
+        arrays = [array[top_indices] for array in arrays]
+    return (scores, *arrays)
+
+
 def take_two_sides_extreme_sorted(df, n_extreme,
                                   part_column=None,
                                   head_value='',